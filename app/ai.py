@@ -1,12 +1,189 @@
 import os
+import re
 import json
+import asyncio
+import time
+import queue
+import mimetypes
+import sqlite3
+import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import Future
+from functools import cached_property
+from types import MappingProxyType
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
-from openai import OpenAI
+import httpx
+import numpy as np
+from openai import OpenAI, AsyncOpenAI
 from .settings import Settings
 
 # Import OpenAI client from v1.x SDK. If not installed, runtime will throw.
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (habilita HTTP/2 en httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Pool compartido: conexiones keep-alive reutilizadas entre embeddings, chat y Whisper
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+# Reintentos del SDK ante 408/409/429/5xx y errores de conexión: backoff
+# exponencial con jitter (0.5 s → 8 s) respetando Retry-After
+OPENAI_MAX_RETRIES = 5
+
+# Prompts de sistema: constantes construidas una sola vez al importar el módulo
+SYSTEM_CLASSIFY = (
+    "Eres un asistente que clasifica notas personales. "
+    "Devuelve un JSON con 'category' (una palabra o frase corta) y 'tags' (lista de 3-7 palabras). "
+    "No agregues nada más."
+)
+
+SYSTEM_SHORT = (
+    "Eres una secretaria IA que contesta SOLO usando el contexto proporcionado. "
+    "Responde en texto plano, sin formato especial. "
+    "Si la respuesta no está en el contexto, admite que no está y sugiere cómo capturar esa información."
+)
+
+SYSTEM_EXTENDED = (
+    "Eres una secretaria IA especializada en análisis profundo de información. "
+    "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. "
+    "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
+    "- Usa MAYÚSCULAS para títulos principales\n"
+    "- Usa números para secciones (1., 2., etc.)\n"
+    "- Usa guiones (-) para sublistas\n"
+    "- Usa saltos de línea dobles para separar secciones\n"
+    "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
+    "Estructura requerida:\n"
+    "ANÁLISIS INTEGRAL\n\n"
+    "1. RESUMEN EJECUTIVO\n\n"
+    "2. ANÁLISIS DETALLADO\n\n"
+    "3. PUNTOS CLAVE IDENTIFICADOS\n\n"
+)
+
+SYSTEM_EXTENDED_STREAM = (
+    "Eres una secretaria IA especializada en análisis profundo de información notas sobre reuniones, eventos problematicas, proyectos. "
+    "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. Util para un jefe de proyecto de software "
+    "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
+    "- Usa MAYÚSCULAS para títulos principales\n"
+    "- Usa números para secciones (1., 2., etc.)\n"
+    "- Usa guiones (-) para sublistas\n"
+    "- Usa saltos de línea dobles para separar secciones\n"
+    "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
+    "Estructura requerida:\n"
+    "ANÁLISIS\n\n"
+    "1. RESUMEN\n"
+    "Síntesis de los aspectos más críticos y hallazgos principales en 2-3 oraciones.\n\n"
+    "2. ANÁLISIS DETALLADO\n"
+    "Profundización en los temas principales con contexto y implicaciones.\n\n"
+    "3. PUNTOS CLAVE IDENTIFICADOS y tareas proximas si existen\n"
+)
+
+SYSTEM_SUMMARY = """Eres un especialista en análisis y síntesis de transcripciones de audio.
+
+            PROCESO:
+            1. Corrige automáticamente errores típicos de transcripción (palabras mal interpretadas, nombres, números incorrectos)
+            2. Identifica los elementos más relevantes de la conversación
+            3. Estructura la información de forma clara y útil
+
+            FORMATO DE SALIDA:
+            - Texto plano sin markdown
+            - Máximo 300 palabras
+            - Estructura clara con secciones numeradas
+
+            CONTENIDO A EXTRAER:
+            1. Temas principales tratados
+            2. Puntos clave o información importante discutida
+            3. Decisiones, acuerdos o conclusiones (si las hay)
+            4. Acciones mencionadas o tareas pendientes (si las hay)
+            5. Aspectos relevantes que requieren seguimiento
+
+            INSTRUCCIONES:
+            - Mantén neutralidad, no asumas contexto específico
+            - Enfócate en resumir, no en interpretar o transformar
+            - Si hay información ambigua por errores de transcripción, úsala de la forma más probable
+            - Prioriza fidelidad al contenido original sobre estructuras predefinidas"""
+
+# Mensajes de sistema inmutables, compartidos por todas las peticiones
+SYSTEM_CLASSIFY_MSG = MappingProxyType({"role": "system", "content": SYSTEM_CLASSIFY})
+SYSTEM_SHORT_MSG = MappingProxyType({"role": "system", "content": SYSTEM_SHORT})
+SYSTEM_EXTENDED_MSG = MappingProxyType({"role": "system", "content": SYSTEM_EXTENDED})
+SYSTEM_EXTENDED_STREAM_MSG = MappingProxyType({"role": "system", "content": SYSTEM_EXTENDED_STREAM})
+SYSTEM_SUMMARY_MSG = MappingProxyType({"role": "system", "content": SYSTEM_SUMMARY})
+
+_CTX_TMPL = "Título: {}\nContenido:\n{}".format
+
+_WS_RE = re.compile(r"\s+")
+
+_question_embeddings: ContextVar[Optional[Dict[str, np.ndarray]]] = ContextVar("question_embeddings", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Ámbito de una acción de UI: cada pregunta se embebe una sola vez dentro de él."""
+    token = _question_embeddings.set({})
+    try:
+        yield
+    finally:
+        _question_embeddings.reset(token)
+
+
+def _cosine_scores(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Similitud coseno de query_vec contra cada fila de matrix.
+
+    Usa los kernels SIMD de simsimd si está instalado; si no, un GEMV de NumPy
+    (equivalente cuando las filas ya están normalizadas).
+    """
+    if SIMSIMD_AVAILABLE and matrix.shape[0]:
+        dist = np.asarray(simsimd.cdist(query_vec.reshape(1, -1), matrix, metric="cosine"))[0]
+        return 1.0 - dist
+    return matrix @ query_vec
+
+
+_SIMHASH_MASK = (1 << 64) - 1
+
+
+def _simhash(text: str) -> int:
+    """SimHash de 64 bits sobre las palabras del texto."""
+    tokens = text.split()
+    if not tokens:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(t.encode("utf-8", "ignore"), digest_size=8).digest(), "little") for t in tokens),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    weights = bits.sum(axis=0, dtype=np.int64) * 2 - len(tokens)
+    return int.from_bytes(np.packbits(weights > 0, bitorder="little").tobytes(), "little")
+
+
 @dataclass
 class RetrievalResult:
     """Container for semantic search results."""
@@ -17,41 +194,457 @@ class RetrievalResult:
     score: float
 
 
+class SemanticCache:
+    """Caché de respuestas indexada por el embedding de la pregunta.
+
+    Los embeddings se guardan cuantizados a int8 (escala simétrica por vector),
+    4x menos memoria que float32. Como el coseno no depende de la escala, basta
+    con la matriz int8 y la norma de cada fila.
+    """
+
+    GROW_ROWS = 256
+    SCORE_BLOCK_ROWS = 1024
+
+    def __init__(self, path: str, threshold: float = 0.95) -> None:
+        self.path = path
+        self.threshold = threshold
+        self._E: Optional[np.ndarray] = None  # int8 (filas, dim)
+        self._norms: Optional[np.ndarray] = None  # float32 (filas,)
+        self._size = 0
+        self._entries: List[Tuple[str, str, float]] = []  # (answer, ctx_hash, ts)
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> np.ndarray:
+        """Cuantiza a int8 con escala max(|x|)/127."""
+        v = np.asarray(embedding, dtype=np.float32)
+        peak = float(np.abs(v).max()) if v.size else 0.0
+        if peak == 0.0:
+            return np.zeros(v.shape, dtype=np.int8)
+        return np.round(v * (127.0 / peak)).astype(np.int8)
+
+    def _scores(self, q: np.ndarray) -> np.ndarray:
+        E = self._E[:self._size]
+        if SIMSIMD_AVAILABLE:
+            return 1.0 - np.asarray(simsimd.cdist(q.reshape(1, -1), E, metric="cosine"))[0]
+        # Producto int8 acumulado en int32 por bloques para acotar temporales
+        qi = q.astype(np.int32)
+        dots = np.empty(self._size, dtype=np.float64)
+        for start in range(0, self._size, self.SCORE_BLOCK_ROWS):
+            stop = start + self.SCORE_BLOCK_ROWS
+            dots[start:stop] = E[start:stop].astype(np.int32) @ qi
+        denom = np.maximum(self._norms[:self._size] * float(np.linalg.norm(qi)), 1e-12)
+        return dots / denom
+
+    def lookup(self, embedding: np.ndarray, ctx_hash: str) -> Optional[str]:
+        """Devuelve la respuesta cacheada más similar con el mismo contexto, o None."""
+        with self._lock:
+            if not self._size:
+                return None
+            q = self._quantize(embedding)
+            if self._E.shape[1] != q.shape[0]:
+                return None
+            sims = self._scores(q)
+            for i, (_, h, _) in enumerate(self._entries):
+                if h != ctx_hash:
+                    sims[i] = -1.0
+            idx = int(np.argmax(sims))
+            if sims[idx] >= self.threshold:
+                return self._entries[idx][0]
+            return None
+
+    def add(self, embedding: np.ndarray, answer: str, ctx_hash: str) -> None:
+        """Agrega una respuesta a la caché y la persiste en disco."""
+        with self._lock:
+            q = self._quantize(embedding)
+            if self._E is None or self._E.shape[1] != q.shape[0]:
+                self._E = np.empty((self.GROW_ROWS, q.shape[0]), dtype=np.int8)
+                self._norms = np.empty(self.GROW_ROWS, dtype=np.float32)
+                self._size = 0
+                self._entries = []
+            elif self._size == self._E.shape[0]:
+                self._grow(self._size + self.GROW_ROWS)
+            self._E[self._size] = q
+            self._norms[self._size] = np.linalg.norm(q.astype(np.float32))
+            self._size += 1
+            self._entries.append((answer, ctx_hash, time.time()))
+            self._save()
+
+    def _grow(self, rows: int) -> None:
+        E = np.empty((rows, self._E.shape[1]), dtype=np.int8)
+        E[:self._size] = self._E[:self._size]
+        norms = np.empty(rows, dtype=np.float32)
+        norms[:self._size] = self._norms[:self._size]
+        self._E, self._norms = E, norms
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                E = data["E"]
+                answers = data["answers"].tolist()
+                hashes = data["ctx_hashes"].tolist()
+                ts = data["ts"].tolist()
+        except Exception as e:
+            print(f"No se pudo cargar la caché semántica: {e}")
+            return
+        if E.dtype != np.int8:
+            E = np.array([self._quantize(row) for row in E], dtype=np.int8).reshape(E.shape)
+        rows = max(self.GROW_ROWS, -(-len(E) // self.GROW_ROWS) * self.GROW_ROWS)
+        self._E = np.empty((rows, E.shape[1]), dtype=np.int8)
+        self._E[:len(E)] = E
+        self._norms = np.empty(rows, dtype=np.float32)
+        self._norms[:len(E)] = np.linalg.norm(E.astype(np.float32), axis=1)
+        self._size = len(E)
+        self._entries = list(zip(answers, hashes, ts))
+
+    def _save(self) -> None:
+        tmp_path = self.path + ".tmp.npz"
+        try:
+            np.savez(
+                tmp_path,
+                E=self._E[:self._size],
+                answers=np.array([e[0] for e in self._entries], dtype=str),
+                ctx_hashes=np.array([e[1] for e in self._entries], dtype=str),
+                ts=np.array([e[2] for e in self._entries], dtype=np.float64),
+            )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"No se pudo guardar la caché semántica: {e}")
+
+
 class AIService:
     """Wraps OpenAI API calls for embeddings, classification, RAG, and transcription."""
 
+    EMBED_MAX_BATCH = 96
+    EMBED_BATCH_WINDOW = 0.02  # segundos
+    EMBED_LRU_SIZE = 4096
+    TOKEN_COUNT_CACHE_SIZE = 4096
+    SIMHASH_MIN_TOKENS = 20
+    SIMHASH_MAX_DISTANCE = 3
+    STREAM_FLUSH_CHARS = 64
+    STREAM_FLUSH_INTERVAL = 0.05  # segundos
+    CTX_TOKEN_OVERHEAD = 12  # "Título: ...\nContenido:\n" + separadores
+
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
-        self._client: Optional[OpenAI] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+        self._embed_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embed_inflight: Dict[str, Future] = {}
+        self._embed_lock = threading.Lock()
+        self._embed_q: "queue.Queue[Tuple[str, str, Future]]" = queue.Queue()
+        self._embed_thread: Optional[threading.Thread] = None
+        self._classify_cache: Optional[Dict[str, Tuple[str, List[str]]]] = None
+        self._classify_simhashes: List[Tuple[int, str]] = []
+        self._classify_lock = threading.Lock()
+        # Una conexión por hilo a ai_cache.db; el esquema se crea una sola vez
+        self._cache_local = threading.local()
+        self._cache_schema_lock = threading.Lock()
+        self._cache_schema_ready = False
+        self._enc = None
+        self._enc_model: Optional[str] = None
+        self._token_counts: "OrderedDict[str, int]" = OrderedDict()
 
-    @property
+    @cached_property
     def client(self) -> OpenAI:
-        """Lazily instantiate an OpenAI client."""
-        if self._client is None:
-            if OpenAI is None:
-                raise RuntimeError("El paquete 'openai' no está instalado. Instálalo con: pip install openai")
-            api_key = self.settings.openai_api_key or os.environ.get("OPENAI_API_KEY", "")
-            if not api_key:
-                raise RuntimeError("Falta OPENAI_API_KEY. Configura tu clave en 'Ajustes'.")
-            self._client = OpenAI(api_key=api_key)
-        return self._client
-
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for a list of texts using the configured model."""
-        resp = self.client.embeddings.create(input=texts, model=self.settings.embedding_model)
-        return [d.embedding for d in resp.data]
+        """Lazily instantiate an OpenAI client (once; later reads are plain attribute hits)."""
+        api_key = self.settings.openai_api_key or os.environ.get("OPENAI_API_KEY", "")
+        if not api_key:
+            raise RuntimeError("Falta OPENAI_API_KEY. Configura tu clave en 'Ajustes'.")
+        http_client = httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return OpenAI(api_key=api_key, http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+
+    def _new_async_client(self) -> AsyncOpenAI:
+        """Cliente asíncrono ligado al event loop en curso."""
+        api_key = self.settings.openai_api_key or os.environ.get("OPENAI_API_KEY", "")
+        if not api_key:
+            raise RuntimeError("Falta OPENAI_API_KEY. Configura tu clave en 'Ajustes'.")
+        http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+
+    @property
+    def semantic_cache(self) -> SemanticCache:
+        """Caché semántica persistida junto a la base de datos."""
+        if self._semantic_cache is None:
+            path = os.path.join(self.settings.data_dir, "semantic_cache.npz")
+            self._semantic_cache = SemanticCache(path, self.settings.semantic_cache_threshold)
+        return self._semantic_cache
+
+    @staticmethod
+    def _contexts_hash(contexts: List[Dict], extended_analysis: bool) -> str:
+        """Huella del contexto usado para validar aciertos de la caché."""
+        h = hashlib.sha1(b"ext" if extended_analysis else b"std")
+        for c in contexts:
+            h.update(c["title"].encode("utf-8", "ignore"))
+            h.update(b"\x00")
+            h.update(c["content"].encode("utf-8", "ignore"))
+            h.update(b"\x01")
+        return h.hexdigest()
+
+    def embed_question(self, question: str) -> np.ndarray:
+        """Embedding de una pregunta, compartido dentro del request_scope() activo
+        entre la búsqueda vectorial y la caché semántica."""
+        memo = _question_embeddings.get()
+        if memo is not None:
+            vec = memo.get(question)
+            if vec is not None:
+                return vec
+        vec = self.embed([question])[0]
+        if memo is not None:
+            memo[question] = vec
+        return vec
+
+    def _question_embedding(self, question: str) -> Optional[np.ndarray]:
+        """Embedding de la pregunta para la caché; None si falla."""
+        try:
+            return self.embed_question(question)
+        except Exception as e:
+            print(f"Caché semántica deshabilitada para esta consulta: {e}")
+            return None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Get L2-normalized float32 embeddings (one row per text) using the configured model.
+
+        Los textos ya vistos salen de la caché (memoria + SQLite); el resto se
+        agrupa con otras llamadas concurrentes en un único request.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        model = self.settings.embedding_model
+        keys = [self._embed_key(model, t) for t in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        waiting: Dict[str, Future] = {}
+
+        with self._embed_lock:
+            missing = []
+            for i, key in enumerate(keys):
+                vec = self._embed_cache.get(key)
+                if vec is not None:
+                    self._embed_cache.move_to_end(key)
+                    results[i] = vec
+                elif key not in waiting:
+                    missing.append(key)
+                    waiting[key] = None
+
+        if missing:
+            stored = self._embed_store_get(missing)
+            with self._embed_lock:
+                for key, vec in stored.items():
+                    self._embed_cache_put(key, vec)
+                for i, key in enumerate(keys):
+                    if results[i] is not None:
+                        continue
+                    if key in stored:
+                        results[i] = stored[key]
+                        waiting.pop(key, None)
+                    elif waiting.get(key) is None:
+                        fut = self._embed_inflight.get(key)
+                        if fut is None:
+                            fut = Future()
+                            self._embed_inflight[key] = fut
+                            self._embed_q.put((texts[i], model, fut))
+                        waiting[key] = fut
+                self._ensure_embed_thread()
+
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                results[i] = waiting[key].result()
+        return np.vstack(results)
+
+    @staticmethod
+    def similarity(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Similitud coseno de query_vec contra cada fila (vectores ya normalizados)."""
+        return _cosine_scores(query_vec, matrix)
+
+    @classmethod
+    def top_k_similar(cls, query_vec: np.ndarray, matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices y similitudes de las k filas más parecidas, de mayor a menor."""
+        sims = cls.similarity(query_vec, matrix)
+        k = min(k, sims.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        idx = np.argpartition(sims, -k)[-k:]
+        idx = idx[np.argsort(sims[idx])[::-1]]
+        return idx, sims[idx]
+
+    @staticmethod
+    def _embed_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8", "ignore")).hexdigest()
+
+    def _embed_cache_put(self, key: str, vec: np.ndarray) -> None:
+        """Inserta en la LRU en memoria (llamar con _embed_lock tomado)."""
+        self._embed_cache[key] = vec
+        self._embed_cache.move_to_end(key)
+        while len(self._embed_cache) > self.EMBED_LRU_SIZE:
+            self._embed_cache.popitem(last=False)
+
+    def _cache_connect(self) -> sqlite3.Connection:
+        """Conexión de este hilo a la base de cachés de IA (embeddings y clasificaciones)."""
+        conn = getattr(self._cache_local, "conn", None)
+        if conn is not None:
+            return conn
+        conn = sqlite3.connect(os.path.join(self.settings.data_dir, "ai_cache.db"))
+        if not self._cache_schema_ready:
+            with self._cache_schema_lock:
+                if not self._cache_schema_ready:
+                    with conn:
+                        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+                        conn.execute(
+                            "CREATE TABLE IF NOT EXISTS classifications ("
+                            "key TEXT PRIMARY KEY, simhash INTEGER NOT NULL, category TEXT NOT NULL, tags TEXT NOT NULL)"
+                        )
+                    self._cache_schema_ready = True
+        self._cache_local.conn = conn
+        return conn
+
+    def _embed_store_get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Busca embeddings persistidos para las claves dadas."""
+        found: Dict[str, np.ndarray] = {}
+        try:
+            conn = self._cache_connect()
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in part)
+                rows = conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", part
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            print(f"No se pudo leer la caché de embeddings: {e}")
+        return found
+
+    def _embed_store_put(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        try:
+            conn = self._cache_connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                    [(key, vec.tobytes()) for key, vec in items],
+                )
+        except sqlite3.Error as e:
+            print(f"No se pudo guardar la caché de embeddings: {e}")
+
+    def _ensure_embed_thread(self) -> None:
+        if self._embed_thread is None or not self._embed_thread.is_alive():
+            self._embed_thread = threading.Thread(target=self._embed_worker, daemon=True)
+            self._embed_thread.start()
+
+    def _embed_worker(self) -> None:
+        """Agrupa textos pendientes durante una ventana corta y los embebe en lote."""
+        while True:
+            batch = [self._embed_q.get()]
+            deadline = time.monotonic() + self.EMBED_BATCH_WINDOW
+            while len(batch) < self.EMBED_MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._embed_q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            by_model: Dict[str, List[Tuple[str, Future]]] = {}
+            for text, model, fut in batch:
+                by_model.setdefault(model, []).append((text, fut))
+
+            for model, items in by_model.items():
+                self._embed_batch(model, items)
+
+    def _embed_batch(self, model: str, items: List[Tuple[str, Future]]) -> None:
+        keys = [self._embed_key(model, text) for text, _ in items]
+        try:
+            resp = self.client.embeddings.create(input=[text for text, _ in items], model=model)
+            vectors = np.asarray([d.embedding for d in resp.data], dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms > 0, norms, 1.0)
+        except Exception as e:
+            with self._embed_lock:
+                for key in keys:
+                    self._embed_inflight.pop(key, None)
+            for _, fut in items:
+                fut.set_exception(e)
+            return
+
+        with self._embed_lock:
+            for key, vec in zip(keys, vectors):
+                self._embed_cache_put(key, vec)
+                self._embed_inflight.pop(key, None)
+        self._embed_store_put(list(zip(keys, vectors)))
+        for (_, fut), vec in zip(items, vectors):
+            fut.set_result(vec)
 
     def classify(self, content: str) -> Tuple[str, List[str]]:
-        """Suggest a category and tags for the given content using the chat model."""
-        system = (
-            "Eres un asistente que clasifica notas personales. "
-            "Devuelve un JSON con 'category' (una palabra o frase corta) y 'tags' (lista de 3-7 palabras). "
-            "No agregues nada más."
-        )
+        """Suggest a category and tags for the given content using the chat model.
+
+        Re-guardar una nota sin cambios (o con cambios mínimos) reutiliza la
+        clasificación anterior sin llamar al modelo.
+        """
+        normalized = _WS_RE.sub(" ", content.strip()).lower()
+        key = hashlib.sha256(normalized.encode("utf-8", "ignore")).hexdigest()
+        simhash = _simhash(normalized)
+        cached = self._classify_cache_get(key, simhash, len(normalized.split()))
+        if cached is not None:
+            return cached
+
+        category, tags = self._classify_remote(content)
+        if category != "General" or tags:
+            self._classify_cache_put(key, simhash, category, tags)
+        return category, tags
+
+    def _load_classify_cache(self) -> None:
+        self._classify_cache = {}
+        self._classify_simhashes = []
+        try:
+            conn = self._cache_connect()
+            for key, simhash, category, tags in conn.execute(
+                "SELECT key, simhash, category, tags FROM classifications"
+            ):
+                self._classify_cache[key] = (category, json.loads(tags))
+                self._classify_simhashes.append((simhash & _SIMHASH_MASK, key))
+        except (sqlite3.Error, ValueError) as e:
+            print(f"No se pudo leer la caché de clasificación: {e}")
+
+    def _classify_cache_get(self, key: str, simhash: int, n_tokens: int) -> Optional[Tuple[str, List[str]]]:
+        with self._classify_lock:
+            if self._classify_cache is None:
+                self._load_classify_cache()
+            hit = self._classify_cache.get(key)
+            if hit is None and n_tokens >= self.SIMHASH_MIN_TOKENS:
+                # Casi-duplicados (correcciones de tipeo): SimHash a distancia ≤ 3
+                for other, other_key in self._classify_simhashes:
+                    if (simhash ^ other).bit_count() <= self.SIMHASH_MAX_DISTANCE:
+                        hit = self._classify_cache[other_key]
+                        break
+        if hit is None:
+            return None
+        return hit[0], list(hit[1])
+
+    def _classify_cache_put(self, key: str, simhash: int, category: str, tags: List[str]) -> None:
+        with self._classify_lock:
+            if self._classify_cache is None:
+                self._load_classify_cache()
+            if key not in self._classify_cache:
+                self._classify_simhashes.append((simhash, key))
+            self._classify_cache[key] = (category, list(tags))
+        signed = simhash - (1 << 64) if simhash >= (1 << 63) else simhash
+        try:
+            conn = self._cache_connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO classifications (key, simhash, category, tags) VALUES (?, ?, ?, ?)",
+                    (key, signed, category, json.dumps(tags, ensure_ascii=False)),
+                )
+        except sqlite3.Error as e:
+            print(f"No se pudo guardar la caché de clasificación: {e}")
+
+    def _classify_remote(self, content: str) -> Tuple[str, List[str]]:
         user = f"Contenido:\n{content}\n\nResponde solo con JSON."
         resp = self.client.chat.completions.create(
             model=self.settings.chat_model,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            messages=[SYSTEM_CLASSIFY_MSG, {"role": "user", "content": user}],
             temperature=0.2,
         )
         txt = resp.choices[0].message.content.strip()
@@ -63,57 +656,125 @@ class AIService:
         except Exception:
             return "General", []
 
+    def _select_contexts(self, contexts: List[Dict], max_tokens: Optional[int]) -> List[Dict]:
+        """Prepara contexto limitado por tokens si se especifica"""
+        if max_tokens:
+            return self._limit_context_by_tokens(contexts, max_tokens)
+        return contexts[:5]  # Límite por defecto
+
+    @staticmethod
+    def _build_user_prompt(question: str, contexts: List[Dict]) -> str:
+        ctx_text = "\n\n".join(_CTX_TMPL(c["title"], c["content"]) for c in contexts)
+        return f"Pregunta: {question}\n\nContexto:\n{ctx_text}"
+
     def answer_with_context(self, question: str, contexts: List[Dict], extended_analysis: bool = False, max_tokens: int = None) -> str:
         """Responde usando contexto de notas con límite de tokens opcional"""
         if not contexts:
             return "No hay contexto disponible para responder la pregunta."
         
-        # Preparar contexto limitado por tokens si se especifica
-        if max_tokens:
-            limited_contexts = self._limit_context_by_tokens(contexts, max_tokens)
-        else:
-            limited_contexts = contexts[:5]  # Límite por defecto
+        limited_contexts = self._select_contexts(contexts, max_tokens)
         
         if extended_analysis:
-            system = (
-                "Eres una secretaria IA especializada en análisis profundo de información. "
-                "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. "
-                "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
-                "- Usa MAYÚSCULAS para títulos principales\n"
-                "- Usa números para secciones (1., 2., etc.)\n"
-                "- Usa guiones (-) para sublistas\n"
-                "- Usa saltos de línea dobles para separar secciones\n"
-                "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
-                "Estructura requerida:\n"
-                "ANÁLISIS INTEGRAL\n\n"
-                "1. RESUMEN EJECUTIVO\n\n"
-                "2. ANÁLISIS DETALLADO\n\n"
-                "3. PUNTOS CLAVE IDENTIFICADOS\n\n"
-            )
+            system = SYSTEM_EXTENDED_MSG
             max_completion_tokens = 2500
         else:
-            system = (
-                "Eres una secretaria IA que contesta SOLO usando el contexto proporcionado. "
-                "Responde en texto plano, sin formato especial. "
-                "Si la respuesta no está en el contexto, admite que no está y sugiere cómo capturar esa información."
-            )
+            system = SYSTEM_SHORT_MSG
             max_completion_tokens = 1000
         
-        # Usar contextos limitados
-        ctx_text = "\n\n".join([f"Título: {c['title']}\nContenido:\n{c['content']}" for c in limited_contexts])
-        user = f"Pregunta: {question}\n\nContexto:\n{ctx_text}"
+        ctx_hash = self._contexts_hash(limited_contexts, extended_analysis)
+        q_emb = self._question_embedding(question)
+        if q_emb is not None:
+            cached = self.semantic_cache.lookup(q_emb, ctx_hash)
+            if cached is not None:
+                return cached
+        
+        user = self._build_user_prompt(question, limited_contexts)
         
         resp = self.client.chat.completions.create(
             model=self.settings.chat_model,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            messages=[system, {"role": "user", "content": user}],
             temperature=0.1,
             max_tokens=max_completion_tokens
         )
         
-        return resp.choices[0].message.content.strip()
+        answer = resp.choices[0].message.content.strip()
+        if q_emb is not None:
+            self.semantic_cache.add(q_emb, answer, ctx_hash)
+        return answer
+
+    @property
+    def encoding(self):
+        """Tokenizer de tiktoken para el modelo de chat, o None si no está disponible."""
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        model = self.settings.chat_model
+        if self._enc_model != model:
+            self._enc_model = model
+            self._token_counts.clear()
+            try:
+                try:
+                    self._enc = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self._enc = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                # Sin red la primera vez tiktoken no puede descargar el vocabulario
+                print(f"tiktoken no disponible, usando aproximación por caracteres: {e}")
+                self._enc = None
+        return self._enc
+
+    def _count_tokens(self, text: str) -> int:
+        """Cuenta tokens exactos con caché LRU (clave sha1 para textos largos)."""
+        key = text if len(text) <= 256 else hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+        count = self._token_counts.get(key)
+        if count is not None:
+            self._token_counts.move_to_end(key)
+            return count
+        count = len(self.encoding.encode(text))
+        self._token_counts[key] = count
+        if len(self._token_counts) > self.TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+        return count
 
     def _limit_context_by_tokens(self, contexts: List[Dict], max_tokens: int) -> List[Dict]:
-        """Limita contexto por tokens aproximados para reducir latencia"""
+        """Limita contexto por tokens reales para reducir latencia"""
+        enc = self.encoding
+        if enc is None:
+            return self._limit_context_by_chars(contexts, max_tokens)
+        
+        limited = []
+        total_tokens = 0
+        overhead = self.CTX_TOKEN_OVERHEAD
+        
+        for ctx in contexts:
+            content = ctx.get("content", "")
+            title = ctx.get("title", "")
+            
+            title_tokens = self._count_tokens(title)
+            content_tokens = self._count_tokens(content)
+            
+            if total_tokens + title_tokens + content_tokens + overhead > max_tokens and limited:
+                break
+            
+            # Truncar contenido si es necesario
+            remaining_tokens = max(max_tokens - total_tokens - title_tokens - overhead, 0)
+            if content_tokens > remaining_tokens:
+                content = enc.decode(enc.encode(content)[:remaining_tokens]) + "..."
+                content_tokens = remaining_tokens + 1
+            
+            limited.append({
+                "title": title,
+                "content": content
+            })
+            
+            total_tokens += title_tokens + content_tokens + overhead
+            
+            if len(limited) >= 5:  # Máximo 5 documentos
+                break
+        
+        return limited
+
+    def _limit_context_by_chars(self, contexts: List[Dict], max_tokens: int) -> List[Dict]:
+        """Limita contexto por tokens aproximados (sin tiktoken)"""
         limited = []
         total_chars = 0
         max_chars = max_tokens * 4  # Aproximación: 4 chars ≈ 1 token
@@ -143,100 +804,195 @@ class AIService:
                 break
         
         return limited
+
     def answer_with_context_streaming(self, question: str, contexts: List[Dict], extended_analysis: bool = False, max_tokens: int = None):
         """Responde usando contexto con streaming"""
         if not contexts:
             yield "No hay contexto disponible para responder la pregunta."
             return
         
-        # Preparar contexto limitado por tokens si se especifica
-        if max_tokens:
-            limited_contexts = self._limit_context_by_tokens(contexts, max_tokens)
-        else:
-            limited_contexts = contexts[:5]
+        limited_contexts = self._select_contexts(contexts, max_tokens)
         
         if extended_analysis:
-            system = (
-                "Eres una secretaria IA especializada en análisis profundo de información notas sobre reuniones, eventos problematicas, proyectos. "
-                "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. Util para un jefe de proyecto de software "
-                "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
-                "- Usa MAYÚSCULAS para títulos principales\n"
-                "- Usa números para secciones (1., 2., etc.)\n"
-                "- Usa guiones (-) para sublistas\n"
-                "- Usa saltos de línea dobles para separar secciones\n"
-                "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
-                "Estructura requerida:\n"
-                "ANÁLISIS\n\n"
-                "1. RESUMEN\n"
-                "Síntesis de los aspectos más críticos y hallazgos principales en 2-3 oraciones.\n\n"
-                "2. ANÁLISIS DETALLADO\n"
-                "Profundización en los temas principales con contexto y implicaciones.\n\n"
-                "3. PUNTOS CLAVE IDENTIFICADOS y tareas proximas si existen\n"
-            )
+            system = SYSTEM_EXTENDED_STREAM_MSG
             max_completion_tokens = 3500
         else:
-            system = (
-                "Eres una secretaria IA que contesta SOLO usando el contexto proporcionado. "
-                "Responde en texto plano, sin formato especial. "
-                "Si la respuesta no está en el contexto, admite que no está y sugiere cómo capturar esa información."
-            )
+            system = SYSTEM_SHORT_MSG
             max_completion_tokens = 1000
         
-        # Usar contextos limitados
-        ctx_text = "\n\n".join([f"Título: {c['title']}\nContenido:\n{c['content']}" for c in limited_contexts])
-        user = f"Pregunta: {question}\n\nContexto:\n{ctx_text}"
+        ctx_hash = self._contexts_hash(limited_contexts, extended_analysis)
+        q_emb = self._question_embedding(question)
+        if q_emb is not None:
+            cached = self.semantic_cache.lookup(q_emb, ctx_hash)
+            if cached is not None:
+                yield cached
+                return
+        
+        user = self._build_user_prompt(question, limited_contexts)
         
         # STREAMING REQUEST
         stream = self.client.chat.completions.create(
             model=self.settings.chat_model,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            messages=[system, {"role": "user", "content": user}],
             temperature=0.1,
             max_tokens=max_completion_tokens,
             stream=True  # ENABLE STREAMING
         )
         
+        # Agrupar deltas para no emitir una señal por cada 1-3 caracteres
+        parts = []
+        buf = []
+        buf_len = 0
+        last_flush = time.monotonic()
         for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            buf.append(delta)
+            buf_len += len(delta)
+            now = time.monotonic()
+            if buf_len >= self.STREAM_FLUSH_CHARS or now - last_flush >= self.STREAM_FLUSH_INTERVAL:
+                yield "".join(buf)
+                buf.clear()
+                buf_len = 0
+                last_flush = now
+        if buf:
+            yield "".join(buf)
+        
+        if q_emb is not None and parts:
+            self.semantic_cache.add(q_emb, "".join(parts).strip(), ctx_hash)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        """Versión awaitable de embed(); comparte su caché y agrupación."""
+        return await asyncio.to_thread(self.embed, texts)
+
+    async def aanswer_with_context_streaming(self, question: str, contexts: List[Dict], extended_analysis: bool = False, max_tokens: int = None):
+        """Como answer_with_context_streaming, pero solapa el embedding de la
+        pregunta con la preparación del prompt antes de abrir el stream."""
+        if not contexts:
+            yield "No hay contexto disponible para responder la pregunta."
+            return
+
+        async def question_embedding():
+            try:
+                return await asyncio.to_thread(self.embed_question, question)
+            except Exception as e:
+                print(f"Caché semántica deshabilitada para esta consulta: {e}")
+                return None
+
+        def prepare():
+            limited = self._select_contexts(contexts, max_tokens)
+            return limited, self._build_user_prompt(question, limited)
+
+        q_emb, (limited_contexts, user) = await asyncio.gather(
+            question_embedding(), asyncio.to_thread(prepare)
+        )
+
+        if extended_analysis:
+            system = SYSTEM_EXTENDED_STREAM_MSG
+            max_completion_tokens = 3500
+        else:
+            system = SYSTEM_SHORT_MSG
+            max_completion_tokens = 1000
+
+        ctx_hash = self._contexts_hash(limited_contexts, extended_analysis)
+        if q_emb is not None:
+            cached = self.semantic_cache.lookup(q_emb, ctx_hash)
+            if cached is not None:
+                yield cached
+                return
+
+        async with self._new_async_client() as aclient:
+            stream = await aclient.chat.completions.create(
+                model=self.settings.chat_model,
+                messages=[system, {"role": "user", "content": user}],
+                temperature=0.1,
+                max_tokens=max_completion_tokens,
+                stream=True
+            )
+
+            # Agrupar deltas para no emitir una señal por cada 1-3 caracteres
+            parts = []
+            buf = []
+            buf_len = 0
+            last_flush = time.monotonic()
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                buf.append(delta)
+                buf_len += len(delta)
+                now = time.monotonic()
+                if buf_len >= self.STREAM_FLUSH_CHARS or now - last_flush >= self.STREAM_FLUSH_INTERVAL:
+                    yield "".join(buf)
+                    buf.clear()
+                    buf_len = 0
+                    last_flush = now
+            if buf:
+                yield "".join(buf)
+
+        if q_emb is not None and parts:
+            self.semantic_cache.add(q_emb, "".join(parts).strip(), ctx_hash)
+
     def transcribe(self, wav_path: str) -> str:
         """Transcribe an audio file using Whisper API."""
-        with open(wav_path, "rb") as f:
-            tr = self.client.audio.transcriptions.create(
-                model=self.settings.transcription_model, file=f
-            )
+        upload_path, is_temp = self._prepare_audio_for_upload(wav_path)
+        try:
+            # Tupla (nombre, handle, mime): httpx sube el handle por bloques de 64 KB
+            # en lugar de cargar la grabación completa en memoria.
+            mime = mimetypes.guess_type(upload_path)[0] or "application/octet-stream"
+            with open(upload_path, "rb") as f:
+                tr = self.client.audio.transcriptions.create(
+                    model=self.settings.transcription_model,
+                    file=(os.path.basename(upload_path), f, mime),
+                )
+        finally:
+            if is_temp:
+                try:
+                    os.remove(upload_path)
+                except OSError:
+                    pass
         text = getattr(tr, "text", None) or getattr(tr, "data", None) or ""
         if isinstance(text, str):
             return text
         return str(text)
+
+    def _prepare_audio_for_upload(self, wav_path: str) -> Tuple[str, bool]:
+        """Convierte un WAV a FLAC temporal (sin pérdida, ~3x más liviano) para
+        acortar la subida. Devuelve (ruta, es_temporal); ante cualquier problema
+        se sube el archivo original."""
+        if not SOUNDFILE_AVAILABLE or not wav_path.lower().endswith(".wav"):
+            return wav_path, False
+        fd, flac_path = tempfile.mkstemp(suffix=".flac")
+        os.close(fd)
+        try:
+            with sf.SoundFile(wav_path) as src:
+                with sf.SoundFile(
+                    flac_path,
+                    mode="w",
+                    samplerate=src.samplerate,
+                    channels=src.channels,
+                    format="FLAC",
+                    subtype="PCM_16",
+                ) as dst:
+                    for block in src.blocks(blocksize=65536, dtype="int16"):
+                        dst.write(block)
+            return flac_path, True
+        except Exception as e:
+            print(f"No se pudo convertir a FLAC, se sube el WAV original: {e}")
+            try:
+                os.remove(flac_path)
+            except OSError:
+                pass
+            return wav_path, False
+
     def summarize_transcription(self, content: str) -> str:
         """Genera un resumen ejecutivo de una transcripción"""
         if not content.strip():
             return "No hay contenido para resumir."
         
-        system_prompt = """Eres un especialista en análisis y síntesis de transcripciones de audio.
-
-            PROCESO:
-            1. Corrige automáticamente errores típicos de transcripción (palabras mal interpretadas, nombres, números incorrectos)
-            2. Identifica los elementos más relevantes de la conversación
-            3. Estructura la información de forma clara y útil
-
-            FORMATO DE SALIDA:
-            - Texto plano sin markdown
-            - Máximo 300 palabras
-            - Estructura clara con secciones numeradas
-
-            CONTENIDO A EXTRAER:
-            1. Temas principales tratados
-            2. Puntos clave o información importante discutida
-            3. Decisiones, acuerdos o conclusiones (si las hay)
-            4. Acciones mencionadas o tareas pendientes (si las hay)
-            5. Aspectos relevantes que requieren seguimiento
-
-            INSTRUCCIONES:
-            - Mantén neutralidad, no asumas contexto específico
-            - Enfócate en resumir, no en interpretar o transformar
-            - Si hay información ambigua por errores de transcripción, úsala de la forma más probable
-            - Prioriza fidelidad al contenido original sobre estructuras predefinidas"""
 
         user_prompt = f"""Crea un resumen de la siguiente transcripción, corrigiendo errores evidentes de transcripción:{content}"""
         
@@ -244,7 +1000,7 @@ class AIService:
             resp = self.client.chat.completions.create(
                 model=self.settings.chat_model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    SYSTEM_SUMMARY_MSG,
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,
@@ -1,4 +1,3 @@
-import queue
 import threading
 import time
 import os
@@ -13,10 +12,20 @@ import soundfile as sf
 class SimpleRecorder:
     """Grabador simple solo para respaldo opcional"""
 
+    BLOCKSIZE = 4096  # 256 ms a 16 kHz: 4x menos callbacks que con 1024
+    RING_BLOCKS = 64  # ~16 s de margen a 16 kHz
+
     def __init__(self, samplerate: int = 16000, channels: int = 1):
         self.samplerate = samplerate
         self.channels = channels
-        self._q = queue.Queue()
+        # Ring buffer preasignado: el callback copia cada bloque a su slot y
+        # avanza _head; el thread de escritura consume hasta alcanzarlo (_tail).
+        self._ring = np.empty((self.RING_BLOCKS, self.BLOCKSIZE * channels), dtype=np.int16)
+        self._lengths = np.zeros(self.RING_BLOCKS, dtype=np.int64)
+        self._head = 0
+        self._tail = 0
+        self._overruns = 0
+        self._data_ready = threading.Event()
         self._recording = False
         self._thread = None
         self._outfile = None
@@ -31,12 +40,11 @@ class SimpleRecorder:
         self._outfile = outfile
         self._recording = True
         
-        # Limpiar queue
-        while not self._q.empty():
-            try:
-                self._q.get_nowait()
-            except queue.Empty:
-                break
+        # Limpiar ring buffer
+        self._head = 0
+        self._tail = 0
+        self._overruns = 0
+        self._data_ready.clear()
         
         # Thread de escritura
         self._thread = threading.Thread(target=self._writer_thread, daemon=True)
@@ -49,7 +57,7 @@ class SimpleRecorder:
                 channels=self.channels,
                 dtype="int16",
                 callback=self._callback,
-                blocksize=1024
+                blocksize=self.BLOCKSIZE
             )
             self._stream.start()
             return {'status': 'recording', 'file': outfile}
@@ -59,8 +67,19 @@ class SimpleRecorder:
 
     def _callback(self, indata, frames, time_info, status):
         """Callback simple"""
-        if self._recording:
-            self._q.put(bytes(indata))
+        if not self._recording:
+            return
+        head = self._head
+        if head - self._tail >= self.RING_BLOCKS:
+            self._overruns += 1  # El writer no alcanza; descartar el bloque
+            return
+        samples = np.frombuffer(indata, dtype=np.int16)
+        n = min(samples.size, self._ring.shape[1])
+        slot = head % self.RING_BLOCKS
+        self._ring[slot, :n] = samples[:n]
+        self._lengths[slot] = n
+        self._head = head + 1
+        self._data_ready.set()
 
     def _writer_thread(self):
         """Thread de escritura simple"""
@@ -75,16 +94,22 @@ class SimpleRecorder:
                 channels=self.channels,
                 subtype="PCM_16",
             ) as f:
-                while self._recording or not self._q.empty():
-                    try:
-                        data = self._q.get(timeout=0.1)
-                        f.buffer_write(data, dtype="int16")
-                    except queue.Empty:
+                while True:
+                    tail = self._tail
+                    if tail < self._head:
+                        slot = tail % self.RING_BLOCKS
+                        f.buffer_write(self._ring[slot, :self._lengths[slot]], dtype="int16")
+                        self._tail = tail + 1
                         continue
-                    except Exception:
+                    if not self._recording:
                         break
+                    self._data_ready.wait(timeout=0.1)
+                    self._data_ready.clear()
         except Exception as e:
             print(f"Error escribiendo audio: {e}")
+        
+        if self._overruns:
+            print(f"Advertencia: se descartaron {self._overruns} bloques de audio")
 
     def stop(self):
         """Detiene grabación"""
@@ -1,11 +1,103 @@
+import json
 import os
+import re
 import sqlite3
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Tuple
-import pytz
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from typing import ContextManager, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
-@dataclass
+_CHILE_TZ = ZoneInfo('America/Santiago')
+_FTS_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_NOTE_COLS = "id, title, content, category, tags, source, audio_path, created_at, updated_at"
+_SELECT_NOTE = f"SELECT {_NOTE_COLS} FROM notes"
+# Characters of content shown as list preview; longer content ends in "..."
+PREVIEW_CHARS = 100
+_SELECT_PREVIEW = (
+    f"SELECT id, title, substr(content, 1, {PREVIEW_CHARS}) || "
+    f"CASE WHEN length(content) > {PREVIEW_CHARS} THEN '...' ELSE '' END AS preview, "
+    "updated_at, source, audio_path FROM notes"
+)
+
+# SQL constante: el texto de cada consulta es siempre el mismo y la caché de
+# sentencias de la conexión reutiliza el plan ya compilado
+_SEARCH_TEXT_FILTERS = {
+    "trigram": " AND id IN (SELECT rowid FROM notes_trgm WHERE notes_trgm MATCH ?)",
+    "fts": " AND id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)",
+    "like": " AND (title LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\')",
+    None: "",
+}
+_SEARCH_WHERE = {
+    (text_mode, by_category, by_tag, by_source, by_since): (
+        " WHERE 1=1"
+        + text_filter
+        + (" AND category=?" if by_category else "")
+        + (" AND id IN (SELECT note_id FROM note_tags WHERE tag=?)" if by_tag else "")
+        + (" AND source=?" if by_source else "")
+        + (" AND updated_at_ts > ?" if by_since else "")
+        + " ORDER BY updated_at_ts DESC LIMIT ?"
+    )
+    for text_mode, text_filter in _SEARCH_TEXT_FILTERS.items()
+    for by_category in (False, True)
+    for by_tag in (False, True)
+    for by_source in (False, True)
+    for by_since in (False, True)
+}
+_SEARCH_SQL = {key: _SELECT_NOTE + where for key, where in _SEARCH_WHERE.items()}
+_SEARCH_PREVIEW_SQL = {key: _SELECT_PREVIEW + where for key, where in _SEARCH_WHERE.items()}
+
+
+_INSERT_NOTE_SQL = (
+    "INSERT INTO notes(title, content, category, tags, source, audio_path, "
+    "created_at, updated_at, created_at_ts, updated_at_ts) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE_NOTE_SQL = (
+    "UPDATE notes SET title=?, content=?, category=?, tags=?, source=?, audio_path=?, "
+    "updated_at=?, updated_at_ts=? WHERE id=?"
+)
+# ISO 8601 (con o sin zona) -> epoch en ms, para migrar filas antiguas
+_ISO_TO_EPOCH_MS = "CAST(ROUND((julianday({}) - 2440587.5) * 86400000) AS INTEGER)"
+# INSERT ... RETURNING disponible desde SQLite 3.35
+_RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so the query matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _dump_tags(tags: List[str]) -> str:
+    """Serialize tags as a JSON array for notes.tags."""
+    return json.dumps(tags, ensure_ascii=False)
+
+
+@lru_cache(maxsize=32)
+def _merge_update_sql(n: int) -> str:
+    return f"UPDATE notes SET category = ? WHERE category IN ({','.join('?' * n)})"
+
+
+@lru_cache(maxsize=32)
+def _merge_delete_sql(n: int) -> str:
+    return f"DELETE FROM categories WHERE name IN ({','.join('?' * n)})"
+
+class NoteListRow(NamedTuple):
+    """Columns the notes list renders; ``preview`` comes truncated from SQL."""
+
+    id: int
+    title: str
+    preview: str
+    updated_at: str
+    source: str
+    audio_path: Optional[str]
+
+
+@dataclass(slots=True)
 class Note:
     """Representation of a note in the database."""
 
@@ -18,6 +110,10 @@ class Note:
     audio_path: Optional[str]
     created_at: str
     updated_at: str
+    # (updated_at, día, texto) formateado por la UI; se recalcula si cambia alguno
+    _display_date: Optional[Tuple[str, int, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 class NotesDB:
@@ -27,14 +123,117 @@ class NotesDB:
         self.db_path = db_path
         # Ensure directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Una conexión por hilo, reutilizada entre llamadas para conservar
+        # el esquema ya parseado y la caché de páginas de SQLite
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._fts_available = False
+        self._trigram_available = False
+        # Categorías ordenadas en memoria; se invalida en cada escritura
+        self._cat_cache: Optional[List[str]] = None
+        self._cat_gen = 0
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        """Return this thread's cached connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            # PRAGMAs por conexión: fsync solo en checkpoints de WAL, temporales
+            # en memoria, ~64 MB de caché de páginas y lecturas vía mmap
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    @contextmanager
+    def _txn(self) -> Iterator[sqlite3.Cursor]:
+        """Run several statements in one BEGIN IMMEDIATE transaction."""
+        conn = self._connect()
+        if getattr(self._local, "in_txn", False):
+            # Dentro de transaction(): se suma a la transacción exterior, sin commit propio
+            yield conn.cursor()
+            return
+        # Toma el lock de escritura al inicio: sin estados intermedios visibles
+        # y un solo commit para todas las sentencias
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.in_txn = True
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            # La caché pudo leer categorías que no llegaron a confirmarse
+            self._local.cat_changed = False
+            self._invalidate_categories()
+            raise
+        finally:
+            self._local.in_txn = False
+        conn.commit()
+        # Recién ahora las categorías nuevas son visibles para otros hilos
+        if getattr(self._local, "cat_changed", False):
+            self._local.cat_changed = False
+            self._invalidate_categories()
+
+    def _mark_categories_changed(self) -> None:
+        """Invalidate the category cache when the current transaction commits."""
+        self._local.cat_changed = True
+
+    def _invalidate_categories(self) -> None:
+        self._cat_gen += 1
+        self._cat_cache = None
+
+    @contextmanager
+    def _use_conn(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection; commits on exit unless a transaction() is open."""
+        conn = self._connect()
+        if getattr(self._local, "in_txn", False):
+            # La transacción exterior decide commit o rollback
+            yield conn
+            return
+        with conn:
+            yield conn
+
+    def transaction(self) -> ContextManager[sqlite3.Cursor]:
+        """Group several writes (e.g. add_category + upsert_note) into one commit."""
+        return self._txn()
+
+    def close_thread_connection(self) -> None:
+        """Close the calling thread's cached connection (for short-lived worker threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._conns_lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close every cached connection."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def _init_db(self) -> None:
         """Initialize tables if they don't exist."""
         with self._connect() as conn:
+            # WAL es persistente en el archivo: lectores y escritor no se bloquean
+            conn.execute("PRAGMA journal_mode=WAL")
             cur = conn.cursor()
             cur.execute(
                 """
@@ -47,7 +246,9 @@ class NotesDB:
                     source TEXT NOT NULL,
                     audio_path TEXT,
                     created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
+                    updated_at TEXT NOT NULL,
+                    created_at_ts INTEGER,
+                    updated_at_ts INTEGER
                 );
                 """
             )
@@ -69,203 +270,473 @@ class NotesDB:
                 CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at);
                 """
             )
+            columns = {r[1] for r in cur.execute("PRAGMA table_info(notes)")}
+            if "updated_at_ts" not in columns:
+                # Migración: fechas como epoch en ms (las columnas ISO quedan para mostrar)
+                cur.execute("ALTER TABLE notes ADD COLUMN created_at_ts INTEGER")
+                cur.execute("ALTER TABLE notes ADD COLUMN updated_at_ts INTEGER")
+                cur.execute(
+                    "UPDATE notes SET created_at_ts = "
+                    + _ISO_TO_EPOCH_MS.format("created_at")
+                    + ", updated_at_ts = "
+                    + _ISO_TO_EPOCH_MS.format("updated_at")
+                )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_updated_ts ON notes(updated_at_ts DESC, id);
+                """
+            )
+            # Índice parcial: solo las notas con audio, se mantiene pequeño
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_audio ON notes(updated_at_ts DESC) WHERE audio_path IS NOT NULL;
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_source_updated ON notes(source, updated_at_ts DESC);
+                """
+            )
+            # Tags normalizados para filtrar por índice (notes.tags queda como copia de lectura)
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS note_tags (
+                    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (note_id, tag)
+                ) WITHOUT ROWID;
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag);
+                """
+            )
+            version = cur.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # Migración: poblar note_tags desde las notas existentes
+                rows = cur.execute("SELECT id, tags FROM notes WHERE tags != ''").fetchall()
+                cur.executemany(
+                    "INSERT OR IGNORE INTO note_tags(note_id, tag) VALUES (?, ?)",
+                    [(note_id, tag) for note_id, tags in rows for tag in tags.split(",") if tag],
+                )
+                cur.execute("PRAGMA user_version = 1")
+                version = 1
+            # Migración: tags separados por coma -> arreglo JSON
+            rows = cur.execute("SELECT id, tags FROM notes WHERE substr(tags, 1, 1) != '['").fetchall()
+            if rows:
+                cur.executemany(
+                    "UPDATE notes SET tags=? WHERE id=?",
+                    [(_dump_tags([t for t in tags.split(",") if t]), note_id) for note_id, tags in rows],
+                )
+            self._fts_available = self._init_fts(cur, version)
+            if self._fts_available:
+                self._trigram_available = self._init_trigram(cur, version)
             conn.commit()
 
+    def _init_fts(self, cur: sqlite3.Cursor, version: int) -> bool:
+        """Create the FTS5 index over notes(title, content) kept in sync by triggers."""
+        try:
+            cur.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                    title, content,
+                    content='notes', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+                """
+            )
+        except sqlite3.OperationalError:
+            # SQLite compilado sin FTS5: search_notes usa LIKE
+            return False
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF title, content ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        if version < 2:
+            # Migración: indexar las notas existentes
+            cur.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+            cur.execute("PRAGMA user_version = 2")
+        return True
+
+    def _init_trigram(self, cur: sqlite3.Cursor, version: int) -> bool:
+        """Create the trigram FTS5 index used for substring search (SQLite >= 3.34)."""
+        # remove_diacritics del tokenizador trigram existe desde SQLite 3.45
+        for tokenize in ("trigram remove_diacritics 1", "trigram"):
+            try:
+                cur.execute(
+                    f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS notes_trgm USING fts5(
+                        title, content,
+                        content='notes', content_rowid='id',
+                        tokenize='{tokenize}'
+                    );
+                    """
+                )
+                break
+            except sqlite3.OperationalError:
+                continue
+        else:
+            return False
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_trgm(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_trgm(notes_trgm, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_au AFTER UPDATE OF title, content ON notes BEGIN
+                INSERT INTO notes_trgm(notes_trgm, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO notes_trgm(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        if version < 3:
+            # Migración: indexar las notas existentes
+            cur.execute("INSERT INTO notes_trgm(notes_trgm) VALUES ('rebuild')")
+            cur.execute("PRAGMA user_version = 3")
+        return True
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """Turn free text into a safe FTS5 query: every word quoted, as a prefix, AND-ed."""
+        words = _FTS_WORD_RE.findall(query)
+        if not words:
+            return None
+        return " ".join(f'"{w}"*' for w in words)
+
+    @staticmethod
+    def _write_tags(cur: sqlite3.Cursor, note_id: int, tags: List[str]) -> None:
+        """Replace the normalized tag rows of a note."""
+        cur.execute("DELETE FROM note_tags WHERE note_id=?", (note_id,))
+        cur.executemany(
+            "INSERT OR IGNORE INTO note_tags(note_id, tag) VALUES (?, ?)",
+            [(note_id, tag) for tag in tags if tag],
+        )
+
     def add_category(self, name: str) -> None:
         """Insert a category if it does not exist."""
-        with self._connect() as conn:
-            cur = conn.cursor()
-            try:
-                cur.execute("INSERT INTO categories(name) VALUES (?)", (name,))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                # Category already exists
-                pass
+        self.add_categories([name])
+
+    def add_categories(self, names: Iterable[str]) -> None:
+        """Insert several categories in one transaction, skipping existing ones."""
+        with self._txn() as cur:
+            self._mark_categories_changed()
+            cur.executemany("INSERT OR IGNORE INTO categories(name) VALUES (?)", [(n,) for n in names])
 
     def list_categories(self) -> List[str]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT name FROM categories ORDER BY name ASC")
-            rows = cur.fetchall()
-            return [r[0] for r in rows]
+        cats = self._cat_cache
+        if cats is None:
+            gen = self._cat_gen
+            with self._use_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT name FROM categories ORDER BY name ASC")
+                cats = [r[0] for r in cur.fetchall()]
+            # Si hubo un commit mientras se leía, no guardar una lista vieja
+            if gen == self._cat_gen:
+                self._cat_cache = cats
+        return list(cats)
+
     def rename_category(self, old_name: str, new_name: str):
         """Renombra una categoría en todas las notas"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+        with self._txn() as cursor:
+            self._mark_categories_changed()
             cursor.execute("UPDATE notes SET category = ? WHERE category = ?", (new_name, old_name))
             # También actualizar en la tabla categories
             cursor.execute("UPDATE categories SET name = ? WHERE name = ?", (new_name, old_name))
-            conn.commit()
 
     def delete_category_and_reassign(self, category_to_delete: str, target_category: str):
         """Elimina categoría y reasigna notas a otra categoría"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+        with self._txn() as cursor:
+            self._mark_categories_changed()
             # Reasignar notas
             cursor.execute("UPDATE notes SET category = ? WHERE category = ?", (target_category, category_to_delete))
             # Eliminar categoría de la tabla categories
             cursor.execute("DELETE FROM categories WHERE name = ?", (category_to_delete,))
-            conn.commit()
 
     def delete_category(self, category_name: str):
         """Elimina una categoría de la tabla categories"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+        with self._txn() as cursor:
+            self._mark_categories_changed()
             cursor.execute("DELETE FROM categories WHERE name = ?", (category_name,))
-            conn.commit()
 
     def merge_categories(self, categories_to_merge: list, target_name: str):
         """Fusiona múltiples categorías en una"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            
+        with self._txn() as cursor:
+            self._mark_categories_changed()
             # Primero, agregar la categoría objetivo si no existe
             cursor.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (target_name,))
             
             # Actualizar todas las notas
-            placeholders = ','.join(['?' for _ in categories_to_merge])
-            cursor.execute(f"UPDATE notes SET category = ? WHERE category IN ({placeholders})", 
-                        [target_name] + categories_to_merge)
+            cursor.execute(_merge_update_sql(len(categories_to_merge)),
+                        [target_name] + list(categories_to_merge))
             
-            # Eliminar las categorías fusionadas de la tabla categories
-            for category in categories_to_merge:
-                if category != target_name:  # No eliminar la categoría objetivo
-                    cursor.execute("DELETE FROM categories WHERE name = ?", (category,))
-            
-            conn.commit()
+            # Eliminar las categorías fusionadas de la tabla categories (menos la objetivo)
+            to_delete = [c for c in categories_to_merge if c != target_name]
+            if to_delete:
+                cursor.execute(_merge_delete_sql(len(to_delete)), to_delete)
+
+    @staticmethod
+    def _insert_note(cur: sqlite3.Cursor, params: Tuple) -> int:
+        """Insert a note row and return its new id."""
+        if _RETURNING_SUPPORTED:
+            cur.execute(_INSERT_NOTE_SQL + " RETURNING id", params)
+            return cur.fetchone()[0]
+        cur.execute(_INSERT_NOTE_SQL, params)
+        return cur.lastrowid
+
     def upsert_note(self, note: Note) -> int:
         """Insert or update a note and return its ID."""
         # Usar hora de Chile en lugar de UTC
-        chile_tz = pytz.timezone('America/Santiago')
-        now = datetime.now(chile_tz).isoformat()
+        now = datetime.now(_CHILE_TZ).isoformat()
+        now_ms = int(time.time() * 1000)
         
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._txn() as cur:
             if note.id is None:
-                cur.execute(
-                    """
-                    INSERT INTO notes(title, content, category, tags, source, audio_path, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                note_id = self._insert_note(
+                    cur,
                     (
                         note.title,
                         note.content,
                         note.category,
-                        ",".join(note.tags),
+                        _dump_tags(note.tags),
                         note.source,
                         note.audio_path,
                         now,
                         now,
+                        now_ms,
+                        now_ms,
                     ),
                 )
-                note_id = cur.lastrowid
             else:
                 cur.execute(
-                    """
-                    UPDATE notes
-                    SET title=?, content=?, category=?, tags=?, source=?, audio_path=?, updated_at=?
-                    WHERE id=?
-                    """,
+                    _UPDATE_NOTE_SQL,
                     (
                         note.title,
                         note.content,
                         note.category,
-                        ",".join(note.tags),
+                        _dump_tags(note.tags),
                         note.source,
                         note.audio_path,
                         now,
+                        now_ms,
                         note.id,
                     ),
                 )
                 note_id = note.id
-            conn.commit()
-            return int(note_id)
+                if cur.rowcount == 0:
+                    # La nota ya no existe (p. ej. borrada en otro hilo): sin tags que escribir
+                    return int(note_id)
+            self._write_tags(cur, note_id, note.tags)
+        return int(note_id)
+
+    def upsert_notes(self, notes: List[Note]) -> List[int]:
+        """Insert or update many notes in a single transaction and return their IDs."""
+        now = datetime.now(_CHILE_TZ).isoformat()
+        now_ms = int(time.time() * 1000)
+        
+        ids: List[Optional[int]] = [n.id for n in notes]
+        with self._txn() as cur:
+            # Inserciones una a una (se necesita cada id), pero sin commit intermedio
+            for i, note in enumerate(notes):
+                if note.id is not None:
+                    continue
+                ids[i] = self._insert_note(
+                    cur,
+                    (note.title, note.content, note.category, _dump_tags(note.tags),
+                     note.source, note.audio_path, now, now, now_ms, now_ms),
+                )
+            # Una a una para saber cuáles existen (las borradas no reciben tags)
+            missing = set()
+            for n in notes:
+                if n.id is None:
+                    continue
+                cur.execute(
+                    _UPDATE_NOTE_SQL,
+                    (n.title, n.content, n.category, _dump_tags(n.tags), n.source, n.audio_path, now, now_ms, n.id),
+                )
+                if cur.rowcount == 0:
+                    missing.add(n.id)
+            for note_id, note in zip(ids, notes):
+                if note_id not in missing:
+                    self._write_tags(cur, note_id, note.tags)
+        return [int(i) for i in ids]
+
+    @staticmethod
+    def _row_to_note(r: sqlite3.Row) -> Note:
+        """Build a Note from a notes row."""
+        tags = r["tags"]
+        return Note(
+            id=r["id"],
+            title=r["title"],
+            content=r["content"],
+            category=r["category"],
+            tags=json.loads(tags) if tags and tags != "[]" else [],
+            source=r["source"],
+            audio_path=r["audio_path"],
+            created_at=r["created_at"],
+            updated_at=r["updated_at"],
+        )
+
     def get_note(self, note_id: int) -> Optional[Note]:
         """Retrieve a note by its ID."""
-        with self._connect() as conn:
+        with self._use_conn() as conn:
             cur = conn.cursor()
             cur.execute(
-                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes WHERE id=?",
+                _SELECT_NOTE + " WHERE id=?",
                 (note_id,),
             )
             row = cur.fetchone()
             if not row:
                 return None
-            return Note(
-                id=row[0],
-                title=row[1],
-                content=row[2],
-                category=row[3],
-                tags=row[4].split(",") if row[4] else [],
-                source=row[5],
-                audio_path=row[6],
-                created_at=row[7],
-                updated_at=row[8],
-            )
+            return self._row_to_note(row)
 
     def delete_note(self, note_id: int) -> None:
         """Delete a note by ID."""
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._txn() as cur:
             cur.execute("DELETE FROM notes WHERE id=?", (note_id,))
-            conn.commit()
 
-    def search_notes(
+    def _iter_search(
         self,
+        sql_by_key: dict,
         query: str,
-        category: Optional[str] = None,
-        tag: Optional[str] = None,
-    ) -> List[Note]:
-        """Keyword-based search for notes with optional filters."""
-        with self._connect() as conn:
+        category: Optional[str],
+        tag: Optional[str],
+        source: Optional[str],
+        updated_since: Optional[float],
+        limit: Optional[int],
+    ) -> Iterator[sqlite3.Row]:
+        """Run the search statement from ``sql_by_key`` that matches the given filters."""
+        with self._use_conn() as conn:
             cur = conn.cursor()
-            sql = "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes WHERE (title LIKE ? OR content LIKE ?)"
-            params: Tuple[str, ...] = (f"%{query}%", f"%{query}%")
+            params: Tuple = ()
+            fts_query = self._fts_query(query) if self._fts_available and len(query.strip()) > 1 else None
+            if self._trigram_available and len(query) >= 3:
+                # Subcadena literal (mismo resultado que LIKE '%query%') resuelta por índice
+                text_mode = "trigram"
+                params += ('"' + query.replace('"', '""') + '"',)
+            elif fts_query:
+                text_mode = "fts"
+                params += (fts_query,)
+            elif query:
+                text_mode = "like"
+                pattern = f"%{_escape_like(query)}%"
+                params += (pattern, pattern)
+            else:
+                text_mode = None
             if category:
-                sql += " AND category=?"
                 params += (category,)
             if tag:
-                sql += " AND instr(tags, ?) > 0"
                 params += (tag,)
-            sql += " ORDER BY updated_at DESC"
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            return [
-                Note(
-                    id=r[0],
-                    title=r[1],
-                    content=r[2],
-                    category=r[3],
-                    tags=r[4].split(",") if r[4] else [],
-                    source=r[5],
-                    audio_path=r[6],
-                    created_at=r[7],
-                    updated_at=r[8],
-                )
-                for r in rows
-            ]
+            if source:
+                params += (source,)
+            if updated_since is not None:
+                params += (int(updated_since * 1000),)
+            # LIMIT -1 = sin límite
+            params += (limit if limit is not None else -1,)
+            key = (text_mode, bool(category), bool(tag), bool(source), updated_since is not None)
+            cur.execute(sql_by_key[key], params)
+            yield from cur
 
-    def list_notes(self, limit: int = 100) -> List[Note]:
-        """List most recent notes up to a limit."""
-        with self._connect() as conn:
+    def iter_search_notes(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Note]:
+        """Keyword-based search yielding notes as rows are read from the cursor.
+
+        ``updated_since`` is an epoch timestamp in seconds; only notes updated
+        after it are returned.
+        """
+        rows = self._iter_search(_SEARCH_SQL, query, category, tag, source, updated_since, limit)
+        for r in rows:
+            yield self._row_to_note(r)
+
+    def search_notes(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Note]:
+        """Keyword-based search for notes with optional filters."""
+        return list(self.iter_search_notes(query, category, tag, source, updated_since, limit))
+
+    def iter_search_notes_preview(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[NoteListRow]:
+        """Same search as iter_search_notes, reading only the columns the list shows."""
+        rows = self._iter_search(_SEARCH_PREVIEW_SQL, query, category, tag, source, updated_since, limit)
+        for r in rows:
+            yield NoteListRow(*r)
+
+    def search_notes_preview(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[NoteListRow]:
+        """List rows for a search; use get_note() to load a full note."""
+        return list(self.iter_search_notes_preview(query, category, tag, source, updated_since, limit))
+
+    def list_notes_preview(self, limit: int = 100) -> List[NoteListRow]:
+        """List rows for the most recent notes up to a limit."""
+        return self.search_notes_preview("", limit=limit)
+
+    def iter_notes(self, limit: int = 100) -> Iterator[Note]:
+        """Yield the most recent notes up to a limit without materializing them."""
+        with self._use_conn() as conn:
             cur = conn.cursor()
             cur.execute(
-                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes ORDER BY updated_at DESC LIMIT ?",
+                _SELECT_NOTE + " ORDER BY updated_at_ts DESC LIMIT ?",
                 (limit,),
             )
-            rows = cur.fetchall()
-            return [
-                Note(
-                    id=r[0],
-                    title=r[1],
-                    content=r[2],
-                    category=r[3],
-                    tags=r[4].split(",") if r[4] else [],
-                    source=r[5],
-                    audio_path=r[6],
-                    created_at=r[7],
-                    updated_at=r[8],
-                )
-                for r in rows
-            ]
+            for r in cur:
+                yield self._row_to_note(r)
+
+    def list_notes(self, limit: int = 100) -> List[Note]:
+        """List most recent notes up to a limit."""
+        return list(self.iter_notes(limit))
             
\ No newline at end of file
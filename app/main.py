@@ -1,5 +1,5 @@
 # app/main.py - Versión mejorada
-from collections import deque
+from collections import OrderedDict, deque
 import os
 os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
 os.environ.setdefault("CHROMADB_TELEMETRY_IMPLEMENTATION", "noop")
@@ -7,23 +7,31 @@ os.environ.setdefault("CHROMADB_DISABLE_TELEMETRY", "1")
 
 import re
 import sys
+import math
+import io
 import json
 import time
+import hashlib
+import heapq
+from itertools import chain, islice
+import asyncio
 import threading
-from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Callable, Iterable, Set, Tuple
 from enum import Enum
 import speech_recognition as sr
 import queue
-import pytz
+from zoneinfo import ZoneInfo
 from concurrent.futures import ThreadPoolExecutor, Future
 from PySide6.QtCore import (
         Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve, 
-        QRect, QThread, Signal, QCoreApplication, QPoint
+        QRect, QThread, Signal, QCoreApplication, QPoint, QLineF,
+        QSaveFile, QIODevice, QSignalBlocker
     )
 from PySide6.QtGui import (
-        QAction, QIcon, QKeySequence, QPalette, QFont, QPixmap, 
-        QPainter, QBrush, QColor, QPen, QTextCursor
+        QAction, QIcon, QKeySequence, QPalette, QFont, QFontMetrics, QPixmap, 
+        QPainter, QBrush, QColor, QPen, QTextCursor, QTextDocument
     )
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -33,18 +41,30 @@ from PySide6.QtWidgets import (
     QSplitter, QToolBar, QGroupBox, QProgressBar, QInputDialog, QSlider,
     QStatusBar, QGridLayout, QDialog, QScrollArea, QSizePolicy, QSpacerItem
 )
-import pygame
 import tempfile
 import subprocess
+import wave
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 from app.settings import Settings
-from app.db import NotesDB, Note
-from app.ai import AIService
+from app.db import NotesDB, Note, NoteListRow
+from app.ai import AIService, request_scope
 from app.vectorstore import VectorIndex
 
-import pyperclip
-
 APP_NAME = "SecreIA"
+CHILE_TZ = ZoneInfo('America/Santiago')
+UTC = timezone.utc
+MONTHS_ES = (
+    'ene', 'feb', 'mar', 'abr', 'may', 'jun',
+    'jul', 'ago', 'sep', 'oct', 'nov', 'dic'
+)
+
 # Agregar después de los imports existentes (línea ~40)
 
 
@@ -68,6 +88,11 @@ class AnalysisWorker(QThread):
         
     def run(self):
         """Ejecuta análisis en hilo separado con streaming - SOLO VECTORIAL"""
+        # Búsqueda y caché semántica comparten un único embedding de la pregunta
+        with request_scope():
+            self._run_analysis()
+
+    def _run_analysis(self):
         try:
             self.analysis_progress.emit("Verificando índice vectorial...")
             
@@ -143,18 +168,27 @@ class AnalysisWorker(QThread):
             print("🔄 Iniciando reindexación forzada...")
             all_notes = self.db.list_notes(limit=1000)
             
-            for i, note in enumerate(all_notes):
+            # Todas las notas de una vez: los chunks nuevos se embeben por lotes, no nota por nota
+            try:
+                added = self.vector.index_notes(all_notes)
+                print(f"✅ Reindexación completa: {len(all_notes)} notas procesadas ({added} chunks nuevos)")
+                return
+            except Exception as e:
+                print(f"⚠️ Reindexación por lotes falló ({e}); reintentando nota por nota")
+            
+            # Una nota que falla (p. ej. rechazada por la API de embeddings) no detiene al resto
+            failed = 0
+            for note in all_notes:
                 try:
                     self.vector.index_note(
-                        note.id, note.title, note.content, 
+                        note.id, note.title, note.content,
                         note.category, note.tags, note.source
                     )
-                    if i % 10 == 0:  # Log cada 10 notas
-                        print(f"✅ Reindexadas {i+1}/{len(all_notes)} notas")
                 except Exception as e:
+                    failed += 1
                     print(f"❌ Error reindexando nota {note.id}: {e}")
-                    
-            print(f"✅ Reindexación completa: {len(all_notes)} notas procesadas")
+            
+            print(f"✅ Reindexación completa: {len(all_notes)} notas procesadas ({failed} con error)")
             
         except Exception as e:
             print(f"❌ Error en reindexación forzada: {e}")
@@ -162,18 +196,9 @@ class AnalysisWorker(QThread):
     def _generate_streaming_response(self, contexts: list):
         """Genera respuesta con streaming"""
         try:
-            # Usar el método de streaming de AIService
-            full_response = ""
-            
-            for chunk in self.ai.answer_with_context_streaming(
-                self.question, 
-                contexts, 
-                extended_analysis=True,
-                max_tokens=2000
-            ):
-                if chunk:
-                    full_response += chunk
-                    self.analysis_streaming.emit(chunk)  # Emitir cada chunk
+            # Streaming asíncrono: el embedding de la pregunta y el armado del
+            # prompt corren en paralelo antes de abrir la conexión
+            full_response = asyncio.run(self._stream_response(contexts))
             
             # Formatear respuesta final con fuentes
             final_response = f"{full_response}\n\n"
@@ -186,29 +211,126 @@ class AnalysisWorker(QThread):
             
         except Exception as e:
             self.analysis_error.emit(f"Error generando respuesta: {str(e)}")
+
+    async def _stream_response(self, contexts: list) -> str:
+        parts = []
+        async for chunk in self.ai.aanswer_with_context_streaming(
+            self.question, 
+            contexts, 
+            extended_analysis=True,
+            max_tokens=2000
+        ):
+            if chunk:
+                parts.append(chunk)
+                self.analysis_streaming.emit(chunk)  # Emitir cada chunk
+        return "".join(parts)
+class SummaryCache:
+    """Caché LRU de resúmenes IA por huella de las notas, persistida en JSON"""
+    
+    MAX_ENTRIES = 32
+    
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, "summary_cache.json")
+        self.audio_dir = os.path.join(data_dir, "summary_audio")
+        self._entries: "OrderedDict[str, Tuple[str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def make_key(model: str, system_prompt: str, content: str) -> str:
+        """Huella del resumen: mismo modelo, prompt y notas -> misma respuesta"""
+        payload = json.dumps([model, system_prompt, content], ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def audio_path_for(self, key: str) -> str:
+        os.makedirs(self.audio_dir, exist_ok=True)
+        return os.path.join(self.audio_dir, f"{key}.wav")
+    
+    def owns(self, path: Optional[str]) -> bool:
+        """Indica si el archivo de audio pertenece a la caché (no se borra al regenerar)"""
+        return bool(path) and os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.audio_dir)
+    
+    def get(self, key: str) -> Optional[Tuple[str, Optional[str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: str, summary: str, audio_path: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries[key] = (summary, audio_path)
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.MAX_ENTRIES:
+                evicted.append(self._entries.popitem(last=False)[1])
+            self._save()
+        for _, old_audio in evicted:
+            if old_audio and old_audio != audio_path:
+                try:
+                    os.remove(old_audio)
+                except OSError:
+                    pass
+    
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for key, (summary, audio_path) in json.load(f):
+                    self._entries[key] = (summary, audio_path)
+        except (OSError, ValueError, TypeError):
+            self._entries.clear()
+    
+    def _save(self) -> None:
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump([[k, list(v)] for k, v in self._entries.items()], f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error guardando caché de resúmenes: {e}")
+
+
 class SummaryWorker(QThread):
     """Worker thread para resumen con streaming"""
     
+    # Presupuesto del contenido de notas en el prompt
+    MAX_CONTENT_TOKENS = 6000
+    MAX_CONTENT_CHARS = 15000  # sin tiktoken
+    
+    SYSTEM_PROMPT = """Eres el Asistente de Claudio Montoya jefe del departamento de desarrollo de software, especializado en crear resúmenes ejecutivos claros y útiles. 
+            Analiza las notas proporcionadas y crea un resumen estructurado que incluya:
+            
+            #Formato Salida
+                -texto sin formato 
+                -valido para tranformar a audio incluye punto y comas para pausas.
+                
+            1. **Resumen Ejecutivo**: Los aspectos más críticos y urgentes, enfocándote en decisiones tomadas, problemas identificados y avances concretos
+            2. **Actividades Principales**: Eventos específicos, reuniones importantes y acciones ejecutadas (evita repetir títulos obvios)
+            3. **Ideas y Decisiones Clave**: Decisiones técnicas, criterios establecidos, metodologías adoptadas y soluciones propuestas
+            4. **Pendientes y Acciones**: Tareas específicas identificadas, responsabilidades asignadas y plazos mencionados
+            5. **Temas Recurrentes**: Patrones en problemáticas, enfoques técnicos o procesos que aparecen múltiples veces
+            6. **Filtros de Relevancia**: 
+               - INCLUYE: decisiones técnicas, problemas operativos, configuraciones, procesos de trabajo
+               - EXCLUYE: información obvia del contexto, títulos redundantes, generalidades sin valor
+            
+            Mantén un tono profesional útil para TTS de macOS nativo. Evita caracteres o símbolos que provoquen problemas de transcripción. Enfócate en INSIGHTS reales, no en información evidente."""
+    
     # Señales para comunicación thread-safe
     summary_finished = Signal(str)  # resumen final
     summary_error = Signal(str)     # error
     summary_progress = Signal(str)  # actualizaciones de progreso
     summary_streaming = Signal(str)  # streaming de texto
+    summary_cached = Signal(str, str)  # resumen y audio desde caché
     
-    def __init__(self, vector: 'VectorIndex', ai: 'AIService'):
+    def __init__(self, vector: 'VectorIndex', ai: 'AIService', cache: Optional[SummaryCache] = None):
         super().__init__()
         self.vector = vector
         self.ai = ai
+        self.cache = cache
+        self.cache_key: Optional[str] = None
         
     def run(self):
         """Ejecuta generación de resumen con streaming"""
         try:
-            from datetime import datetime, timedelta
-            import pytz
-            
-            chile_tz = pytz.timezone('America/Santiago')
-            now = datetime.now(chile_tz)
-            three_days_ago = now - timedelta(days=3)
+            three_days_ago = datetime.now(CHILE_TZ) - timedelta(days=3)
             
             self.summary_progress.emit("Consultando base vectorial...")
             
@@ -227,23 +349,27 @@ class SummaryWorker(QThread):
             
             # AGRUPAR POR NOTE_ID Y FILTRAR POR FECHA
             notes_data = {}
+            # Todos los chunks de una nota comparten created_at: parsear cada fecha una vez
+            is_recent: Dict[str, bool] = {}
             for doc, meta in zip(all_data["documents"], all_data["metadatas"]):
                 note_id = meta["note_id"]
                 title = meta["title"]
                 created_at = meta.get("created_at", "")
                 
                 # FILTRAR POR FECHA
-                try:
-                    if created_at:
-                        note_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        if note_date.tzinfo is None:
-                            note_date = note_date.replace(tzinfo=pytz.UTC)
-                        note_date_chile = note_date.astimezone(chile_tz)
-                        
-                        if note_date_chile < three_days_ago:
-                            continue
-                except Exception:
-                    pass
+                if created_at:
+                    recent = is_recent.get(created_at)
+                    if recent is None:
+                        try:
+                            note_date = datetime.fromisoformat(created_at)
+                            if note_date.tzinfo is None:
+                                note_date = note_date.replace(tzinfo=UTC)
+                            recent = note_date >= three_days_ago
+                        except Exception:
+                            recent = True
+                        is_recent[created_at] = recent
+                    if not recent:
+                        continue
                 
                 # AGRUPAR CONTENIDO
                 if note_id not in notes_data:
@@ -271,9 +397,10 @@ class SummaryWorker(QThread):
             
             self.summary_progress.emit(f"Reconstruyendo {len(notes_data)} notas...")
             
-            # RECONSTRUIR NOTAS
+            # RECONSTRUIR NOTAS: solo las 20 más recientes (sin ordenar ni copiar el resto)
             recent_notes = []
-            for note_id, note_data in notes_data.items():
+            newest = heapq.nlargest(20, notes_data.values(), key=lambda x: x.get("created_at") or "")
+            for note_data in newest:
                 chunks = sorted(note_data["chunks"], key=lambda x: x["start"])
                 content_parts = []
                 for chunk in chunks:
@@ -287,22 +414,21 @@ class SummaryWorker(QThread):
                     "created_at": note_data["created_at"]
                 })
             
-            # Limitar a 20 notas más recientes
-            recent_notes = sorted(recent_notes, 
-                                key=lambda x: x.get("created_at", ""), 
-                                reverse=True)[:20]
-            
             self.summary_progress.emit(f"Generando resumen de {len(recent_notes)} notas...")
             
             # PREPARAR CONTENIDO
-            content_parts = []
-            for note in recent_notes:
-                date_str = format_date_chile(note["created_at"]) if note["created_at"] else "Fecha desconocida"
-                content_parts.append(f"=== {note['title']} ({date_str}) ===\n{note['content']}\n")
+            combined_content = self._build_content(recent_notes)
             
-            combined_content = "\n".join(content_parts)
-            if len(combined_content) > 15000:
-                combined_content = combined_content[:15000] + "\n[...contenido truncado]"
+            # Mismas notas, modelo y prompt que un resumen anterior: reutilizarlo
+            if self.cache is not None:
+                self.cache_key = SummaryCache.make_key(
+                    self.ai.settings.chat_model, self.SYSTEM_PROMPT, combined_content
+                )
+                cached = self.cache.get(self.cache_key)
+                if cached is not None:
+                    summary, audio_path = cached
+                    self.summary_cached.emit(summary, audio_path or "")
+                    return
             
             self.summary_progress.emit("Generando resumen con IA...")
             
@@ -312,26 +438,45 @@ class SummaryWorker(QThread):
         except Exception as e:
             self.summary_error.emit(f"Error generando resumen: {str(e)}")
 
+    def _build_content(self, recent_notes: List[Dict[str, Any]]) -> str:
+        """Une las notas para el prompt, cortando por tokens reales (o por caracteres sin tiktoken)"""
+        enc = self.ai.encoding
+        # Piezas en una lista y un solo join; se corta al pasar el límite
+        content_parts = []
+        total = 0
+        truncated = False
+        for note in recent_notes:
+            date_str = format_date_chile(note["created_at"]) if note["created_at"] else "Fecha desconocida"
+            block = "".join(("\n" if content_parts else "", "=== ", note["title"], " (", date_str, ") ===\n", note["content"], "\n"))
+            if enc is None:
+                if total > self.MAX_CONTENT_CHARS:
+                    break
+                content_parts.append(block)
+                total += len(block)
+                continue
+            tokens = enc.encode_ordinary(block)
+            remaining = self.MAX_CONTENT_TOKENS - total
+            if len(tokens) > remaining:
+                # Cortar en un límite de token, no a mitad de palabra
+                if remaining > 0:
+                    content_parts.append(enc.decode(tokens[:remaining]))
+                truncated = True
+                break
+            content_parts.append(block)
+            total += len(tokens)
+        
+        combined_content = "".join(content_parts)
+        if enc is None and len(combined_content) > self.MAX_CONTENT_CHARS:
+            combined_content = combined_content[:self.MAX_CONTENT_CHARS]
+            truncated = True
+        if truncated:
+            combined_content += "\n[...contenido truncado]"
+        return combined_content
+
     def _generate_streaming_summary(self, content: str):
         """Genera resumen con streaming"""
         try:
-            system_prompt = """Eres el Asistente de Claudio Montoya jefe del departamento de desarrollo de software, especializado en crear resúmenes ejecutivos claros y útiles. 
-            Analiza las notas proporcionadas y crea un resumen estructurado que incluya:
-            
-            #Formato Salida
-                -texto sin formato 
-                -valido para tranformar a audio incluye punto y comas para pausas.
-                
-            1. **Resumen Ejecutivo**: Los aspectos más críticos y urgentes, enfocándote en decisiones tomadas, problemas identificados y avances concretos
-            2. **Actividades Principales**: Eventos específicos, reuniones importantes y acciones ejecutadas (evita repetir títulos obvios)
-            3. **Ideas y Decisiones Clave**: Decisiones técnicas, criterios establecidos, metodologías adoptadas y soluciones propuestas
-            4. **Pendientes y Acciones**: Tareas específicas identificadas, responsabilidades asignadas y plazos mencionados
-            5. **Temas Recurrentes**: Patrones en problemáticas, enfoques técnicos o procesos que aparecen múltiples veces
-            6. **Filtros de Relevancia**: 
-               - INCLUYE: decisiones técnicas, problemas operativos, configuraciones, procesos de trabajo
-               - EXCLUYE: información obvia del contexto, títulos redundantes, generalidades sin valor
-            
-            Mantén un tono profesional útil para TTS de macOS nativo. Evita caracteres o símbolos que provoquen problemas de transcripción. Enfócate en INSIGHTS reales, no en información evidente."""
+            system_prompt = self.SYSTEM_PROMPT
             
             user_prompt = f"Analiza y resume las siguientes notas de los últimos 3 días:\n\n{content}"
             
@@ -360,50 +505,91 @@ class SummaryWorker(QThread):
         except Exception as e:
             self.summary_error.emit(f"Error generando resumen: {str(e)}")
 
-def format_date_chile(date_str: str) -> str:
-    """Formatea fecha para Chile con información consistente"""
+@lru_cache(maxsize=4096)
+def _format_date_chile_cached(date_str: str, today_ordinal: int) -> str:
+    """Formato de fecha memoizado por (fecha, día actual)"""
+    if not date_str:
+        return ""
     try:
-
-        chile_tz = pytz.timezone('America/Santiago')
-        
-        # Parsear la fecha
-        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        # Parsear la fecha ('Z' final solo la acepta fromisoformat desde 3.11)
+        if date_str[-1] == 'Z':
+            dt = datetime.fromisoformat(date_str[:-1] + '+00:00')
+        else:
+            dt = datetime.fromisoformat(date_str)
         
         # Si no tiene zona horaria, asumir que es UTC y convertir a Chile
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=pytz.UTC)
+            dt = dt.replace(tzinfo=UTC)
         
         # Convertir a hora de Chile
-        dt_chile = dt.astimezone(chile_tz)
-        now_chile = datetime.now(chile_tz)
-        diff = now_chile - dt_chile
-        
-        # Mapeo de meses en español
-        months_es = [
-            'ene', 'feb', 'mar', 'abr', 'may', 'jun',
-            'jul', 'ago', 'sep', 'oct', 'nov', 'dic'
-        ]
+        dt_chile = dt.astimezone(CHILE_TZ)
+        days = today_ordinal - dt_chile.toordinal()
         
-        if diff.days == 0:
+        if days == 0:
             # Hoy - mostrar "Hoy HH:MM"
             return f"Hoy {dt_chile.strftime('%H:%M')}"
-        elif diff.days == 1:
+        elif days == 1:
             # Ayer - mostrar "Ayer HH:MM"
             return f"Ayer {dt_chile.strftime('%H:%M')}"
-        elif diff.days <= 7:
+        elif days <= 7:
             # Esta semana - mostrar "DD/MM HH:MM"
             return f"{dt_chile.day:02d}/{dt_chile.month:02d} {dt_chile.strftime('%H:%M')}"
-        elif dt_chile.year == now_chile.year:
+        elif dt_chile.year == date.fromordinal(today_ordinal).year:
             # Este año - mostrar "DD MMM HH:MM"
-            month_short = months_es[dt_chile.month - 1]
+            month_short = MONTHS_ES[dt_chile.month - 1]
             return f"{dt_chile.day} {month_short} {dt_chile.strftime('%H:%M')}"
         else:
             # Otro año - mostrar "DD/MM/YYYY"
             return f"{dt_chile.day:02d}/{dt_chile.month:02d}/{dt_chile.year}"
             
-    except:
+    except (ValueError, TypeError, OverflowError):
         # Fallback a formato original
-        return date_str[:10] if date_str else ""
+        return date_str[:10]
+
+
+def format_date_chile(date_str: str, today_ordinal: Optional[int] = None) -> str:
+    """Formatea fecha para Chile con información consistente"""
+    # El día actual forma parte de la clave: "Hoy"/"Ayer" se recalculan al cambiar de día
+    if today_ordinal is None:
+        today_ordinal = datetime.now(CHILE_TZ).toordinal()
+    return _format_date_chile_cached(date_str, today_ordinal)
+
+
+def note_display_date(note: Note, today_ordinal: Optional[int] = None) -> str:
+    """Fecha de actualización de la nota ya formateada, guardada en la propia nota"""
+    if today_ordinal is None:
+        today_ordinal = datetime.now(CHILE_TZ).toordinal()
+    updated_at = note.updated_at or ""
+    cached = getattr(note, "_display_date", None)
+    if cached is not None and cached[0] == updated_at and cached[1] == today_ordinal:
+        return cached[2]
+    text = _format_date_chile_cached(updated_at, today_ordinal) if updated_at else ""
+    try:
+        note._display_date = (updated_at, today_ordinal, text)
+    except AttributeError:
+        pass
+    return text
+
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def first_words(parts: Iterable[str], n: int = 6) -> Tuple[List[str], bool]:
+    """Primeras n palabras de uno o varios textos y si hay más (se detiene en la palabra n+1)"""
+    matches = chain.from_iterable(_WORD_RE.finditer(part) for part in parts)
+    words = [m.group() for m in islice(matches, n + 1)]
+    return words[:n], len(words) > n
+
+
+def title_from_content(content: str, max_words: int = 6) -> str:
+    """Primeras palabras del contenido como título ('...' si hay más); no recorre todo el texto"""
+    words, more = first_words((content,), max_words)
+    title = " ".join(words)
+    if more:
+        title += "..."
+    return title
+
+
 class AppState(Enum):
     FIRST_RUN = "first_run"
     SETUP = "setup" 
@@ -435,6 +621,14 @@ class AppleColors:
     SEPARATOR = QColor(84, 84, 88)        
     SEPARATOR_LIGHT = QColor(58, 58, 60) 
 
+# Hex "#rrggbb" de cada color (X_HEX), para no llamar a .name() en cada hoja de estilo
+for _name, _color in list(vars(AppleColors).items()):
+    if isinstance(_color, QColor):
+        setattr(AppleColors, f"{_name}_HEX", _color.name())
+del _name, _color
+AppleColors.BLUE_LIGHT_HEX = AppleColors.BLUE.lighter(110).name()  # hover
+AppleColors.RED_DARK_HEX = AppleColors.RED.darker(110).name()  # hover
+
         
 class LoadingSpinner(QWidget):
     """Spinner de carga estilo Apple"""
@@ -444,6 +638,18 @@ class LoadingSpinner(QWidget):
         self.angle = 0
         self.setFixedSize(size, size)
         
+        # Lápices y segmentos fijos: se crean una vez, no en cada frame
+        base = AppleColors.SECONDARY
+        self._pens = tuple(
+            QPen(QColor(base.red(), base.green(), base.blue(), 255 - i * 30), 2)
+            for i in range(8)
+        )
+        inner, outer = size / 3, size / 2.5
+        self._lines = tuple(
+            QLineF(inner * math.sin(a), -inner * math.cos(a), outer * math.sin(a), -outer * math.cos(a))
+            for a in (math.radians(45 * i) for i in range(8))
+        )
+        
         self.timer = QTimer()
         self.timer.timeout.connect(self.rotate)
         
@@ -466,40 +672,83 @@ class LoadingSpinner(QWidget):
         painter.translate(self.size/2, self.size/2)
         painter.rotate(self.angle)
         
-        for i in range(8):
-            alpha = 255 - (i * 30)
-            painter.setPen(QPen(QColor(AppleColors.SECONDARY.red(), 
-                                     AppleColors.SECONDARY.green(), 
-                                     AppleColors.SECONDARY.blue(), alpha), 2))
-            painter.drawLine(0, -self.size/3, 0, -self.size/2.5)
-            painter.rotate(45)
+        for pen, line in zip(self._pens, self._lines):
+            painter.setPen(pen)
+            painter.drawLine(line)
 
 class StatusBadge(QLabel):
     """Badge de estado estilo Apple"""
+    # Hojas de estilo armadas una sola vez (setStyleSheet re-parsea el CSS)
+    _SHEETS = {
+        status: f"QLabel {{ background-color: {color}; border-radius: 4px; }}"
+        for status, color in (
+            ("saved", "transparent"),
+            ("saving", AppleColors.ORANGE_HEX),
+            ("unsaved", AppleColors.RED_HEX),
+            ("syncing", AppleColors.BLUE_HEX),
+        )
+    }
+    
     def __init__(self):
         super().__init__()
         self.setFixedSize(8, 8)
+        self._status = None
         self.set_status("saved")
     
     def set_status(self, status: str):
-        colors = {
-            "saved": "transparent",
-            "saving": AppleColors.ORANGE.name(),
-            "unsaved": AppleColors.RED.name(),
-            "syncing": AppleColors.BLUE.name()
-        }
-        
-        self.setStyleSheet(f"""
-            QLabel {{
-                background-color: {colors.get(status, 'transparent')};
-                border-radius: 4px;
-            }}
-        """)
+        if status not in self._SHEETS:
+            status = "saved"
+        if status == self._status:
+            return
+        self._status = status
+        self.setStyleSheet(self._SHEETS[status])
 
 
 class SummaryTab(QWidget):
     """Tab de Resumen IA con síntesis de voz - NUEVO"""
     
+    # Estilos del botón de audio, armados una sola vez
+    _PLAY_SHEET = f"""
+            QPushButton {{
+                background-color: {AppleColors.CARD_HEX};
+                color: {AppleColors.PRIMARY_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-family: '.AppleSystemUIFont';
+                font-size: 14px;
+                font-weight: 500;
+            }}
+            QPushButton:hover {{
+                background-color: {AppleColors.ELEVATED_HEX};
+            }}
+        """
+    _STOP_SHEET = f"""
+            QPushButton {{
+                background-color: {AppleColors.RED_HEX};
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-family: '.AppleSystemUIFont';
+                font-size: 14px;
+                font-weight: 500;
+            }}
+            QPushButton:hover {{
+                background-color: {AppleColors.RED_DARK_HEX};
+            }}
+        """
+    
+    # Síntesis por frases: la primera se reproduce mientras se generan las demás
+    TTS_WORKERS = 3
+    TTS_CHUNK_CHARS = 300
+    SUMMARY_DOCS = 4  # documentos ya maquetados que se conservan
+    
+    tts_started = Signal()        # primer fragmento sonando
+    tts_ready = Signal(str, str)  # texto y WAV completo
+    tts_failed = Signal(str)
+    tts_playback_done = Signal()
+    
     def __init__(self, settings: Settings, db: NotesDB, ai: AIService, vector: Optional[VectorIndex] = None):
         super().__init__()
         self.settings = settings
@@ -507,17 +756,38 @@ class SummaryTab(QWidget):
         self.ai = ai
         self.vector = vector
         self.audio_file = None
+        # WAV fijo para resúmenes sin clave de caché: se sobrescribe en cada síntesis
+        self._scratch_audio = os.path.join(tempfile.gettempdir(), f"secreia_summary_{os.getpid()}.wav")
         self.audio_playing = False
-        self.audio_thread = None
+        # Fin de reproducción: sondeo liviano en el hilo de Qt, sin hilo propio
+        self._audio_monitor = QTimer(self)
+        self._audio_monitor.setInterval(200)
+        self._audio_monitor.timeout.connect(self._monitor_audio)
+        self.summary_cache = SummaryCache(settings.data_dir)
+        self._summary_key: Optional[str] = None
+        self._summary_docs: "OrderedDict[str, QTextDocument]" = OrderedDict()
+        self._tts_pool = ThreadPoolExecutor(max_workers=self.TTS_WORKERS)
+        # Cada síntesis tiene su número: el hilo de una síntesis reemplazada deja de
+        # reproducir y no emite señales
+        self._tts_gen = 0
+        self._tts_futures: List[Future] = []
+        self.tts_started.connect(self._on_tts_started)
+        self.tts_ready.connect(self._on_tts_ready)
+        self.tts_failed.connect(self._show_simple_error)
+        self.tts_playback_done.connect(self._reset_audio_button)
+        self._pygame = None  # se importa al primer uso: cargar SDL es lento
         self._setup_ui()
-        self._init_audio()
     
     def _init_audio(self):
-        """Inicializa pygame para audio"""
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            print(f"Error inicializando audio: {e}")
+        """Importa e inicializa pygame para audio la primera vez"""
+        if self._pygame is None:
+            import pygame
+            try:
+                pygame.mixer.init()
+            except Exception as e:
+                print(f"Error inicializando audio: {e}")
+            self._pygame = pygame
+        return self._pygame
     
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -528,7 +798,7 @@ class SummaryTab(QWidget):
         description = QLabel("Genera un resumen inteligente de tus notas de los últimos 3 días con síntesis de voz")
         description.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
             }}
@@ -560,7 +830,7 @@ class SummaryTab(QWidget):
         self.progress_label = QLabel("Analizando notas...")
         self.progress_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
             }}
@@ -581,7 +851,7 @@ class SummaryTab(QWidget):
         summary_header = QLabel("Resumen generado")
         summary_header.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -594,8 +864,8 @@ class SummaryTab(QWidget):
         self.summary_text.setPlaceholderText("El resumen aparecerá aquí...")
         self.summary_text.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {AppleColors.NOTES_LIST.name()};
-                color: {AppleColors.PRIMARY.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
+                color: {AppleColors.PRIMARY_HEX};
                 border: none;
                 border-radius: 12px;
                 padding: 20px;
@@ -643,10 +913,12 @@ class SummaryTab(QWidget):
         self._start_summary_ui()
         
         # Crear y lanzar worker thread
-        self.summary_worker = SummaryWorker(self.vector, self.ai)
+        self._summary_key = None
+        self.summary_worker = SummaryWorker(self.vector, self.ai, self.summary_cache)
         
         # Conectar señales
         self.summary_worker.summary_finished.connect(self._on_summary_finished)
+        self.summary_worker.summary_cached.connect(self._on_summary_cached)
         self.summary_worker.summary_error.connect(self._on_summary_error)
         self.summary_worker.summary_progress.connect(self._on_summary_progress)
         self.summary_worker.summary_streaming.connect(self._on_summary_streaming)  # NUEVO
@@ -658,7 +930,8 @@ class SummaryTab(QWidget):
         """Configura UI para estado de resumen"""
         self.btn_generate.setText("Generando...")
         self.btn_generate.setEnabled(False)
-        self.summary_text.clear()
+        # Documento nuevo: no tocar los resúmenes ya maquetados en caché
+        self._set_summary_document(self._new_summary_document())
         self.summary_text.setPlaceholderText("🔄 Generando resumen...")
 
     def _on_summary_progress(self, message: str):
@@ -667,19 +940,12 @@ class SummaryTab(QWidget):
 
     def _on_summary_streaming(self, chunk: str):
         """Maneja chunks de streaming en tiempo real"""
-        current_text = self.summary_text.toPlainText()
-        
-        # Si es el primer chunk, limpiar placeholder
-        if "🔄" in current_text or "El resumen aparecerá aquí..." in current_text:
-            self.summary_text.clear()
-            current_text = ""
-        
-        # Añadir nuevo chunk
-        self.summary_text.setPlainText(current_text + chunk)
-        
-        # Mover cursor al final
+        # Añadir nuevo chunk al final (solo se maqueta el último bloque)
         cursor = self.summary_text.textCursor()
         cursor.movePosition(QTextCursor.End)
+        cursor.insertText(chunk)
+        
+        # Mover cursor al final
         self.summary_text.setTextCursor(cursor)
         
         # Actualizar visualmente
@@ -688,14 +954,82 @@ class SummaryTab(QWidget):
 
     def _on_summary_finished(self, response: str):
         """Maneja finalización exitosa Y ACTIVA AUDIO"""
+        self._summary_key = self.summary_worker.cache_key
         self._reset_summary_ui()
         self.btn_copy_summary.setEnabled(True)
         
         # GENERAR AUDIO AUTOMÁTICAMENTE CUANDO TERMINA EL STREAM
         final_text = self.summary_text.toPlainText()
         if final_text.strip():
+            if self._summary_key:
+                self.summary_cache.put(self._summary_key, final_text)
+                self._remember_summary_document(self._summary_key, self.summary_text.document())
             self._generate_audio(final_text)
 
+    def _on_summary_cached(self, summary: str, audio_path: str):
+        """Muestra un resumen desde caché sin llamar a OpenAI ni a 'say'"""
+        self._summary_key = self.summary_worker.cache_key
+        self._reset_summary_ui()
+        doc = self._summary_docs.get(self._summary_key)
+        if doc is None:
+            doc = self._new_summary_document()
+            doc.setPlainText(summary)
+            self._remember_summary_document(self._summary_key, doc)
+        else:
+            self._summary_docs.move_to_end(self._summary_key)
+        self._set_summary_document(doc)
+        self.btn_copy_summary.setEnabled(True)
+        
+        if audio_path and os.path.exists(audio_path):
+            if self.audio_playing:
+                self._stop_audio()
+            self._release_audio_file()
+            self.audio_file = audio_path
+            self.btn_play_audio.setEnabled(True)
+            self.btn_play_audio.setText("🔊 Reproducir Audio")
+            self._show_success_message()
+            QTimer.singleShot(500, self._auto_play_audio)
+        elif summary.strip():
+            self._generate_audio(summary)
+
+    def _new_summary_document(self) -> QTextDocument:
+        """Documento del resumen, propiedad de la pestaña (sobrevive a setDocument)"""
+        doc = QTextDocument(self)
+        doc.setDefaultFont(self.summary_text.font())
+        return doc
+
+    def _set_summary_document(self, doc: QTextDocument):
+        """Cambia el documento mostrado; libera el anterior si no está en caché"""
+        old = self.summary_text.document()
+        if old is doc:
+            return
+        self.summary_text.setDocument(doc)
+        if old.parent() is self and old not in self._summary_docs.values():
+            old.deleteLater()
+
+    def _remember_summary_document(self, key: str, doc: QTextDocument):
+        self._summary_docs[key] = doc
+        self._summary_docs.move_to_end(key)
+        while len(self._summary_docs) > self.SUMMARY_DOCS:
+            _, old = self._summary_docs.popitem(last=False)
+            if old is not self.summary_text.document():
+                old.deleteLater()
+
+    def _release_audio_file(self):
+        """Borra el audio temporal anterior (los de la caché se conservan)"""
+        if self._pygame is not None:
+            try:
+                self._pygame.mixer.music.unload()  # soltar el archivo antes de sobrescribirlo
+            except Exception:
+                pass
+        if (self.audio_file and self.audio_file != self._scratch_audio
+                and not self.summary_cache.owns(self.audio_file)):
+            try:
+                os.remove(self.audio_file)
+            except OSError:
+                pass
+        self.audio_file = None
+
     def _on_summary_error(self, error: str):
         """Maneja errores de resumen"""
         self.summary_text.clear()
@@ -726,8 +1060,7 @@ class SummaryTab(QWidget):
             print(f"Error preparando audio: {e}")
     
     def _do_generate_audio(self, text: str):
-        """Genera audio usando TTS nativo de macOS con Francisca"""
-        import subprocess
+        """Genera audio usando TTS nativo de macOS con Francisca, frase a frase"""
         import sys
         
         try:
@@ -740,55 +1073,186 @@ class SummaryTab(QWidget):
             if sys.platform != "darwin":
                 self._show_simple_error("TTS solo disponible en macOS")
                 return
+            self._init_audio()  # antes de reproducir desde el hilo de síntesis
 
             # Limpiar archivo temporal anterior
-            if hasattr(self, 'audio_file') and self.audio_file:
-                try:
-                    os.remove(self.audio_file)
-                except:
-                    pass
+            if self.audio_playing:
+                self._stop_audio()
+            self._release_audio_file()
 
             # CAMBIO: Usar .wav en lugar de .aiff
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_path = temp_file.name
+            summary_key = self._summary_key
+            if summary_key:
+                # Audio junto a la caché de resúmenes para reutilizarlo
+                final_path = self.summary_cache.audio_path_for(summary_key)
+            else:
+                final_path = self._scratch_audio
 
             # Limitar longitud del texto
             clean_text = text[:4000] + "..." if len(text) > 4000 else text
 
-            # CAMBIO: Agregar --data-format para generar WAV compatible
-            cmd = [
-                "say",
-                "-v", "Francisca",
-                "-r", "160",
-                "--data-format=LEI16@22050",  # WAV 16-bit a 22kHz
-                "-o", temp_path,
-                clean_text
-            ]
-            
+            # Un 'say' por fragmento en paralelo; el orden lo mantiene la lista de futures
+            chunks = self._split_tts_chunks(clean_text)
+            if not chunks:
+                self._hide_progress()
+                return
+            # Reemplaza la síntesis anterior: sus fragmentos pendientes no se generan
+            self._tts_gen += 1
+            for fut in self._tts_futures:
+                fut.cancel()
+            futures = [self._tts_pool.submit(self._say_to_wav, chunk) for chunk in chunks]
+            self._tts_futures = futures
+            threading.Thread(
+                target=self._consume_tts,
+                args=(self._tts_gen, futures, text, summary_key, final_path),
+                daemon=True,
+            ).start()
+
+        except Exception as e:
+            self._show_simple_error(f"Error de TTS: {str(e)}")
+
+    @classmethod
+    def _split_tts_chunks(cls, text: str) -> List[str]:
+        """Primera frase sola (latencia mínima); el resto agrupado en bloques"""
+        sentences = [s for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s]
+        if not sentences:
+            return []
+        chunks = [sentences[0]]
+        current = ""
+        for sentence in sentences[1:]:
+            current = f"{current} {sentence}" if current else sentence
+            if len(current) >= cls.TTS_CHUNK_CHARS:
+                chunks.append(current)
+                current = ""
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _say_to_wav(text: str) -> str:
+        """Sintetiza un fragmento con 'say' y devuelve la ruta del WAV"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+            temp_path = temp_file.name
+        # CAMBIO: Agregar --data-format para generar WAV compatible
+        cmd = [
+            "say",
+            "-v", "Francisca",
+            "-r", "160",
+            "--data-format=LEI16@22050",  # WAV 16-bit a 22kHz
+            "-o", temp_path,
+            text
+        ]
+        try:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        if result.returncode != 0:
+            os.remove(temp_path)
+            raise Exception(f"Error en comando say: {result.stderr}")
+        return temp_path
+
+    def _consume_tts(self, gen: int, futures: List[Future], text: str, summary_key: Optional[str], final_path: str):
+        """Reproduce los fragmentos en orden a medida que terminan y arma el WAV completo"""
+        parts: List[str] = []
+        channel = None
+        ready = False
+        try:
+            for fut in futures:
+                if gen != self._tts_gen:
+                    return
+                path = fut.result()
+                parts.append(path)
+                if gen != self._tts_gen:
+                    return
+                
+                if len(parts) == 1:
+                    self.audio_playing = True
+                    channel = self._pygame.mixer.Sound(path).play()
+                    self.tts_started.emit()
+                    continue
+                
+                # El canal admite un solo sonido en cola: esperar a que empiece el anterior
+                while (self.audio_playing and gen == self._tts_gen and channel is not None
+                       and channel.get_busy() and channel.get_queue() is not None):
+                    time.sleep(0.02)
+                if gen != self._tts_gen:
+                    return
+                if not self.audio_playing:
+                    continue
+                sound = self._pygame.mixer.Sound(path)
+                if channel is not None and channel.get_busy():
+                    channel.queue(sound)
+                else:
+                    channel = sound.play()
+            
+            if gen != self._tts_gen:
+                return  # final_path puede ser el mismo WAV de la síntesis nueva
+            self._join_wavs(parts, final_path)
+            ready = True
+            if summary_key:
+                self.summary_cache.put(summary_key, text, final_path)
+            if gen != self._tts_gen:
+                return
+            self.tts_ready.emit(text, final_path)
             
-            if result.returncode == 0:
-                if self._audio_generation_active:
-                    self.audio_file = temp_path
-                    self._hide_progress()
-                    self.btn_play_audio.setEnabled(True)
-                    self.btn_play_audio.setText("🔊 Reproducir Audio")
-                    self._show_success_message()
-                    QTimer.singleShot(500, self._auto_play_audio)
-            else:
-                raise Exception(f"Error en comando say: {result.stderr}")
+            while self.audio_playing and gen == self._tts_gen and channel is not None and channel.get_busy():
+                time.sleep(0.1)
+            if self.audio_playing and gen == self._tts_gen:  # Si terminó naturalmente
+                self.tts_playback_done.emit()
 
         except subprocess.TimeoutExpired:
-            self._show_simple_error("Timeout generando audio")
+            if gen == self._tts_gen:
+                self.tts_failed.emit("Timeout generando audio")
         except FileNotFoundError:
-            self._show_simple_error("Comando 'say' no disponible")
+            if gen == self._tts_gen:
+                self.tts_failed.emit("Comando 'say' no disponible")
         except Exception as e:
-            self._show_simple_error(f"Error de TTS: {str(e)}")
-            if 'temp_path' in locals():
+            # Incluye CancelledError de los fragmentos de una síntesis reemplazada
+            if gen == self._tts_gen:
+                self.tts_failed.emit(f"Error de TTS: {str(e)}")
+        finally:
+            # Los fragmentos ya quedaron en el WAV completo (o se descartan)
+            for fut in futures:
+                if not fut.cancel():
+                    fut.add_done_callback(self._discard_tts_chunk)
+            if not ready and gen == self._tts_gen:
                 try:
-                    os.remove(temp_path)
-                except:
+                    os.remove(final_path)
+                except OSError:
                     pass
+
+    @staticmethod
+    def _discard_tts_chunk(fut: Future):
+        if not fut.cancelled() and fut.exception() is None:
+            try:
+                os.remove(fut.result())
+            except OSError:
+                pass
+
+    @staticmethod
+    def _join_wavs(paths: List[str], out_path: str):
+        """Concatena WAVs del mismo formato en un solo archivo"""
+        with wave.open(out_path, "wb") as out:
+            for i, path in enumerate(paths):
+                with wave.open(path, "rb") as part:
+                    if i == 0:
+                        out.setparams(part.getparams())
+                    out.writeframes(part.readframes(part.getnframes()))
+
+    def _on_tts_started(self):
+        """Primer fragmento sonando: habilitar detener"""
+        self._hide_progress()
+        self.btn_play_audio.setEnabled(True)
+        self._set_playing_ui()
+
+    def _on_tts_ready(self, text: str, path: str):
+        """Audio completo disponible para volver a reproducir"""
+        self.audio_file = path
+        self.btn_play_audio.setEnabled(True)
+        if not self.audio_playing:
+            self.btn_play_audio.setText("🔊 Reproducir Audio")
+        self._show_success_message()
     
     def _auto_play_audio(self):
         """Reproduce audio automáticamente después de generarlo"""
@@ -802,6 +1266,10 @@ class SummaryTab(QWidget):
     
     def _toggle_audio(self):
         """Alterna reproducción de audio"""
+        if self.audio_playing:
+            self._stop_audio()
+            return
+        
         if not self.audio_file or not os.path.exists(self.audio_file):
             QMessageBox.warning(self, "Audio no disponible", 
                               "No hay audio generado para reproducir.")
@@ -815,38 +1283,30 @@ class SummaryTab(QWidget):
     def _play_audio(self):
         """Reproduce el audio"""
         try:
+            pygame = self._init_audio()
             pygame.mixer.music.load(self.audio_file)
             pygame.mixer.music.play()
             
             self.audio_playing = True
-            self.btn_play_audio.setText("⏹️ Detener Audio")
-            self.btn_play_audio.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {AppleColors.RED.name()};
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {AppleColors.RED.darker(110).name()};
-                }}
-            """)
+            self._set_playing_ui()
             
-            # Iniciar hilo para monitorear finalización
-            self.audio_thread = threading.Thread(target=self._monitor_audio, daemon=True)
-            self.audio_thread.start()
+            # Monitorear finalización
+            self._audio_monitor.start()
             
         except Exception as e:
             QMessageBox.warning(self, "Error de audio", f"No se pudo reproducir: {e}")
     
+    def _set_playing_ui(self):
+        """Botón de audio en modo detener"""
+        self.btn_play_audio.setText("⏹️ Detener Audio")
+        self.btn_play_audio.setStyleSheet(self._STOP_SHEET)
+    
     def _stop_audio(self):
         """Detiene la reproducción"""
         try:
-            pygame.mixer.music.stop()
+            if self._pygame is not None:
+                self._pygame.mixer.music.stop()
+                self._pygame.mixer.stop()  # fragmentos de la síntesis por frases
             self._reset_audio_button()
         except Exception as e:
             print(f"Error deteniendo audio: {e}")
@@ -854,46 +1314,28 @@ class SummaryTab(QWidget):
     def _monitor_audio(self):
         """Monitorea cuando termina el audio"""
         try:
-            while pygame.mixer.music.get_busy() and self.audio_playing:
-                threading.Event().wait(0.1)
-            
-            if self.audio_playing:  # Si terminó naturalmente
-                QTimer.singleShot(0, self._reset_audio_button)
+            if not self.audio_playing or self._pygame is None:
+                self._audio_monitor.stop()
+            elif not self._pygame.mixer.music.get_busy():  # Si terminó naturalmente
+                self._audio_monitor.stop()
+                self._reset_audio_button()
                 
         except Exception as e:
+            self._audio_monitor.stop()
             print(f"Error monitoreando audio: {e}")
     
     def _reset_audio_button(self):
         """Resetea el botón de audio"""
         self.audio_playing = False
         self.btn_play_audio.setText("🔊 Reproducir Audio")
-        self.btn_play_audio.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {AppleColors.CARD.name()};
-                color: {AppleColors.PRIMARY.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-family: '.AppleSystemUIFont';
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QPushButton:hover {{
-                background-color: {AppleColors.ELEVATED.name()};
-            }}
-        """)
+        self.btn_play_audio.setStyleSheet(self._PLAY_SHEET)
     
     def _copy_summary(self):
         """Copia el resumen al portapapeles"""
         text = self.summary_text.toPlainText().strip()
         if text:
-            try:
-                pyperclip.copy(text)
-                QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
-            except:
-                clipboard = QApplication.clipboard()
-                clipboard.setText(text)
-                QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
+            QApplication.clipboard().setText(text)
+            QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
     
     def _show_progress(self, message: str):
         """Muestra indicador de progreso"""
@@ -925,10 +1367,14 @@ class SummaryTab(QWidget):
                 self._stop_audio()
             
             if hasattr(self, 'audio_file') and self.audio_file and os.path.exists(self.audio_file):
-                try:
-                    os.remove(self.audio_file)
-                except:
-                    pass
+                self._release_audio_file()
+            try:
+                os.remove(self._scratch_audio)
+            except OSError:
+                pass
+            
+            self._tts_gen += 1  # el hilo de síntesis en curso termina sin reproducir
+            self._tts_pool.shutdown(wait=False, cancel_futures=True)
         except Exception as e:
             print(f"Error limpiando SummaryTab: {e}")
         finally:
@@ -938,6 +1384,8 @@ class AdvancedSearchBar(QWidget):
     """Barra de búsqueda simple"""
     search_triggered = Signal(str)
     
+    SEARCH_DELAY = 0.3  # segundos sin teclear antes de buscar
+
     def __init__(self, db: NotesDB):
         super().__init__()
         self.db = db
@@ -952,17 +1400,17 @@ class AdvancedSearchBar(QWidget):
         self.search_edit.setPlaceholderText("🔍 Buscar en notas...")
         self.search_edit.setStyleSheet(f"""
             QLineEdit {{
-                background-color: {AppleColors.CARD.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.CARD_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 10px;
                 padding: 12px 16px;
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
-                selection-background-color: {AppleColors.BLUE.name()};
+                selection-background-color: {AppleColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {AppleColors.BLUE.name()};
+                border: 2px solid {AppleColors.BLUE_HEX};
                 padding: 11px 15px;
             }}
         """)
@@ -971,14 +1419,14 @@ class AdvancedSearchBar(QWidget):
         self.clear_btn.setFixedSize(30, 30)
         self.clear_btn.setStyleSheet(f"""
             QPushButton {{
-                background-color: {AppleColors.CARD.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.CARD_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 15px;
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-size: 12px;
             }}
             QPushButton:hover {{
-                background-color: {AppleColors.ELEVATED.name()};
+                background-color: {AppleColors.ELEVATED_HEX};
             }}
         """)
         self.clear_btn.clicked.connect(self._clear_search)
@@ -989,17 +1437,29 @@ class AdvancedSearchBar(QWidget):
         # Conectar eventos
         self.search_edit.textChanged.connect(self._emit_search)
         
-        # Timer para búsqueda en tiempo real
+        # Timer para búsqueda en tiempo real: se arma una vez por ráfaga de
+        # teclas; cada tecla solo mueve el plazo (sin reiniciar el QTimer)
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self._do_search)
+        self._search_deadline = 0.0
+        self._search_pending = False
         
     def _emit_search(self):
         """Inicia búsqueda con delay"""
-        self.search_timer.start(300)
+        self._search_deadline = time.monotonic() + self.SEARCH_DELAY
+        if not self._search_pending:
+            self._search_pending = True
+            self.search_timer.start(int(self.SEARCH_DELAY * 1000))
     
     def _do_search(self):
         """Ejecuta la búsqueda"""
+        remaining = self._search_deadline - time.monotonic()
+        if remaining > 0:
+            # Hubo teclas después de armar el timer: esperar lo que falta
+            self.search_timer.start(max(1, int(remaining * 1000)))
+            return
+        self._search_pending = False
         query = self.search_edit.text().strip()
         self.search_triggered.emit(query)
     
@@ -1011,171 +1471,252 @@ class AdvancedSearchBar(QWidget):
 class NotesExportManager:
     """Maneja exportación de notas"""
     
+    WRITE_BUFFER = 1 << 20  # 1 MiB: pocas llamadas al sistema en exportaciones grandes
+    
     def __init__(self, db: NotesDB):
         self.db = db
     
+    MARKDOWN_HEADER = (
+        "# {title}\n\n"
+        "**Categoría:** {category}\n"
+        "**Fecha:** {date}\n"
+        "**Fuente:** {source}\n"
+        "{tags}"
+        "\n---\n\n"
+    )
+    
+    def _markdown_header(self, note: Note) -> str:
+        tags = f"**Tags:** {', '.join(note.tags)}\n" if note.tags else ""
+        return self.MARKDOWN_HEADER.format(title=note.title, category=note.category,
+                                           date=note.updated_at[:19], source=note.source, tags=tags)
+    
+    def export_note_markdown_to(self, fp, note: Note):
+        """Escribe la nota en Markdown directamente en un archivo de texto"""
+        fp.write(self._markdown_header(note))
+        fp.write(note.content)
+    
     def export_note_markdown(self, note: Note) -> str:
         """Exporta nota a Markdown"""
-        content = f"# {note.title}\n\n"
-        content += f"**Categoría:** {note.category}\n"
-        content += f"**Fecha:** {note.updated_at[:19]}\n"
-        content += f"**Fuente:** {note.source}\n"
-        
-        if note.tags:
-            content += f"**Tags:** {', '.join(note.tags)}\n"
-        
-        content += "\n---\n\n"
-        content += note.content
-        
-        return content
+        return self._markdown_header(note) + note.content
+    
+    @staticmethod
+    def _note_dict(note: Note) -> Dict[str, Any]:
+        return {
+            "id": note.id,
+            "title": note.title,
+            "content": note.content,
+            "category": note.category,
+            "tags": note.tags,
+            "source": note.source,
+            "audio_path": note.audio_path,
+            "created_at": note.created_at,
+            "updated_at": note.updated_at
+        }
+    
+    def _dump_note_item(self, note: Note) -> bytes:
+        """Un elemento del arreglo JSON con la misma sangría que el volcado completo"""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(note, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self._note_dict(note), indent=2, ensure_ascii=False).encode("utf-8")
+        # Los saltos de línea dentro de los textos van escapados: solo hay que correr la sangría
+        return b"  " + data.replace(b"\n", b"\n  ")
+    
+    def export_notes_json_stream(self, fp, notes: Iterable[Note]):
+        """Escribe el arreglo JSON nota por nota: memoria constante aunque sean miles"""
+        first = True
+        for note in notes:
+            fp.write(b"[\n" if first else b",\n")
+            fp.write(self._dump_note_item(note))
+            first = False
+        fp.write(b"[]" if first else b"\n]")
+    
+    def export_notes_json_to(self, path: str, notes: Iterable[Note]):
+        """Escribe las notas en JSON con QSaveFile (temporal + rename: nunca queda un archivo a medias)"""
+        out = QSaveFile(path)
+        if not out.open(QIODevice.WriteOnly):
+            raise RuntimeError(f"No se pudo abrir {path}: {out.errorString()}")
+        self.export_notes_json_stream(out, notes)
+        if not out.commit():
+            raise RuntimeError(f"No se pudo guardar {path}: {out.errorString()}")
     
     def export_notes_json(self, notes: List[Note]) -> str:
         """Exporta notas a JSON"""
-        notes_data = []
-        for note in notes:
-            notes_data.append({
-                "id": note.id,
-                "title": note.title,
-                "content": note.content,
-                "category": note.category,
-                "tags": note.tags,
-                "source": note.source,
-                "audio_path": note.audio_path,
-                "created_at": note.created_at,
-                "updated_at": note.updated_at
-            })
-        
-        return json.dumps(notes_data, indent=2, ensure_ascii=False)
+        buf = io.BytesIO()
+        self.export_notes_json_stream(buf, notes)
+        return buf.getvalue().decode("utf-8")
+
+# Hoja de estilo global: se parsea una sola vez en main() en lugar de un
+# setStyleSheet por cada botón/campo (cada llamada re-parsea y re-pule el widget)
+APP_QSS = f"""
+    QToolTip {{
+        background-color: {AppleColors.ELEVATED_HEX};
+        color: {AppleColors.PRIMARY_HEX};
+        border: 1px solid {AppleColors.SEPARATOR_HEX};
+        padding: 8px 12px;
+        border-radius: 8px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 12px;
+    }}
+    QPushButton[variant="primary"] {{
+        background-color: {AppleColors.BLUE_HEX};
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="primary"]:hover {{
+        background-color: {AppleColors.BLUE_LIGHT_HEX};
+    }}
+    QPushButton[variant="primary"]:disabled {{
+        background-color: {AppleColors.TERTIARY_HEX};
+    }}
+    QPushButton[variant="secondary"] {{
+        background-color: {AppleColors.CARD_HEX};
+        color: {AppleColors.PRIMARY_HEX};
+        border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="secondary"]:hover {{
+        background-color: {AppleColors.ELEVATED_HEX};
+    }}
+    QPushButton[variant="ghost"] {{
+        background-color: transparent;
+        color: {AppleColors.BLUE_HEX};
+        border: none;
+        padding: 8px 16px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="ghost"]:hover {{
+        background-color: {AppleColors.CARD_HEX};
+        border-radius: 6px;
+    }}
+    QPushButton[variant="success"] {{
+        background-color: #65ab65;
+        color: #ffffff;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="success"]:hover {{
+        background-color: #4d8c4d;
+    }}
+    QPushButton[variant="success"]:disabled {{
+        background-color: #a8cfa8;
+        color: #f0f0f0;
+    }}
+    QPushButton[variant="danger"] {{
+        background-color: transparent;
+        color: {AppleColors.RED_HEX};
+        border: 1px solid {AppleColors.RED_HEX};
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="danger"]:hover {{
+        background-color: {AppleColors.RED_HEX};
+        color: white;
+    }}
+    QLineEdit[variant="apple"] {{
+        background-color: {AppleColors.CARD_HEX};
+        color: {AppleColors.PRIMARY_HEX};
+        border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
+        border-radius: 8px;
+        padding: 12px 16px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        selection-background-color: {AppleColors.BLUE_HEX};
+    }}
+    QLineEdit[variant="apple"]:focus {{
+        border: 2px solid {AppleColors.BLUE_HEX};
+        padding: 11px 15px;
+    }}
+"""
+
+# Hojas que siguen siendo por widget (estados, menús): una sola copia por clave
+_QSS_CACHE: Dict[Tuple[str, str], str] = {}
+
+
+def cached_qss(kind: str, state: str, build: Callable[[], str]) -> str:
+    """Devuelve la hoja de estilo (kind, state), formateándola solo la primera vez"""
+    sheet = _QSS_CACHE.get((kind, state))
+    if sheet is None:
+        sheet = _QSS_CACHE[(kind, state)] = build()
+    return sheet
+
 
 class AppleButton(QPushButton):
-    """Botón estilo Apple"""
+    """Botón estilo Apple (estilo en APP_QSS según la propiedad 'variant')"""
+    VARIANTS = ("primary", "secondary", "ghost", "success", "danger")
+    
     def __init__(self, text: str, style_type: str = "primary"):
         super().__init__(text)
-        self.style_type = style_type
-        self._setup_style()
+        self.style_type = style_type if style_type in self.VARIANTS else "primary"
+        self.setProperty("variant", self.style_type)
     
-    def _setup_style(self):
-        styles = {
-            "primary": f"""
-                QPushButton {{
-                    background-color: {AppleColors.BLUE.name()};
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {AppleColors.BLUE.lighter(110).name()};
-                }}
-                QPushButton:disabled {{
-                    background-color: {AppleColors.TERTIARY.name()};
-                }}
-            """,
-            "secondary": f"""
-                QPushButton {{
-                    background-color: {AppleColors.CARD.name()};
-                    color: {AppleColors.PRIMARY.name()};
-                    border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {AppleColors.ELEVATED.name()};
-                }}
-            """,
-            "ghost": f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {AppleColors.BLUE.name()};
-                    border: none;
-                    padding: 8px 16px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {AppleColors.CARD.name()};
-                    border-radius: 6px;
-                }}
-            """,
-            "success": f"""
-                QPushButton {{
-                    background-color: #65ab65;
-                    color: #ffffff;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: #4d8c4d;
-                }}
-                QPushButton:disabled {{
-                   background-color: #a8cfa8;   
-                   color: #f0f0f0;
-                }}
-            """,
-            "danger": f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {AppleColors.RED.name()};
-                    border: 1px solid {AppleColors.RED.name()};
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {AppleColors.RED.name()};
-                    color: white;
-                }}
-            """
-        }
-        
-        self.setStyleSheet(styles.get(self.style_type, styles["primary"]))
+    def set_variant(self, style_type: str):
+        """Cambia la variante y re-aplica solo el estilo de este botón"""
+        if style_type not in self.VARIANTS:
+            style_type = "primary"
+        if style_type == self.style_type:
+            return
+        self.style_type = style_type
+        self.setProperty("variant", style_type)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
 class AppleLineEdit(QLineEdit):
     """Campo de texto estilo Apple"""
     def __init__(self, placeholder: str = ""):
         super().__init__()
         self.setPlaceholderText(placeholder)
-        self.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {AppleColors.CARD.name()};
-                color: {AppleColors.PRIMARY.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
-                border-radius: 8px;
-                padding: 12px 16px;
-                font-family: '.AppleSystemUIFont';
-                font-size: 14px;
-                selection-background-color: {AppleColors.BLUE.name()};
-            }}
-            QLineEdit:focus {{
-                border: 2px solid {AppleColors.BLUE.name()};
-                padding: 11px 15px;
-            }}
-        """)
+        self.setProperty("variant", "apple")
 
 class AppleCard(QFrame):
     """Card estilo Apple"""
+    # Hojas armadas una sola vez; el QFrame se aplica también a los hijos de la card
+    _FRAME_SHEET = f"""
+        QFrame {{
+            background-color: {AppleColors.CARD_HEX};
+            border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
+            border-radius: 12px;
+        }}
+    """
+    _TITLE_SHEET = f"""
+        QLabel {{
+            color: {AppleColors.PRIMARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 16px;
+            font-weight: 600;
+            border: none;
+        }}
+    """
+    _DESC_SHEET = f"""
+        QLabel {{
+            color: {AppleColors.SECONDARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 13px;
+            border: none;
+        }}
+    """
+    
     def __init__(self, title: str = "", description: str = ""):
         super().__init__()
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {AppleColors.CARD.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
-                border-radius: 12px;
-            }}
-        """)
+        self.setStyleSheet(self._FRAME_SHEET)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 16, 20, 16)
@@ -1183,27 +1724,12 @@ class AppleCard(QFrame):
         
         if title:
             title_label = QLabel(title)
-            title_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.PRIMARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 16px;
-                    font-weight: 600;
-                    border: none;
-                }}
-            """)
+            title_label.setStyleSheet(self._TITLE_SHEET)
             layout.addWidget(title_label)
             
         if description:
             desc_label = QLabel(description)
-            desc_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.SECONDARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 13px;
-                    border: none;
-                }}
-            """)
+            desc_label.setStyleSheet(self._DESC_SHEET)
             desc_label.setWordWrap(True)
             layout.addWidget(desc_label)
 
@@ -1211,6 +1737,28 @@ class AppleCard(QFrame):
 
 class WelcomeScreen(QWidget):
     """Pantalla de bienvenida estilo Apple"""
+    # Hojas de las filas de características, armadas una vez para todas las filas
+    _FEATURE_ICON_SHEET = f"""
+        QLabel {{
+            color: {AppleColors.BLUE_HEX};
+            font-size: 24px;
+        }}
+    """
+    _FEATURE_TITLE_SHEET = f"""
+        QLabel {{
+            color: {AppleColors.PRIMARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 15px;
+            font-weight: 600;
+        }}
+    """
+    _FEATURE_DESC_SHEET = f"""
+        QLabel {{
+            color: {AppleColors.SECONDARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 13px;
+        }}
+    """
     
     def __init__(self, on_continue):
         super().__init__()
@@ -1227,7 +1775,7 @@ class WelcomeScreen(QWidget):
         title = QLabel("SecreIA")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 48px;
                 font-weight: 300;
@@ -1242,7 +1790,7 @@ class WelcomeScreen(QWidget):
         subtitle.setWordWrap(True)
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 margin-bottom: 32px;
@@ -1269,12 +1817,7 @@ class WelcomeScreen(QWidget):
             feature_layout.setSpacing(16)
             
             icon_label = QLabel(icon)
-            icon_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.BLUE.name()};
-                    font-size: 24px;
-                }}
-            """)
+            icon_label.setStyleSheet(self._FEATURE_ICON_SHEET)
             icon_label.setFixedSize(40, 40)
             icon_label.setAlignment(Qt.AlignCenter)
             
@@ -1284,24 +1827,11 @@ class WelcomeScreen(QWidget):
             text_layout.setSpacing(4)
             
             title_label = QLabel(ft_title)
-            title_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.PRIMARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 15px;
-                    font-weight: 600;
-                }}
-            """)
+            title_label.setStyleSheet(self._FEATURE_TITLE_SHEET)
             
             desc_label = QLabel(desc)
             desc_label.setWordWrap(True)
-            desc_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.SECONDARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 13px;
-                }}
-            """)
+            desc_label.setStyleSheet(self._FEATURE_DESC_SHEET)
             
             text_layout.addWidget(title_label)
             text_layout.addWidget(desc_label)
@@ -1319,6 +1849,166 @@ class WelcomeScreen(QWidget):
         continue_btn.setMinimumWidth(200)
         layout.addWidget(continue_btn, alignment=Qt.AlignHCenter)
 
+class ConnectionTestWorker(QThread):
+    """Prueba la API key de OpenAI sin bloquear la UI"""
+    
+    test_finished = Signal(int, str, bool, str)  # generation, api_key, ok, error
+    
+    def __init__(self, api_key: str, generation: int = 0):
+        super().__init__()
+        self.api_key = api_key
+        self.generation = generation
+    
+    def run(self):
+        try:
+            from openai import OpenAI
+            client = OpenAI(api_key=self.api_key)
+            client.embeddings.create(input=["test"], model="text-embedding-3-small")
+            self.test_finished.emit(self.generation, self.api_key, True, "")
+        except Exception as e:
+            self.test_finished.emit(self.generation, self.api_key, False, str(e))
+
+
+# Referencias a los workers en curso: un QThread recolectado mientras corre aborta la app
+_RUNNING_WORKERS = set()
+
+
+def _keep_worker_alive(worker: QThread):
+    """Retiene el worker hasta que termine y luego lo libera"""
+    _RUNNING_WORKERS.add(worker)
+    worker.finished.connect(lambda: _RUNNING_WORKERS.discard(worker))
+    worker.finished.connect(worker.deleteLater)
+
+
+def start_connection_test(api_key: str, on_finished, generation: int = 0) -> ConnectionTestWorker:
+    """Lanza la prueba en un QThread; on_finished(generation, api_key, ok, error) corre en el hilo de la UI"""
+    worker = ConnectionTestWorker(api_key, generation)
+    _keep_worker_alive(worker)
+    worker.test_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
+def delete_note_everywhere(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note):
+    """Elimina la nota de forma atómica: índice vectorial, SQLite y archivo de audio"""
+    # 1. Eliminar de vector store primero
+    vector_success = False
+    if vector:
+        try:
+            vector.delete_note_chunks(note.id)
+            vector_success = True
+        except Exception as e:
+            raise RuntimeError(f"Error eliminando de índice vectorial: {e}")
+    
+    # 2. Eliminar de SQLite solo si vector fue exitoso
+    try:
+        db.delete_note(note.id)
+    except Exception as e:
+        # Rollback: intentar restaurar en vector si se eliminó
+        if vector_success:
+            try:
+                vector.index_note(note.id, note.title, note.content,
+                                  note.category, note.tags, note.source)
+            except Exception:
+                pass
+        raise RuntimeError(f"Error eliminando de base de datos: {e}")
+    
+    # 3. Eliminar archivo de audio si existe
+    if note.audio_path and os.path.exists(note.audio_path):
+        try:
+            os.remove(note.audio_path)
+        except OSError:
+            pass
+
+
+class NoteDeleteWorker(QThread):
+    """Elimina una nota (índice, base de datos y audio) sin bloquear la UI"""
+    
+    delete_finished = Signal(int, bool, str)  # note_id, ok, error
+    
+    def __init__(self, db: 'NotesDB', vector: Optional['VectorIndex'], note: Note):
+        super().__init__()
+        self.db = db
+        self.vector = vector
+        self.note = note
+    
+    def run(self):
+        try:
+            delete_note_everywhere(self.db, self.vector, self.note)
+            self.delete_finished.emit(self.note.id, True, "")
+        except Exception as e:
+            self.delete_finished.emit(self.note.id, False, str(e))
+        finally:
+            # El hilo termina aquí: no dejar su conexión SQLite abierta
+            self.db.close_thread_connection()
+
+
+def start_note_delete(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                      on_finished) -> NoteDeleteWorker:
+    """Lanza el borrado en un QThread; on_finished(note_id, ok, error) corre en el hilo de la UI"""
+    worker = NoteDeleteWorker(db, vector, note)
+    _keep_worker_alive(worker)
+    worker.delete_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
+class NoteSaveWorker(QThread):
+    """Guarda una nota (SQLite e índice vectorial) sin bloquear la UI"""
+    
+    save_finished = Signal(int, bool, str)  # note_id (0 si no llegó a guardarse), ok, error
+    
+    def __init__(self, db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                 old_note: Optional[Note] = None):
+        super().__init__()
+        self.db = db
+        self.vector = vector
+        self.note = note
+        self.old_note = old_note  # copia previa para rollback si falla el índice
+    
+    def run(self):
+        note = self.note
+        note_id = 0
+        try:
+            # 1. Guardar en SQLite: categoría y nota en una sola transacción
+            with self.db.transaction():
+                self.db.add_category(note.category)
+                note_id = self.db.upsert_note(note)
+            
+            # 2. Indexar en vector store
+            if self.vector:
+                try:
+                    self.vector.index_note(note_id, note.title, note.content,
+                                           note.category, note.tags, note.source)
+                    print(f"Nota {note_id} indexada correctamente")
+                except Exception as e:
+                    # Rollback SQLite si falla vector
+                    if self.old_note:
+                        try:
+                            self.db.upsert_note(self.old_note)
+                            note_id = self.old_note.id
+                        except Exception:
+                            pass
+                    raise RuntimeError(f"Error indexando en vector store: {e}")
+            
+            self.save_finished.emit(note_id, True, "")
+        except Exception as e:
+            self.save_finished.emit(note_id, False, str(e))
+        finally:
+            # El hilo termina aquí: no dejar su conexión SQLite abierta
+            self.db.close_thread_connection()
+
+
+def start_note_save(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                    on_finished, old_note: Optional[Note] = None) -> NoteSaveWorker:
+    """Lanza el guardado en un QThread; on_finished(note_id, ok, error) corre en el hilo de la UI"""
+    worker = NoteSaveWorker(db, vector, note, old_note)
+    _keep_worker_alive(worker)
+    worker.save_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
 class SetupScreen(QWidget):
     """Pantalla de configuración estilo Apple"""
     
@@ -1326,6 +2016,7 @@ class SetupScreen(QWidget):
         super().__init__()
         self.settings = settings
         self.on_complete = on_complete
+        self._test_gen = 0  # solo se aplica el resultado de la última prueba
         self.test_timer = QTimer()
         self.test_timer.setSingleShot(True)
         self.test_timer.timeout.connect(self._test_connection)
@@ -1340,7 +2031,7 @@ class SetupScreen(QWidget):
         title = QLabel("Configuración inicial")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 32px;
                 font-weight: 300;
@@ -1352,7 +2043,7 @@ class SetupScreen(QWidget):
         subtitle = QLabel("Configura tu clave de API de OpenAI para habilitar todas las funciones")
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 margin-bottom: 24px;
@@ -1379,7 +2070,7 @@ class SetupScreen(QWidget):
         self.status_label = QLabel("No configurada")
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 13px;
             }}
@@ -1441,6 +2132,7 @@ class SetupScreen(QWidget):
     def _on_api_key_changed(self):
         api_key = self.api_key_edit.text().strip()
         has_key = bool(api_key and api_key.startswith('sk-'))
+        self._test_gen += 1  # descarta cualquier prueba en curso
         
         self.test_btn.setEnabled(has_key)
         self.continue_btn.setEnabled(has_key)
@@ -1448,12 +2140,15 @@ class SetupScreen(QWidget):
         if has_key:
             self.status_badge.set_status("unsaved")
             self.status_label.setText("No probada")
-            self.test_timer.start(2000)
+            self.test_timer.start(400)
         else:
+            self.test_timer.stop()
             self.status_badge.set_status("saved")
             self.status_label.setText("No configurada")
     
     def _start_test(self):
+        self.test_timer.stop()
+        self._test_gen += 1
         self.test_btn.setText("Probando...")
         self.test_btn.setEnabled(False)
         self.status_badge.set_status("syncing")
@@ -1462,22 +2157,23 @@ class SetupScreen(QWidget):
     
     def _test_connection(self):
         api_key = self.api_key_edit.text().strip()
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            client.embeddings.create(input=["test"], model="text-embedding-3-small")
-            
+        start_connection_test(api_key, self._on_test_finished, self._test_gen)
+    
+    def _on_test_finished(self, generation: int, api_key: str, ok: bool, error: str):
+        # Hubo cambios o una prueba más nueva: el resultado ya no aplica
+        if generation != self._test_gen:
+            return
+        if ok:
             self.status_badge.set_status("saved")
             self.status_label.setText("Conexión exitosa")
             self.test_btn.setText("✓ Conexión exitosa")
-            
-        except Exception as e:
+        else:
             self.status_badge.set_status("unsaved")
             self.status_label.setText("Error de conexión")
             self.test_btn.setText("Probar conexión")
             self.test_btn.setEnabled(True)
             
-            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{str(e)}")
+            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{error}")
     
     def _skip_setup(self):
         QMessageBox.information(self, "Configuración omitida", 
@@ -1495,21 +2191,65 @@ class SetupScreen(QWidget):
 class NotesListDelegate(QStyledItemDelegate):
     """Delegate para la lista de notas estilo Apple Notes"""
     
+    ICON_SIZE = 20
+    ELIDE_CACHE = 1024
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Fuentes creadas una vez, no por fila en cada repintado
+        self._icon_font = QFont(".AppleSystemUIFont", 12)
+        self._title_font = QFont(".AppleSystemUIFont", 16, QFont.Bold)  # Aumentado de 15 a 16 y Bold
+        self._meta_font = QFont(".AppleSystemUIFont", 13)  # fecha y preview
+        self._meta_metrics = QFontMetrics(self._meta_font)
+        # Plumas por estado (normal / seleccionada): (título, metadatos)
+        self._pens = {
+            False: (QPen(AppleColors.PRIMARY), QPen(AppleColors.SECONDARY)),
+            True: (QPen(QColor(255, 255, 255)), QPen(QColor(255, 255, 255, 180))),
+        }
+        self._icons: Dict[Tuple[str, float], QPixmap] = {}
+        self._elided: Dict[Tuple[str, int], str] = {}
+    
+    def _icon(self, emoji: str, color: QColor, dpr: float) -> QPixmap:
+        """Emoji pre-renderizado (uno por icono y densidad de pantalla)"""
+        px = self._icons.get((emoji, dpr))
+        if px is None:
+            size = round(self.ICON_SIZE * dpr)
+            px = QPixmap(size, size)
+            px.setDevicePixelRatio(dpr)
+            px.fill(Qt.transparent)
+            p = QPainter(px)
+            p.setRenderHint(QPainter.Antialiasing)
+            p.setPen(QPen(color))
+            p.setFont(self._icon_font)
+            p.drawText(0, 15, emoji)  # misma línea base que el drawText original
+            p.end()
+            self._icons[(emoji, dpr)] = px
+        return px
+    
+    def _elided_preview(self, preview: str, width: int) -> str:
+        """Preview en una línea recortada con '…' (memo por texto y ancho)"""
+        key = (preview, width)
+        text = self._elided.get(key)
+        if text is None:
+            if len(self._elided) >= self.ELIDE_CACHE:
+                self._elided.clear()
+            text = self._meta_metrics.elidedText(
+                " ".join(preview.split()), Qt.ElideRight, width
+            )
+            self._elided[key] = text
+        return text
+    
     def paint(self, painter, option, index):
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing)
+        # Sin Antialiasing: solo rectángulos alineados, texto (ya suavizado por Qt) y pixmaps
         
         rect = option.rect
-        is_selected = option.state & QStyle.State_Selected
+        is_selected = bool(option.state & QStyle.State_Selected)
         
         # Fondo
         if is_selected:
             painter.fillRect(rect, AppleColors.BLUE)
-            text_color = QColor(255, 255, 255)
-            meta_color = QColor(255, 255, 255, 180)
-        else:
-            text_color = AppleColors.PRIMARY
-            meta_color = AppleColors.SECONDARY
+        text_pen, meta_pen = self._pens[is_selected]
             
         # Datos de la nota
         data = index.data(Qt.UserRole)
@@ -1517,7 +2257,7 @@ class NotesListDelegate(QStyledItemDelegate):
             painter.restore()
             return
             
-        title = data.get('title', 'Sin título')
+        title = data.get('title_display') or data.get('title', 'Sin título').upper()
         preview = data.get('preview', '')
         date = data.get('date', '')
         has_audio = data.get('has_audio', False)
@@ -1532,20 +2272,16 @@ class NotesListDelegate(QStyledItemDelegate):
             icon_x = content_rect.x() + content_rect.width() - 30
             icon_y = content_rect.y() + 2
             
+            dpr = painter.device().devicePixelRatioF()
             if has_audio:
-                painter.setPen(QPen(AppleColors.BLUE))
-                painter.setFont(QFont(".AppleSystemUIFont", 12))
-                painter.drawText(icon_x, icon_y + 15, "🎵")
+                painter.drawPixmap(icon_x, icon_y, self._icon("🎵", AppleColors.BLUE, dpr))
                 
             if is_transcript:
-                painter.setPen(QPen(AppleColors.GREEN))
-                painter.setFont(QFont(".AppleSystemUIFont", 12))
-                painter.drawText(icon_x - 20, icon_y + 15, "🎤")
+                painter.drawPixmap(icon_x - 20, icon_y, self._icon("🎤", AppleColors.GREEN, dpr))
         
         # Título - CAMBIO AQUÍ: Mayor, negrita y mayúsculas
-        title_font = QFont(".AppleSystemUIFont", 16, QFont.Bold)  # Aumentado de 15 a 16 y Bold
-        painter.setFont(title_font)
-        painter.setPen(text_color)
+        painter.setFont(self._title_font)
+        painter.setPen(text_pen)
         
         # Reducir ancho del título si hay iconos
         title_width = content_rect.width()
@@ -1553,25 +2289,23 @@ class NotesListDelegate(QStyledItemDelegate):
             title_width -= 50
         
         title_rect = QRect(content_rect.x(), content_rect.y(), title_width, 22)  # Aumentado altura
-        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, title.upper())  # .upper() para mayúsculas
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, title)  # ya en mayúsculas
         
         # Fecha
-        date_font = QFont(".AppleSystemUIFont", 13)
-        painter.setFont(date_font)
-        painter.setPen(meta_color)
+        painter.setFont(self._meta_font)
+        painter.setPen(meta_pen)
         
         date_rect = QRect(content_rect.x(), content_rect.y() + 26, content_rect.width(), 16)  # Ajustado posición
         painter.drawText(date_rect, Qt.AlignLeft | Qt.AlignVCenter, date)
         
         # Preview del contenido
         if preview:
-            preview_font = QFont(".AppleSystemUIFont", 13)
-            painter.setFont(preview_font)
-            painter.setPen(meta_color)
-            
+            # Misma fuente y pluma que la fecha
             preview_rect = QRect(content_rect.x(), content_rect.y() + 46, 
                             content_rect.width(), content_rect.height() - 50)  # Ajustado posición
-            painter.drawText(preview_rect, Qt.TextWordWrap, preview)
+            # La fila solo tiene alto para una línea: sin ajuste de palabras
+            painter.drawText(preview_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             self._elided_preview(preview, preview_rect.width()))
         
         painter.restore()
     def sizeHint(self, option, index):
@@ -1590,6 +2324,15 @@ class EnhancedNoteEditor(QWidget):
         self.current_note_id = None
         self.is_dirty = False
         self.last_save_content = ""
+        self._save_marked = False  # el botón guardar ya muestra el '*'
+        # Cambia al limpiar el editor o cargar otra nota (descarta resultados de guardados viejos)
+        self._editor_gen = 0
+        self._pending_save = (0, "", "")
+        self._known_categories: Set[str] = set()  # categorías ya presentes en el combo
+        # Estadísticas, título y botón guardar se recalculan al pausar la escritura
+        self.derived_timer = QTimer()
+        self.derived_timer.setSingleShot(True)
+        self.derived_timer.timeout.connect(self._recompute_derived)
         self._setup_ui()
         
     def _setup_ui(self):
@@ -1620,13 +2363,7 @@ class EnhancedNoteEditor(QWidget):
         
         # Status de guardado
         self.save_status = QLabel("")
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {AppleColors.SECONDARY.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(AppleColors.SECONDARY_HEX)
         
         toolbar_layout.addWidget(self.btn_new)
         toolbar_layout.addWidget(self.btn_save)
@@ -1643,18 +2380,18 @@ class EnhancedNoteEditor(QWidget):
         self.title_edit.setPlaceholderText("Título de la nota...")
         self.title_edit.setStyleSheet(f"""
             QLineEdit {{
-                background-color: {AppleColors.CARD.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.CARD_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 8px;
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 500;
                 padding: 12px 16px;
-                selection-background-color: {AppleColors.BLUE.name()};
+                selection-background-color: {AppleColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {AppleColors.BLUE.name()};
+                border: 2px solid {AppleColors.BLUE_HEX};
                 padding: 11px 15px;
             }}
         """)
@@ -1676,10 +2413,10 @@ class EnhancedNoteEditor(QWidget):
         self.category_combo.setStyleSheet(f"""
             QComboBox {{
                 background: transparent;
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 min-width: 150px;
@@ -1696,15 +2433,15 @@ class EnhancedNoteEditor(QWidget):
         self.content_edit.setPlaceholderText("Comenzar a escribir...")
         self.content_edit.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {AppleColors.NOTES_LIST.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 12px;
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 line-height: 1.6;
                 padding: 20px;
-                selection-background-color: {AppleColors.BLUE.name()};
+                selection-background-color: {AppleColors.BLUE_HEX};
             }}
         """)
         self.content_edit.textChanged.connect(self._on_content_changed)
@@ -1714,7 +2451,7 @@ class EnhancedNoteEditor(QWidget):
         self.stats_label = QLabel("Palabras: 0 | Caracteres: 0")
         self.stats_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-size: 12px;
                 padding: 8px 0px;
             }}
@@ -1724,7 +2461,7 @@ class EnhancedNoteEditor(QWidget):
         self.refresh_categories()
     # En la clase EnhancedNoteEditor (línea ~890 aprox)
     def _delete_current_note(self):
-        """Elimina la nota actualmente cargada de forma atómica"""
+        """Elimina la nota actualmente cargada (el borrado corre en segundo plano)"""
         if not self.current_note_id:
             return
         
@@ -1741,48 +2478,29 @@ class EnhancedNoteEditor(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                # ELIMINACIÓN ATÓMICA
-                vector_success = False
-                
-                # 1. Eliminar de vector store primero
-                if self.vector:
-                    try:
-                        self.vector.delete_note_chunks(self.current_note_id)
-                        vector_success = True
-                    except Exception as e:
-                        QMessageBox.critical(self, "Error", f"Error eliminando de índice vectorial: {e}")
-                        return
-                
-                # 2. Eliminar de SQLite solo si vector fue exitoso
-                try:
-                    self.db.delete_note(self.current_note_id)
-                except Exception as e:
-                    # Rollback: intentar restaurar en vector si se eliminó
-                    if vector_success and self.vector:
-                        try:
-                            self.vector.index_note(
-                                note.id, note.title, note.content, 
-                                note.category, note.tags, note.source
-                            )
-                        except:
-                            pass
-                    QMessageBox.critical(self, "Error", f"Error eliminando de base de datos: {e}")
-                    return
-                
-                # 3. Eliminar archivo de audio si existe
-                if note.audio_path and os.path.exists(note.audio_path):
-                    try:
-                        os.remove(note.audio_path)
-                    except Exception:
-                        pass
-                
-                # 4. Limpiar editor y notificar
-                self.clear_editor()
-                self.note_saved.emit()
-                QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
+                self.btn_delete.setEnabled(False)
+                self.loading_spinner.show()
+                self.loading_spinner.start()
+                start_note_delete(self.db, self.vector, note, self._on_note_deleted)
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al eliminar: {e}")
+    
+    def _on_note_deleted(self, note_id: int, ok: bool, error: str):
+        """Resultado del borrado en segundo plano"""
+        self.loading_spinner.stop()
+        self.loading_spinner.hide()
+        self.btn_delete.setEnabled(True)
+        if not ok:
+            QMessageBox.critical(self, "Error", f"Error al eliminar: {error}")
+            return
+        
+        # Limpiar editor (si sigue mostrando la nota) y notificar
+        if self.current_note_id == note_id:
+            self.clear_editor()
+        self.note_saved.emit()
+        QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
+
     def _update_delete_button_visibility(self):
         """Actualiza visibilidad del botón eliminar según el estado"""
         # Mostrar botón eliminar solo si hay una nota cargada (no nueva)
@@ -1813,46 +2531,62 @@ class EnhancedNoteEditor(QWidget):
         self.save_status.setText("Nueva nota - Escribe contenido para guardar")
         QTimer.singleShot(4000, lambda: self.save_status.clear())
         
+    DERIVED_DELAY_MS = 150  # agrupa las teclas seguidas en un solo recálculo
+    
     def _on_content_changed(self):
-        """Maneja cambios en el contenido"""
+        """Maneja cambios en el contenido: por tecla solo se marca como modificado"""
         self._mark_dirty()
-        self._update_stats()
-        self._auto_generate_title()
-        
-        # Mostrar/ocultar botón guardar según contenido
-        has_content = bool(self.content_edit.toPlainText().strip())
-        if has_content:
-            self.btn_save.show()
-        else:
-            self.btn_save.hide()
-        
-    def _auto_generate_title(self):
+        self.derived_timer.start(self.DERIVED_DELAY_MS)
+    
+    def _recompute_derived(self, text: Optional[str] = None):
+        """Recalcula lo que depende del texto completo (un solo toPlainText())"""
+        self.derived_timer.stop()
+        if text is None:
+            text = self.content_edit.toPlainText()
+        self._update_stats(text)
+        self._auto_generate_title(text)
+        
+        # Mostrar/ocultar botón guardar según contenido (solo si cambia)
+        has_content = bool(text) and not text.isspace()  # sin copiar el texto con strip()
+        if self.btn_save.isHidden() == has_content:
+            self.btn_save.setVisible(has_content)
+        
+    def _auto_generate_title(self, text: Optional[str] = None):
         """Auto-genera título basado en el contenido"""
-        content = self.content_edit.toPlainText().strip()
-        if content:
-            # Tomar primeras palabras como título
-            words = content.split()[:6]  # Primeras 6 palabras
-            title = " ".join(words)
-            if len(content.split()) > 6:
-                title += "..."
-            self.title_edit.setText(title)
+        content = self.content_edit.toPlainText() if text is None else text
+        if content and not content.isspace():
+            # Tomar primeras 6 palabras como título
+            self.title_edit.setText(title_from_content(content))
         else:
             self.title_edit.setText("")
     
-    def _update_stats(self):
+    def _update_stats(self, text: Optional[str] = None):
         """Actualiza estadísticas del texto"""
-        text = self.content_edit.toPlainText()
-        words = len(text.split()) if text.strip() else 0
+        if text is None:
+            text = self.content_edit.toPlainText()
+        words = len(text.split())  # str.split en C: más rápido que contar con regex
         chars = len(text)
         self.stats_label.setText(f"Palabras: {words} | Caracteres: {chars}")
     
     def _mark_dirty(self):
         """Marca como modificado"""
         self.is_dirty = True
-        # Cambiar texto del botón para indicar cambios
-        if not self.btn_save.text().endswith("*"):
+        # Cambiar texto del botón para indicar cambios (una vez, no en cada tecla)
+        if not self._save_marked:
+            self._save_marked = True
             self.btn_save.setText(self.btn_save.text() + "*")
-        
+    
+    def _set_save_text(self, text: str):
+        """Texto del botón guardar; el próximo cambio vuelve a agregar el '*'"""
+        self._save_marked = False
+        self.btn_save.setText(text)
+        
+    def _add_known_category(self, name: str):
+        """Agrega una categoría nueva al combo sin releer la lista desde la base de datos"""
+        if name and name not in self._known_categories:
+            self._known_categories.add(name)
+            self.category_combo.addItem(name)
+    
     def refresh_categories(self):
         """Actualiza categorías disponibles"""
         current = self.category_combo.currentText()
@@ -1862,6 +2596,7 @@ class EnhancedNoteEditor(QWidget):
             cats = ["General"] + cats
         for c in cats:
             self.category_combo.addItem(c)
+        self._known_categories = set(cats)
         
         # Restaurar selección
         if current:
@@ -1871,6 +2606,9 @@ class EnhancedNoteEditor(QWidget):
                 
     def _save_note(self):
         """Guarda la nota con loading"""
+        # Aplicar un recálculo pendiente: el título auto-generado debe incluir lo último escrito
+        if self.derived_timer.isActive():
+            self._recompute_derived()
         title = self.title_edit.text().strip() or "Sin título"
         content = self.content_edit.toPlainText().strip()
         category = self.category_combo.currentText().strip() or "General"
@@ -1884,32 +2622,28 @@ class EnhancedNoteEditor(QWidget):
         # Mostrar loading
         self._show_saving_state()
         
-        # Usar QTimer para no bloquear la UI
-        QTimer.singleShot(100, lambda: self._do_save(title, content, category))
+        # SQLite y el índice vectorial se escriben en un QThread: la UI no se bloquea
+        self._do_save(title, content, category)
         return True
     
     def _show_saving_state(self):
         """Muestra estado de guardado"""
         self.btn_save.setEnabled(False)
-        self.btn_save.setText("Guardando...")
+        self._set_save_text("Guardando...")
         self.loading_spinner.show()
         self.loading_spinner.start()
         self.save_status.setText("Guardando...")
     
-    # En la clase EnhancedNoteEditor (línea ~750 aprox) - Reemplazar _do_save()
     def _do_save(self, title: str, content: str, category: str):
-        """Ejecuta el guardado real de forma atómica"""
+        """Arma la nota y la guarda en segundo plano (SQLite + índice vectorial)"""
         try:
-            chile_tz = pytz.timezone('America/Santiago')
-            final_title = self._get_final_title()
+            final_title = self._get_final_title(content)
             
             # Backup para rollback
             old_note = None
             if self.current_note_id:
                 old_note = self.db.get_note(self.current_note_id)
             
-            self.db.add_category(category)
-            
             note = Note(
                 id=self.current_note_id,
                 title=final_title,
@@ -1918,58 +2652,56 @@ class EnhancedNoteEditor(QWidget):
                 tags=[],
                 source="manual",
                 audio_path=None,
-                created_at=datetime.now(chile_tz).isoformat() if not self.current_note_id else None,
-                updated_at=datetime.now(chile_tz).isoformat(),
+                created_at=datetime.now(CHILE_TZ).isoformat() if not self.current_note_id else None,
+                updated_at=datetime.now(CHILE_TZ).isoformat(),
             )
             
-            # GUARDADO ATÓMICO
-            try:
-                # 1. Guardar en SQLite
-                note_id = self.db.upsert_note(note)
-                self.current_note_id = note_id
-
-                # 2. Indexar en vector store
-                if self.vector:
-                    try:
-                        self.vector.index_note(note_id, final_title, content, category, [], "manual")
-                        print(f"Nota {note_id} indexada correctamente")
-                    except Exception as e:
-                        # Rollback SQLite si falla vector
-                        if old_note:
-                            try:
-                                self.db.upsert_note(old_note)
-                                self.current_note_id = old_note.id
-                            except:
-                                pass
-                        raise Exception(f"Error indexando en vector store: {e}")
-
-                # 3. Actualizar UI solo si todo fue exitoso
-                self.refresh_categories()
-                self.is_dirty = False
-                self.title_edit.setText(final_title)
-                self._show_success_state()
-                self.note_saved.emit()
-                
-            except Exception as e:
-                # Ya se hizo rollback arriba, solo mostrar error
-                self._show_error_state(str(e))
+            self._pending_save = (self._editor_gen, final_title, category)
+            start_note_save(self.db, self.vector, note, self._on_note_saved, old_note)
                 
         except Exception as e:
             self._show_error_state(str(e))
+    
+    def _on_note_saved(self, note_id: int, ok: bool, error: str):
+        """Resultado del guardado en segundo plano"""
+        editor_gen, final_title, category = self._pending_save
+        # Si mientras tanto se limpió el editor o se abrió otra nota, no tocar sus campos
+        same_note = editor_gen == self._editor_gen
+        if same_note and note_id:
+            self.current_note_id = note_id
+        if not ok:
+            self._show_error_state(error)
+            return
+        
+        # Actualizar UI solo si todo fue exitoso
+        self._add_known_category(category)
+        if same_note:
+            self.is_dirty = False
+            self.title_edit.setText(final_title)
+        self._show_success_state()
+        self.note_saved.emit()
+    
+    def _set_save_status_style(self, color: str):
+        """Color del estado de guardado (hoja compartida, sin re-aplicar si no cambia)"""
+        sheet = cached_qss("save_status", color, lambda: f"""
+            QLabel {{
+                color: {color};
+                font-size: 12px;
+                padding: 4px 8px;
+            }}
+        """)
+        if sheet is not getattr(self, "_save_status_sheet", None):
+            self._save_status_sheet = sheet
+            self.save_status.setStyleSheet(sheet)
+
     def _show_success_state(self):
             """Muestra estado de éxito"""
             self.loading_spinner.stop()
             self.loading_spinner.hide()
             self.btn_save.setEnabled(True)
-            self.btn_save.setText("💾 Guardar")
+            self._set_save_text("💾 Guardar")
             self.save_status.setText("✅ Guardado")
-            self.save_status.setStyleSheet(f"""
-                QLabel {{
-                    color: {AppleColors.GREEN.name()};
-                    font-size: 12px;
-                    padding: 4px 8px;
-                }}
-            """)
+            self._set_save_status_style(AppleColors.GREEN_HEX)
             
             # Limpiar status después de 3 segundos
             QTimer.singleShot(3000, self._clear_status)
@@ -1979,15 +2711,9 @@ class EnhancedNoteEditor(QWidget):
         self.loading_spinner.stop()
         self.loading_spinner.hide()
         self.btn_save.setEnabled(True)
-        self.btn_save.setText("💾 Guardar")
+        self._set_save_text("💾 Guardar")
         self.save_status.setText("❌ Error")
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {AppleColors.RED.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(AppleColors.RED_HEX)
         
         QMessageBox.critical(self, "Error", f"Error al guardar: {error}")
         QTimer.singleShot(3000, self._clear_status)
@@ -1995,23 +2721,18 @@ class EnhancedNoteEditor(QWidget):
     def _clear_status(self):
         """Limpia el status"""
         self.save_status.clear()
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {AppleColors.SECONDARY.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(AppleColors.SECONDARY_HEX)
     
     def clear_editor(self):
         """Limpia el editor"""
+        self._editor_gen += 1
         self.current_note_id = None
         self.title_edit.clear()
         self.content_edit.clear()
         self.category_combo.setCurrentText("General")
         self.is_dirty = False
         self.title_manually_edited = False
-        self.btn_save.setText("💾 Guardar")
+        self._set_save_text("💾 Guardar")
         self.btn_save.hide()  # Ocultar botón al limpiar
         self._update_stats()
         self._clear_status()
@@ -2026,19 +2747,23 @@ class EnhancedNoteEditor(QWidget):
             if not note:
                 return False
                 
+            self._editor_gen += 1
             self.current_note_id = note_id
-            self.title_edit.setText(note.title)
-            self.title_manually_edited = True
-            self.content_edit.setPlainText(note.content)
+            # Sin señales: cargar el texto no dispara _on_content_changed ni _mark_dirty;
+            # lo derivado se calcula una vez con el contenido que ya tenemos
+            with QSignalBlocker(self.title_edit), QSignalBlocker(self.content_edit):
+                self.title_edit.setText(note.title)
+                self.content_edit.setPlainText(note.content)
+                # El título guardado manda: sin auto-título al cargar
+                self.title_manually_edited = True
+                self._recompute_derived(note.content)
             
             # Actualizar categoría
-            if self.category_combo.findText(note.category) == -1:
-                self.category_combo.addItem(note.category)
+            self._add_known_category(note.category)
             self.category_combo.setCurrentText(note.category)
             
             self.is_dirty = False
-            self.btn_save.setText("💾 Guardar")
-            self._update_stats()
+            self._set_save_text("💾 Guardar")
             self._clear_status()
             
             # NUEVO: Actualizar visibilidad del botón eliminar
@@ -2068,18 +2793,15 @@ class EnhancedNoteEditor(QWidget):
             # Marcar como editado manualmente
             self.title_manually_edited = True
 
-    def _auto_generate_title(self):
+    def _auto_generate_title(self, text: Optional[str] = None):
         """Auto-genera título basado en el contenido solo si no fue editado manualmente"""
         if self.title_manually_edited:
             return  # No sobrescribir si fue editado manualmente
             
-        content = self.content_edit.toPlainText().strip()
-        if content:
-            # Tomar primeras palabras como título
-            words = content.split()[:6]  # Primeras 6 palabras
-            title = " ".join(words)
-            if len(content.split()) > 6:
-                title += "..."
+        content = self.content_edit.toPlainText() if text is None else text
+        if content and not content.isspace():
+            # Tomar primeras 6 palabras como título
+            title = title_from_content(content)
             
             # Solo actualizar si no está enfocado (evitar interferir mientras escribe)
             if not self.title_edit.hasFocus():
@@ -2089,18 +2811,16 @@ class EnhancedNoteEditor(QWidget):
             if not self.title_edit.hasFocus():
                 self.title_edit.setText("")
 
-    def _get_final_title(self):
-        """Obtiene el título final para guardar"""
+    def _get_final_title(self, content: Optional[str] = None):
+        """Obtiene el título final para guardar (content: texto ya leído del editor, si lo hay)"""
         title = self.title_edit.text().strip()
         
         if not title:
             # Si no hay título, generar uno automáticamente
-            content = self.content_edit.toPlainText().strip()
-            if content:
-                words = content.split()[:6]
-                title = " ".join(words)
-                if len(content.split()) > 6:
-                    title += "..."
+            if content is None:
+                content = self.content_edit.toPlainText()
+            if content and not content.isspace():
+                title = title_from_content(content)
             else:
                 title = "Sin título"
         
@@ -2150,7 +2870,7 @@ class EnhancedNotesView(QWidget):
         self.notes_list.customContextMenuRequested.connect(self._show_context_menu)
         self.notes_list.setStyleSheet(f"""
             QListWidget {{
-                background-color: {AppleColors.NOTES_LIST.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
                 border: none;
                 outline: none;
             }}
@@ -2161,7 +2881,7 @@ class EnhancedNotesView(QWidget):
         self.status_label = QLabel("0 notas")
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-size: 12px;
                 padding: 8px;
             }}
@@ -2183,14 +2903,13 @@ class EnhancedNotesView(QWidget):
         self.notes_list.clear()
         
         if query:
-            notes = self.db.search_notes(query)
+            notes = self.db.iter_search_notes_preview(query)
         else:
-            notes = self.db.list_notes(limit=200)
+            notes = self.db.iter_search_notes_preview("", limit=200)
         
-        for note in notes:
-            self._add_note_to_list(note)
+        count = self._fill_notes_list(notes)
         
-        self.status_label.setText(f"{len(notes)} notas")
+        self.status_label.setText(f"{count} notas")
     def _apply_search(self, query: str, filters: Dict[str, str]):
         """Aplica búsqueda con filtros"""
         self.current_filters = filters
@@ -2200,49 +2919,44 @@ class EnhancedNotesView(QWidget):
         """Filtra notas según criterios"""
         self.notes_list.clear()
         
-        # Obtener notas base
-        if filters.get('category'):
-            notes = self.db.search_notes("", category=filters['category'])
-        else:
-            notes = self.db.list_notes(limit=1000)
-        
-        # Aplicar filtro de texto
-        if query:
-            notes = [n for n in notes if query.lower() in n.title.lower() or query.lower() in n.content.lower()]
-        
-        # Aplicar filtro de fecha
         date_filter = filters.get('date_filter', 'Todas')
-        if date_filter != 'Todas':
-            now = datetime.utcnow()
-            if date_filter == 'Hoy':
-                cutoff = now - timedelta(days=1)
-            elif date_filter == 'Esta semana':
-                cutoff = now - timedelta(days=7)
-            elif date_filter == 'Este mes':
-                cutoff = now - timedelta(days=30)
-            else:
-                cutoff = None
-            
-            if cutoff:
-                notes = [n for n in notes if datetime.fromisoformat(n.updated_at.replace('Z', '+00:00')) > cutoff]
+        days = {'Hoy': 1, 'Esta semana': 7, 'Este mes': 30}.get(date_filter)
+        cutoff = (datetime.now(UTC) - timedelta(days=days)).timestamp() if days else None
         
-        # Aplicar filtro de tipo
         type_filter = filters.get('type_filter', 'Todos')
-        if type_filter == 'Manual':
-            notes = [n for n in notes if n.source == 'manual']
-        elif type_filter == 'Transcripciones':
-            notes = [n for n in notes if n.source == 'transcript']
+        source = {'Manual': 'manual', 'Transcripciones': 'transcript'}.get(type_filter)
+        
+        # Texto, categoría, fecha y tipo se resuelven en SQLite (índice trigram)
+        category = filters.get('category') or None
+        notes = self.db.search_notes_preview(
+            query,
+            category=category,
+            source=source,
+            updated_since=cutoff,
+            limit=None if category else 1000,
+        )
         
         # Mostrar resultados
-        for note in notes:
-            self._add_note_to_list(note)
+        self._fill_notes_list(notes)
         
         self.status_label.setText(f"{len(notes)} notas")
     
-    def _add_note_to_list(self, note: Note):
+    def _fill_notes_list(self, notes: Iterable[NoteListRow]) -> int:
+        """Agrega las notas en bloque: un solo repintado al final"""
+        today_ordinal = datetime.now(CHILE_TZ).toordinal()
+        count = 0
+        self.notes_list.setUpdatesEnabled(False)
+        try:
+            for note in notes:
+                self._add_note_to_list(note, today_ordinal)
+                count += 1
+        finally:
+            self.notes_list.setUpdatesEnabled(True)
+        return count
+    
+    def _add_note_to_list(self, note: NoteListRow, today_ordinal: Optional[int] = None):
         """Agrega una nota a la lista"""
-        preview = note.content[:100] + "..." if len(note.content) > 100 else note.content
-        date_str = self._format_date(note.updated_at)
+        date_str = format_date_chile(note.updated_at or "", today_ordinal)
         
         # Detectar características especiales
         has_audio = bool(note.audio_path and os.path.exists(note.audio_path))
@@ -2252,7 +2966,8 @@ class EnhancedNotesView(QWidget):
         item.setData(Qt.UserRole, {
             'id': note.id,
             'title': note.title or "Sin título",
-            'preview': preview,
+            'title_display': (note.title or "Sin título").upper(),  # el delegate no convierte al pintar
+            'preview': note.preview,  # recortado en SQLite (con "..." si sigue)
             'date': date_str,
             'has_audio': has_audio,
             'is_transcript': is_transcript
@@ -2270,23 +2985,23 @@ class EnhancedNotesView(QWidget):
             return
             
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {AppleColors.ELEVATED.name()};
-                border: 1px solid {AppleColors.SEPARATOR.name()};
-                border-radius: 8px;
-                padding: 4px 0;
-                font-size: 14px;
-                color: {AppleColors.PRIMARY.name()};
-            }}
-            QMenu::item {{
-                padding: 8px 16px;
-            }}
-            QMenu::item:selected {{
-                background-color: {AppleColors.BLUE.name()};
-                color: white;
-            }}
-        """)
+        menu.setStyleSheet(cached_qss("context_menu", "default", lambda: f"""
+                QMenu {{
+                    background-color: {AppleColors.ELEVATED_HEX};
+                    border: 1px solid {AppleColors.SEPARATOR_HEX};
+                    border-radius: 8px;
+                    padding: 4px 0;
+                    font-size: 14px;
+                    color: {AppleColors.PRIMARY_HEX};
+                }}
+                QMenu::item {{
+                    padding: 8px 16px;
+                }}
+                QMenu::item:selected {{
+                    background-color: {AppleColors.BLUE_HEX};
+                    color: white;
+                }}
+            """))
         
         edit_action = menu.addAction("✏️ Editar")
         duplicate_action = menu.addAction("📋 Duplicar")
@@ -2368,15 +3083,16 @@ class EnhancedNotesView(QWidget):
         
         if file_path:
             try:
-                if format_ext == "md":
-                    content = export_manager.export_note_markdown(note)
-                elif format_ext == "json":
-                    content = export_manager.export_notes_json([note])
+                if format_ext == "json":
+                    export_manager.export_notes_json_to(file_path, [note])
                 else:
-                    content = f"# {note.title}\n\n{note.content}"
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    with open(file_path, 'w', encoding='utf-8',
+                              buffering=NotesExportManager.WRITE_BUFFER) as f:
+                        if format_ext == "md":
+                            export_manager.export_note_markdown_to(f, note)
+                        else:
+                            f.write(f"# {note.title}\n\n")
+                            f.write(note.content)
                 
                 QMessageBox.information(self, "Exportación", f"Nota exportada a {file_path}")
                 
@@ -2385,7 +3101,7 @@ class EnhancedNotesView(QWidget):
     
     # En la clase EnhancedNotesView (línea ~1200 aprox) - Reemplazar _delete_note_from_menu()
     def _delete_note_from_menu(self, note_id: int, item: QListWidgetItem):
-        """Elimina nota desde menú contextual de forma atómica"""
+        """Elimina nota desde menú contextual (el borrado corre en segundo plano)"""
         note = self.db.get_note(note_id)
         if not note:
             return
@@ -2398,46 +3114,29 @@ class EnhancedNotesView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            try:
-                # ELIMINACIÓN ATÓMICA (mismo patrón que arriba)
-                vector_success = False
-                
-                if self.vector:
-                    try:
-                        self.vector.delete_note_chunks(note_id)
-                        vector_success = True
-                    except Exception as e:
-                        QMessageBox.critical(self, "Error", f"Error eliminando de índice: {e}")
-                        return
-                
-                try:
-                    self.db.delete_note(note_id)
-                except Exception as e:
-                    if vector_success and self.vector:
-                        try:
-                            self.vector.index_note(note.id, note.title, note.content, 
-                                                note.category, note.tags, note.source)
-                        except:
-                            pass
-                    QMessageBox.critical(self, "Error", f"Error eliminando: {e}")
-                    return
-                
-                # Limpiar UI
-                if note.audio_path and os.path.exists(note.audio_path):
-                    try:
-                        os.remove(note.audio_path)
-                    except Exception:
-                        pass
-                
-                self.notes_list.takeItem(self.notes_list.row(item))
-                if self.note_editor.current_note_id == note_id:
-                    self.note_editor.clear_editor()
-                
-                self.status_label.setText(f"{self.notes_list.count()} notas")
-                QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al eliminar: {e}")
+            self.status_label.setText("Eliminando...")
+            start_note_delete(self.db, self.vector, note, self._on_note_deleted_from_menu)
+    
+    def _on_note_deleted_from_menu(self, note_id: int, ok: bool, error: str):
+        """Quita la nota de la lista cuando termina el borrado"""
+        if not ok:
+            self.status_label.setText(f"{self.notes_list.count()} notas")
+            QMessageBox.critical(self, "Error", f"Error al eliminar: {error}")
+            return
+        
+        # La lista pudo recargarse mientras tanto: buscar la fila por id
+        for row in range(self.notes_list.count()):
+            data = self.notes_list.item(row).data(Qt.UserRole)
+            if data and data.get('id') == note_id:
+                self.notes_list.takeItem(row)
+                break
+        
+        # Limpiar editor si era la nota activa
+        if self.note_editor.current_note_id == note_id:
+            self.note_editor.clear_editor()
+        
+        self.status_label.setText(f"{self.notes_list.count()} notas")
+        QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
     def _on_note_selected(self, item):
         """Maneja selección de nota"""
         data = item.data(Qt.UserRole)
@@ -2451,9 +3150,8 @@ class EnhancedNotesView(QWidget):
             self._filter_notes("", self.current_filters)
         else:
             # Carga inicial
-            notes = self.db.list_notes(limit=200)
-            for note in notes:
-                self._add_note_to_list(note)
+            notes = self.db.list_notes_preview(limit=200)
+            self._fill_notes_list(notes)
             self.status_label.setText(f"{len(notes)} notas")
     
     def _format_date(self, date_str):
@@ -2556,15 +3254,17 @@ class EnhancedTranscribeTab(QWidget):
         self.status_label.setStyleSheet(f"color:{TEXT};font-size:12px;")
         controls.addWidget(self.status_label, 1, Qt.AlignLeft)
 
+        btn_css = f"""
+            QPushButton {{background:{BG_CARD};color:{TEXT};border:1px solid {BORDER};
+            border-radius:10px;padding:8px 16px;}}
+            QPushButton:hover {{border-color:{ACCENT};}}
+            QPushButton:disabled {{color:#8e8e93;background:#2b2b2f;border-color:#2f2f33;}}
+        """
+
         def style_btn(b: QPushButton):
             b.setMinimumHeight(36)
             b.setCursor(Qt.PointingHandCursor)
-            b.setStyleSheet(f"""
-                QPushButton {{background:{BG_CARD};color:{TEXT};border:1px solid {BORDER};
-                border-radius:10px;padding:8px 16px;}}
-                QPushButton:hover {{border-color:{ACCENT};}}
-                QPushButton:disabled {{color:#8e8e93;background:#2b2b2f;border-color:#2f2f33;}}
-            """)
+            b.setStyleSheet(btn_css)
 
         self.btn_start = QPushButton("🟢 Iniciar"); style_btn(self.btn_start)
         self.btn_stop  = QPushButton("⏹️ Detener"); self.btn_stop.setEnabled(False); 
@@ -3319,11 +4019,11 @@ class EnhancedTranscribeTab(QWidget):
     def _auto_generate_title(self):
         if self.title_edit.text().strip() in ["", "Título automático..."]:
             if self.realtime_text and len(self.realtime_text) > 0:
-                combined_text = " ".join(self.realtime_text)
-                if len(combined_text.split()) >= 3:
-                    words = combined_text.split()[:6]
+                # Solo se leen las primeras palabras, sin unir toda la transcripción
+                words, more = first_words(self.realtime_text, 6)
+                if len(words) >= 3:
                     suggested_title = " ".join(words)
-                    if len(combined_text.split()) > 6:
+                    if more:
                         suggested_title += "..."
                     self.title_edit.setText(suggested_title)
 
@@ -3530,14 +4230,8 @@ Después de habilitar los permisos, reinicia la aplicación.
         text = self.transcript_preview.toPlainText().strip()
         if text and not text.startswith("🎤"):
             clean_text = self._clean_content(text)
-            try:
-                import pyperclip
-                pyperclip.copy(clean_text)
-                QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
-            except:
-                clipboard = QApplication.clipboard()
-                clipboard.setText(clean_text)
-                QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
+            QApplication.clipboard().setText(clean_text)
+            QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
 
     def _clear_transcription(self):
         self.transcript_preview.clear()
@@ -3689,7 +4383,7 @@ class SearchTab(QWidget):
         self.results_title = QLabel("Resultados")
         self.results_title.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -3699,7 +4393,7 @@ class SearchTab(QWidget):
         self.results_count = QLabel("0 resultados")
         self.results_count.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-size: 14px;
             }}
         """)
@@ -3713,8 +4407,8 @@ class SearchTab(QWidget):
         self.results = QListWidget()
         self.results.setStyleSheet(f"""
             QListWidget {{
-                background-color: {AppleColors.NOTES_LIST.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 12px;
                 outline: none;
                 font-family: '.AppleSystemUIFont';
@@ -3722,18 +4416,18 @@ class SearchTab(QWidget):
                 padding: 8px;
             }}
             QListWidget::item {{
-                background-color: {AppleColors.ELEVATED.name()};
-                color: {AppleColors.PRIMARY.name()};
+                background-color: {AppleColors.ELEVATED_HEX};
+                color: {AppleColors.PRIMARY_HEX};
                 border-radius: 8px;
                 padding: 16px;
                 margin-bottom: 8px;
             }}
             QListWidget::item:hover {{
-                background-color: {AppleColors.BLUE.name()};
+                background-color: {AppleColors.BLUE_HEX};
                 color: white;
             }}
             QListWidget::item:selected {{
-                background-color: {AppleColors.BLUE.name()};
+                background-color: {AppleColors.BLUE_HEX};
                 color: white;
             }}
         """)
@@ -3907,7 +4601,7 @@ class AnalyzeTab(QWidget):
         description = QLabel("Haz preguntas sobre el contenido de tus notas. La IA analizará tu información para darte respuestas precisas.")
         description.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
             }}
@@ -3944,9 +4638,9 @@ class AnalyzeTab(QWidget):
         self.k_spin.setValue(self.settings.top_k)
         self.k_spin.setStyleSheet(f"""
             QSpinBox {{
-                background-color: {AppleColors.CARD.name()};
-                color: {AppleColors.PRIMARY.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.CARD_HEX};
+                color: {AppleColors.PRIMARY_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
                 font-family: '.AppleSystemUIFont';
@@ -3972,7 +4666,7 @@ class AnalyzeTab(QWidget):
         answer_title = QLabel("Análisis")
         answer_title.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -3993,8 +4687,8 @@ class AnalyzeTab(QWidget):
         self.answer.setPlaceholderText("Las respuestas del análisis aparecerán aquí...")
         self.answer.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {AppleColors.NOTES_LIST.name()};
-                color: {AppleColors.PRIMARY.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
+                color: {AppleColors.PRIMARY_HEX};
                 border: none;
                 border-radius: 8px;
                 padding: 20px;
@@ -4017,18 +4711,10 @@ class AnalyzeTab(QWidget):
     
     def _copy_answer(self):
         """Copia respuesta al portapapeles"""
-        try:
-            text = self.answer.toPlainText()
-            if text:
-                pyperclip.copy(text)
-                QMessageBox.information(self, "Copiado", "Respuesta copiada al portapapeles")
-        except ImportError:
-            # Fallback si pyperclip no está disponible
-            clipboard = QApplication.clipboard()
-            clipboard.setText(text)
+        text = self.answer.toPlainText()
+        if text:
+            QApplication.clipboard().setText(text)
             QMessageBox.information(self, "Copiado", "Respuesta copiada al portapapeles")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"No se pudo copiar: {e}")
 
     def ask(self):
         if not self.vector:
@@ -4147,7 +4833,7 @@ class SettingsTab(QWidget):
         # Estilo común para labels (sin bordes)
         label_style = f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 font-weight: 500;
@@ -4160,19 +4846,19 @@ class SettingsTab(QWidget):
         # Estilo común para inputs (fondo más oscuro)
         input_style = f"""
             QLineEdit {{
-                background-color: {AppleColors.SIDEBAR.name()};
-                color: {AppleColors.PRIMARY.name()};
-                border: 1px solid {AppleColors.SEPARATOR.name()};
+                background-color: {AppleColors.SIDEBAR_HEX};
+                color: {AppleColors.PRIMARY_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_HEX};
                 border-radius: 8px;
                 padding: 12px 16px;
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
-                selection-background-color: {AppleColors.BLUE.name()};
+                selection-background-color: {AppleColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {AppleColors.BLUE.name()};
+                border: 2px solid {AppleColors.BLUE_HEX};
                 padding: 11px 15px;
-                background-color: {AppleColors.NOTES_LIST.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
             }}
         """
         
@@ -4245,9 +4931,9 @@ class SettingsTab(QWidget):
         self.top_k.setValue(self.settings.top_k)
         self.top_k.setStyleSheet(f"""
             QSpinBox {{
-                background-color: {AppleColors.SIDEBAR.name()};
-                color: {AppleColors.PRIMARY.name()};
-                border: 1px solid {AppleColors.SEPARATOR.name()};
+                background-color: {AppleColors.SIDEBAR_HEX};
+                color: {AppleColors.PRIMARY_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_HEX};
                 border-radius: 8px;
                 padding: 12px 16px;
                 font-family: '.AppleSystemUIFont';
@@ -4255,9 +4941,9 @@ class SettingsTab(QWidget):
                 min-width: 100px;
             }}
             QSpinBox:focus {{
-                border: 2px solid {AppleColors.BLUE.name()};
+                border: 2px solid {AppleColors.BLUE_HEX};
                 padding: 11px 15px;
-                background-color: {AppleColors.NOTES_LIST.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
             }}
             QSpinBox::up-button, QSpinBox::down-button {{
                 background-color: transparent;
@@ -4347,19 +5033,15 @@ class SettingsTab(QWidget):
             
         self.test_btn.setText("Probando...")
         self.test_btn.setEnabled(False)
-        QTimer.singleShot(100, lambda: self._do_connection_test(api_key))
+        start_connection_test(api_key, self._on_connection_tested)
     
-    def _do_connection_test(self, api_key: str):
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            client.embeddings.create(input=["test"], model="text-embedding-3-small")
+    def _on_connection_tested(self, generation: int, api_key: str, ok: bool, error: str):
+        self.test_btn.setText("Probar conexión")
+        self.test_btn.setEnabled(True)
+        if ok:
             QMessageBox.information(self, "Conexión exitosa", "La conexión con OpenAI fue exitosa.")
-        except Exception as e:
-            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{str(e)}")
-        finally:
-            self.test_btn.setText("Probar conexión")
-            self.test_btn.setEnabled(True)
+        else:
+            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{error}")
 
     def browse_dir(self):
         d = QFileDialog.getExistingDirectory(self, "Selecciona carpeta de datos", self.data_dir.text())
@@ -4449,7 +5131,7 @@ class CategoriesTab(QWidget):
         categories_title = QLabel("Categorías existentes")
         categories_title.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 20px;
                 font-weight: 500;
@@ -4459,7 +5141,7 @@ class CategoriesTab(QWidget):
         self.categories_count = QLabel("0 categorías")
         self.categories_count.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-size: 14px;
             }}
         """)
@@ -4482,21 +5164,21 @@ class CategoriesTab(QWidget):
                 font-size: 14px;
             }}
             QListWidget::item {{
-                background-color: {AppleColors.CARD.name()};
-                color: {AppleColors.PRIMARY.name()};
+                background-color: {AppleColors.CARD_HEX};
+                color: {AppleColors.PRIMARY_HEX};
                 padding: 20px;
                 margin-bottom: 8px;
                 border-radius: 12px;
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
             }}
             QListWidget::item:hover {{
-                background-color: {AppleColors.ELEVATED.name()};
-                border-color: {AppleColors.BLUE.name()};
+                background-color: {AppleColors.ELEVATED_HEX};
+                border-color: {AppleColors.BLUE_HEX};
             }}
             QListWidget::item:selected {{
-                background-color: {AppleColors.BLUE.name()};
+                background-color: {AppleColors.BLUE_HEX};
                 color: white;
-                border-color: {AppleColors.BLUE.name()};
+                border-color: {AppleColors.BLUE_HEX};
             }}
         """)
         layout.addWidget(self.categories_list, 1)
@@ -4660,23 +5342,23 @@ class CategoriesTab(QWidget):
         stats = data['stats']
         
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {AppleColors.ELEVATED.name()};
-                border: 1px solid {AppleColors.SEPARATOR.name()};
-                border-radius: 8px;
-                padding: 4px 0;
-                font-size: 14px;
-                color: {AppleColors.PRIMARY.name()};
-            }}
-            QMenu::item {{
-                padding: 8px 16px;
-            }}
-            QMenu::item:selected {{
-                background-color: {AppleColors.BLUE.name()};
-                color: white;
-            }}
-        """)
+        menu.setStyleSheet(cached_qss("context_menu", "default", lambda: f"""
+                QMenu {{
+                    background-color: {AppleColors.ELEVATED_HEX};
+                    border: 1px solid {AppleColors.SEPARATOR_HEX};
+                    border-radius: 8px;
+                    padding: 4px 0;
+                    font-size: 14px;
+                    color: {AppleColors.PRIMARY_HEX};
+                }}
+                QMenu::item {{
+                    padding: 8px 16px;
+                }}
+                QMenu::item:selected {{
+                    background-color: {AppleColors.BLUE_HEX};
+                    color: white;
+                }}
+            """))
         
         # Acciones disponibles
         view_action = menu.addAction(f"Ver notas ({stats['total']})")
@@ -5023,14 +5705,14 @@ class DashboardTab(QWidget):
         self.stats_label = QLabel("Notas: 0 | Categorías: 0 | Esta semana: 0 | Transcripciones: 0")
         self.stats_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.SECONDARY.name()};
+                color: {AppleColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 font-weight: 500;
-                background-color: {AppleColors.CARD.name()};
+                background-color: {AppleColors.CARD_HEX};
                 padding: 12px 20px;
                 border-radius: 8px;
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
             }}
         """)
         self.stats_label.setAlignment(Qt.AlignCenter)
@@ -5041,7 +5723,7 @@ class DashboardTab(QWidget):
         recent_label = QLabel("Notas recientes")
         recent_label.setStyleSheet(f"""
             QLabel {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 20px;
                 font-weight: 500;
@@ -5061,8 +5743,8 @@ class DashboardTab(QWidget):
         self.recent_notes_list.setItemDelegate(NotesListDelegate())
         self.recent_notes_list.setStyleSheet(f"""
             QListWidget {{
-                background-color: {AppleColors.NOTES_LIST.name()};
-                border: 1px solid {AppleColors.SEPARATOR_LIGHT.name()};
+                background-color: {AppleColors.NOTES_LIST_HEX};
+                border: 1px solid {AppleColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 12px;
                 outline: none;
                 font-family: '.AppleSystemUIFont';
@@ -5157,12 +5839,12 @@ class DashboardTab(QWidget):
             self.recent_notes_list.clear()
 
             # En el loop donde se crean los items de la lista (línea donde se construye el texto)
+            today_ordinal = datetime.now(CHILE_TZ).toordinal()
             for note in sorted_notes[:50]:
                 icon = "🎤" if (getattr(note, "source", "") or "").lower() == "transcript" else "📄"
                 title = getattr(note, "title", "") or "(Sin título)"
                 category = getattr(note, "category", "") or "Sin categoría"
-                updated_raw = getattr(note, "updated_at", "") or ""
-                updated_show = format_date_chile(updated_raw) if updated_raw else ""
+                updated_show = note_display_date(note, today_ordinal)
                 content = getattr(note, "content", "") or ""
                 preview = (content[:150] + "...") if len(content) > 150 else content
 
@@ -5170,7 +5852,8 @@ class DashboardTab(QWidget):
                 item = QListWidgetItem()
                 item.setData(Qt.UserRole, {
                     'id': getattr(note, "id", None),
-                    'title': title,  # El delegate aplicará .upper() automáticamente
+                    'title': title,
+                    'title_display': title.upper(),
                     'preview': preview,
                     'date': updated_show,
                     'has_audio': False,
@@ -5206,7 +5889,7 @@ class SideNav(QWidget):
                 font-size: 18px;
             }}
             QListWidget::item {{
-                color: {AppleColors.PRIMARY.name()};
+                color: {AppleColors.PRIMARY_HEX};
                 padding: 10px 16px;
                 border-radius: 8px;
                 margin: 3px 0px;
@@ -5217,7 +5900,7 @@ class SideNav(QWidget):
                 background-color: rgba(255,255,255,0.06);
             }}
             QListWidget::item:selected {{
-                background-color: {AppleColors.BLUE.name()};
+                background-color: {AppleColors.BLUE_HEX};
                 color: white;
                 font-size: 24px;
                 font-weight: 700;
@@ -5285,7 +5968,7 @@ class MainWindow(QMainWindow):
     def _setup_style(self):
         self.setStyleSheet(f"""
             QMainWindow {{
-                background-color: {AppleColors.CONTENT.name()};
+                background-color: {AppleColors.CONTENT_HEX};
             }}
         """)
     
@@ -5332,8 +6015,8 @@ class MainWindow(QMainWindow):
         self.nav = SideNav(self._on_nav_changed)
         self.nav.setStyleSheet(f"""
             QWidget {{
-                background-color: {AppleColors.SIDEBAR.name()};
-                border-right: 1px solid {AppleColors.SEPARATOR.name()};
+                background-color: {AppleColors.SIDEBAR_HEX};
+                border-right: 1px solid {AppleColors.SEPARATOR_HEX};
             }}
         """)
         main_layout.addWidget(self.nav)
@@ -5421,6 +6104,10 @@ class MainWindow(QMainWindow):
                 if self.summary_tab.audio_playing:
                     self.summary_tab._stop_audio()
             
+            # Cerrar conexiones SQLite cacheadas
+            if hasattr(self, 'db'):
+                self.db.close()
+            
             print("Recursos limpiados correctamente")
         except Exception as e:
             print(f"Error en limpieza: {e}")
@@ -5481,18 +6168,8 @@ def main():
     
     app.setPalette(palette)
     
-    # Tooltips estilo Apple
-    app.setStyleSheet(f"""
-        QToolTip {{
-            background-color: {AppleColors.ELEVATED.name()};
-            color: {AppleColors.PRIMARY.name()};
-            border: 1px solid {AppleColors.SEPARATOR.name()};
-            padding: 8px 12px;
-            border-radius: 8px;
-            font-family: '.AppleSystemUIFont';
-            font-size: 12px;
-        }}
-    """)
+    # Estilos globales: tooltips, botones y campos de texto
+    app.setStyleSheet(APP_QSS)
     
     try:
         window = MainWindow()
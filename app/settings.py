@@ -10,6 +10,7 @@ DEFAULT_CONFIG = {
     "embedding_model": "text-embedding-3-small",
     "transcription_model": "whisper-1",
     "top_k": 5,
+    "semantic_cache_threshold": 0.95,
 }
 
 
@@ -112,4 +113,13 @@ class Settings:
     @top_k.setter
     def top_k(self, value: int) -> None:
         self._config["top_k"] = int(value)
-        self.save()
\ No newline at end of file
+        self.save()
+
+    @property
+    def semantic_cache_threshold(self) -> float:
+        return float(self._config.get("semantic_cache_threshold", 0.95))
+
+    @semantic_cache_threshold.setter
+    def semantic_cache_threshold(self, value: float) -> None:
+        self._config["semantic_cache_threshold"] = float(value)
+        self.save()
@@ -3,11 +3,12 @@ import os
 import re
 import uuid
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional, Any
+from typing import Iterable, List, Dict, Tuple, Optional, Any
 from datetime import datetime
 import hashlib
 from .settings import Settings
 from .ai import AIService
+from .db import Note
 
 os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
 os.environ.setdefault("CHROMADB_TELEMETRY_IMPLEMENTATION", "noop")
@@ -658,44 +659,35 @@ class VectorIndex:
             else:
                 raise RuntimeError(f"Error inicializando ChromaDB: {e}")
 
-    def index_note(self, note_id: int, title: str, content: str, category: str = "", tags: List[str] = None, source: str = "manual") -> None:
-        """Indexa nota con chunking inteligente y metadata rica"""
-        if not content.strip() and not title.strip():
-            return
-        
-        # Limpiar chunks existentes
-        self.delete_note_chunks(note_id)
-        
-        # OBTENER FECHA DE CREACIÓN DESDE SQLite (solo para metadatos)
+    INDEX_BATCH = 256  # chunks por llamada a la API de embeddings
+
+    def _note_chunks(self, note_id: int, title: str, content: str, category: str = "",
+                     tags: List[str] = None, source: str = "manual") -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """Chunks de una nota como (ids, documentos, metadatas), con ids estables por contenido"""
         created_at = datetime.utcnow().isoformat()
-        try:
-            # Si tenemos acceso a la nota original, usar su fecha
-            from .db import NotesDB
-            # Esto es solo para obtener la fecha, no para contenido
-            pass
-        except:
-            pass
+        ids: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        documents: List[str] = []
+        seen: Dict[str, int] = {}
         
         # Combinar título y contenido para chunking
-        full_text = content
-        chunks = self.chunker.chunk_text(full_text, title)
-
-        if not chunks:
-            return
-
-        ids = []
-        metadatas = []
-        documents = []
-        
-        for start, end, text, chunk_type, chunk_metadata in chunks:
+        for start, end, text, chunk_type, chunk_metadata in self.chunker.chunk_text(content, title):
             if not text.strip():
                 continue
-                
-            chunk_id = str(uuid.uuid4())
-            ids.append(chunk_id)
+            
+            # Preparar documento con contexto
+            doc_text = text
+            if chunk_type != "title" and title:
+                doc_text = f"Título: {title}\n\n{text}"
+            
+            # El id sale del texto embebido: si el chunk no cambió se conserva su embedding
+            digest = hashlib.sha1(doc_text.encode("utf-8")).hexdigest()[:20]
+            repeat = seen.get(digest, 0)
+            seen[digest] = repeat + 1
+            ids.append(f"{note_id}-{digest}-{repeat}")
             
             # Metadata rica para mejores búsquedas
-            metadata = {
+            metadatas.append({
                 "note_id": note_id,
                 "title": title,
                 "category": category,
@@ -706,22 +698,81 @@ class VectorIndex:
                 "chunk_type": chunk_type,
                 "created_at": created_at,  # AGREGAR FECHA DE CREACIÓN
                 **chunk_metadata  # Incluir metadata del chunk
-            }
-            metadatas.append(metadata)
-            
-            # Preparar documento con contexto
-            doc_text = text
-            if chunk_type != "title" and title:
-                doc_text = f"Título: {title}\n\n{text}"
-            
+            })
             documents.append(doc_text)
+        
+        return ids, documents, metadatas
+
+    def _chunk_ids(self, note_ids: List[int]) -> List[str]:
+        """Ids de los chunks guardados para estas notas"""
+        if len(note_ids) == 1:
+            where = {"note_id": note_ids[0]}
+        else:
+            where = {"note_id": {"$in": list(note_ids)}}
+        results = self.col.get(where=where, include=[])
+        return (results or {}).get("ids", []) or []
+
+    def _sync_chunks(self, note_ids: List[int], ids: List[str], documents: List[str],
+                     metadatas: List[Dict[str, Any]]) -> int:
+        """Deja exactamente estos chunks para las notas; solo se embeben los nuevos"""
+        existing = set(self._chunk_ids(note_ids))
+        
+        kept = [i for i, cid in enumerate(ids) if cid in existing]
+        if kept:
+            # Mismo texto: solo se actualiza la metadata, sin llamar a la API de embeddings
+            self.col.update(ids=[ids[i] for i in kept], metadatas=[metadatas[i] for i in kept])
+        
+        new = [i for i, cid in enumerate(ids) if cid not in existing]
+        for pos in range(0, len(new), self.INDEX_BATCH):
+            batch = new[pos:pos + self.INDEX_BATCH]
+            self.col.add(
+                documents=[documents[i] for i in batch],
+                metadatas=[metadatas[i] for i in batch],
+                ids=[ids[i] for i in batch],
+            )
+        
+        # Los chunks viejos se borran al final: si falla un lote, la nota conserva sus vectores
+        wanted = set(ids)
+        stale = [cid for cid in existing if cid not in wanted]
+        if stale:
+            self.col.delete(ids=stale)
+        return len(new)
+
+    def index_note(self, note_id: int, title: str, content: str, category: str = "", tags: List[str] = None, source: str = "manual") -> None:
+        """Indexa nota con chunking inteligente y metadata rica (re-embebe solo los chunks que cambiaron)"""
+        if not content.strip() and not title.strip():
+            return
+        
+        ids, documents, metadatas = self._note_chunks(note_id, title, content, category, tags, source)
+        try:
+            added = self._sync_chunks([note_id], ids, documents, metadatas)
+            print(f"✅ Nota {note_id} indexada con {len(ids)} chunks ({added} nuevos)")
+        except Exception as e:
+            raise RuntimeError(f"Error indexando nota {note_id}: {e}")
 
-        if ids:
-            try:
-                self.col.add(documents=documents, metadatas=metadatas, ids=ids)
-                print(f"✅ Nota {note_id} indexada con {len(ids)} chunks")
-            except Exception as e:
-                raise RuntimeError(f"Error indexando nota {note_id}: {e}")
+    def index_notes(self, notes: Iterable[Note]) -> int:
+        """Indexa varias notas juntas: los chunks nuevos se embeben en lotes de INDEX_BATCH"""
+        note_ids: List[int] = []
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for note in notes:
+            if not note.content.strip() and not note.title.strip():
+                continue
+            note_ids.append(note.id)
+            n_ids, n_docs, n_metas = self._note_chunks(
+                note.id, note.title, note.content, note.category, note.tags, note.source
+            )
+            ids.extend(n_ids)
+            documents.extend(n_docs)
+            metadatas.extend(n_metas)
+        
+        if not note_ids:
+            return 0
+        try:
+            return self._sync_chunks(note_ids, ids, documents, metadatas)
+        except Exception as e:
+            raise RuntimeError(f"Error indexando {len(note_ids)} notas: {e}")
 
     def search(self, query: str, top_k: int = 5, filters: Dict[str, Any] = None) -> List[Dict]:
         """Búsqueda híbrida semántica + keyword con re-ranking adaptativo"""
@@ -754,8 +805,10 @@ class VectorIndex:
             # 1. BÚSQUEDA SEMÁNTICA DIRECTA (reducida)
             where_filter = filters or {}
             
+            # Reutiliza el embedding de la pregunta (mismo modelo que la colección)
+            query_embedding = self.ai.embed_question(query)
             res = self.col.query(
-                query_texts=[query],
+                query_embeddings=[query_embedding.tolist()],
                 n_results=min(top_k, 15),  # Reducir búsqueda inicial
                 include=["metadatas", "documents", "distances"],
                 where=where_filter if where_filter else None
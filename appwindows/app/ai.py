@@ -7,6 +7,35 @@ from .settings import Settings
 
 # Import OpenAI client from v1.x SDK. If not installed, runtime will throw.
 
+# Prompts de sistema: constantes construidas una sola vez al importar el módulo
+SYSTEM_CLASSIFY = (
+    "Eres un asistente que clasifica notas personales. "
+    "Devuelve un JSON con 'category' (una palabra o frase corta) y 'tags' (lista de 3-7 palabras). "
+    "No agregues nada más."
+)
+
+SYSTEM_SHORT = (
+    "Eres una secretaria IA que contesta SOLO usando el contexto proporcionado. "
+    "Responde en texto plano, sin formato especial. "
+    "Si la respuesta no está en el contexto, admite que no está y sugiere cómo capturar esa información."
+)
+
+SYSTEM_EXTENDED = (
+    "Eres una secretaria IA especializada en análisis profundo de información. "
+    "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. "
+    "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
+    "- Usa MAYÚSCULAS para títulos principales\n"
+    "- Usa números para secciones (1., 2., etc.)\n"
+    "- Usa guiones (-) para sublistas\n"
+    "- Usa saltos de línea dobles para separar secciones\n"
+    "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
+    "Estructura requerida:\n"
+    "ANÁLISIS INTEGRAL\n\n"
+    "1. RESUMEN EJECUTIVO\n\n"
+    "2. ANÁLISIS DETALLADO\n\n"
+    "3. PUNTOS CLAVE IDENTIFICADOS\n\n"
+)
+
 @dataclass
 class RetrievalResult:
     """Container for semantic search results."""
@@ -43,15 +72,10 @@ class AIService:
 
     def classify(self, content: str) -> Tuple[str, List[str]]:
         """Suggest a category and tags for the given content using the chat model."""
-        system = (
-            "Eres un asistente que clasifica notas personales. "
-            "Devuelve un JSON con 'category' (una palabra o frase corta) y 'tags' (lista de 3-7 palabras). "
-            "No agregues nada más."
-        )
         user = f"Contenido:\n{content}\n\nResponde solo con JSON."
         resp = self.client.chat.completions.create(
             model=self.settings.chat_model,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            messages=[{"role": "system", "content": SYSTEM_CLASSIFY}, {"role": "user", "content": user}],
             temperature=0.2,
         )
         txt = resp.choices[0].message.content.strip()
@@ -66,28 +90,10 @@ class AIService:
     def answer_with_context(self, question: str, contexts: List[Dict], extended_analysis: bool = False) -> str:
         """Use RAG to answer a question given context notes."""
         if extended_analysis:
-            system = (
-                "Eres una secretaria IA especializada en análisis profundo de información. "
-                "Proporciona análisis completos y detallados usando SOLO el contexto proporcionado. "
-                "IMPORTANTE: NO uses formato Markdown. Escribe texto plano con estructura clara:\n"
-                "- Usa MAYÚSCULAS para títulos principales\n"
-                "- Usa números para secciones (1., 2., etc.)\n"
-                "- Usa guiones (-) para sublistas\n"
-                "- Usa saltos de línea dobles para separar secciones\n"
-                "- Resalta puntos importantes con MAYÚSCULAS o repetición\n\n"
-                "Estructura requerida:\n"
-                "ANÁLISIS INTEGRAL\n\n"
-                "1. RESUMEN EJECUTIVO\n\n"
-                "2. ANÁLISIS DETALLADO\n\n"
-                "3. PUNTOS CLAVE IDENTIFICADOS\n\n"
-            )
+            system = SYSTEM_EXTENDED
             max_tokens = 2500
         else:
-            system = (
-                "Eres una secretaria IA que contesta SOLO usando el contexto proporcionado. "
-                "Responde en texto plano, sin formato especial. "
-                "Si la respuesta no está en el contexto, admite que no está y sugiere cómo capturar esa información."
-            )
+            system = SYSTEM_SHORT
             max_tokens = 1000
         
         ctx_text = "\n\n".join([f"Título: {c['title']}\nContenido:\n{c['content']}" for c in contexts])
@@ -1,7 +1,9 @@
+import math
 import queue
 import threading
 import time
 import os
+from collections import deque
 from typing import Optional, Callable, Dict, Any
 from datetime import datetime
 import numpy as np
@@ -21,27 +23,27 @@ class AudioQualityAnalyzer:
     """Analiza calidad de audio en tiempo real para Windows"""
     
     def __init__(self):
-        self.volume_history = []
+        self.volume_history = deque(maxlen=20)  # Últimos 20 chunks
         self.silence_threshold = 0.01
         self.noise_threshold = 0.8
     
     def analyze_chunk(self, audio_data: np.ndarray) -> Dict[str, Any]:
         """Analiza un chunk de audio y devuelve métricas básicas"""
-        if len(audio_data) == 0:
+        n = audio_data.size
+        if n == 0:
             return {"volume": 0, "quality": "silent"}
         
-        # Convertir a float si es necesario
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32) / 32768.0
-        
-        # Calcular volumen RMS
-        rms = np.sqrt(np.mean(audio_data ** 2))
+        # Calcular volumen RMS sin temporales float: suma de cuadrados en int64
+        if audio_data.dtype == np.int16:
+            a = audio_data.ravel().astype(np.int64, copy=False)
+            rms = math.sqrt(int(np.dot(a, a)) / n) / 32768.0
+        else:
+            a = audio_data.ravel()
+            if a.dtype != np.float32:
+                a = a.astype(np.float32) / 32768.0
+            rms = math.sqrt(float(np.dot(a, a)) / n)
         self.volume_history.append(rms)
         
-        # Mantener solo últimos 20 chunks
-        if len(self.volume_history) > 20:
-            self.volume_history.pop(0)
-        
         # Detectar calidad básica
         if rms < self.silence_threshold:
             quality = "silent"
@@ -62,7 +64,7 @@ class WindowsRecorder:
         self.samplerate = WINDOWS_AUDIO_CONFIG['samplerate']
         self.channels = WINDOWS_AUDIO_CONFIG['channels']
         self.blocksize = WINDOWS_AUDIO_CONFIG['blocksize']
-        self._q = queue.Queue()
+        self._q = queue.SimpleQueue()
         self._recording = False
         self._thread = None
         self._outfile = None
@@ -77,12 +79,8 @@ class WindowsRecorder:
         self._outfile = outfile
         self._recording = True
         
-        # Limpiar queue
-        while not self._q.empty():
-            try:
-                self._q.get_nowait()
-            except queue.Empty:
-                break
+        # Cola nueva en vez de vaciar la anterior elemento a elemento
+        self._q = queue.SimpleQueue()
         
         # Thread de escritura
         self._thread = threading.Thread(target=self._writer_thread, daemon=True)
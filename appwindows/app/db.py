@@ -1,11 +1,32 @@
 import os
 import sqlite3
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Tuple
-import pytz
+from typing import ContextManager, Iterator, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-@dataclass
+_CHILE_TZ = ZoneInfo('America/Santiago')
+# ISO 8601 (con o sin zona) -> epoch en ms, para migrar filas antiguas
+_ISO_TO_EPOCH_MS = "CAST(ROUND((julianday({}) - 2440587.5) * 86400000) AS INTEGER)"
+# Characters of content shown as list preview; longer content ends in "..."
+PREVIEW_CHARS = 100
+
+
+class NoteListRow(NamedTuple):
+    """Columns the notes list renders; ``preview`` comes truncated from SQL."""
+
+    id: int
+    title: str
+    preview: str
+    updated_at: str
+    source: str
+    audio_path: Optional[str]
+
+
+@dataclass(slots=True)
 class Note:
     """Representation of a note in the database."""
 
@@ -18,6 +39,10 @@ class Note:
     audio_path: Optional[str]
     created_at: str
     updated_at: str
+    # (updated_at, día, texto) formateado por la UI; se recalcula si cambia alguno
+    _display_date: Optional[Tuple[str, int, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 class NotesDB:
@@ -27,14 +52,47 @@ class NotesDB:
         self.db_path = db_path
         # Ensure directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Conexión de la transacción abierta con transaction() en cada hilo
+        self._local = threading.local()
+        self._trigram_available = False
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        # Con WAL basta sincronizar a disco en los checkpoints
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _txn(self) -> Iterator[sqlite3.Cursor]:
+        """Run several statements in one BEGIN IMMEDIATE transaction."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Dentro de transaction(): se suma a la transacción exterior, sin commit propio
+            yield conn.cursor()
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.conn = conn
+        try:
+            yield conn.cursor()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
+
+    def transaction(self) -> ContextManager[sqlite3.Cursor]:
+        """Group several writes (e.g. add_category + upsert_note) into one commit."""
+        return self._txn()
 
     def _init_db(self) -> None:
         """Initialize tables if they don't exist."""
         with self._connect() as conn:
+            # WAL es persistente en el archivo: lectores y escritor no se bloquean
+            conn.execute("PRAGMA journal_mode=WAL")
             cur = conn.cursor()
             cur.execute(
                 """
@@ -47,7 +105,9 @@ class NotesDB:
                     source TEXT NOT NULL,
                     audio_path TEXT,
                     created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
+                    updated_at TEXT NOT NULL,
+                    created_at_ts INTEGER,
+                    updated_at_ts INTEGER
                 );
                 """
             )
@@ -69,18 +129,89 @@ class NotesDB:
                 CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at);
                 """
             )
+            # julianday normaliza la zona horaria de las fechas ISO: rango exacto por índice
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_updated_jd ON notes(julianday(updated_at));
+                """
+            )
+            columns = {r[1] for r in cur.execute("PRAGMA table_info(notes)")}
+            if "updated_at_ts" not in columns:
+                # Migración: fechas como epoch en ms (las columnas ISO quedan para mostrar)
+                cur.execute("ALTER TABLE notes ADD COLUMN created_at_ts INTEGER")
+                cur.execute("ALTER TABLE notes ADD COLUMN updated_at_ts INTEGER")
+                cur.execute(
+                    "UPDATE notes SET created_at_ts = "
+                    + _ISO_TO_EPOCH_MS.format("created_at")
+                    + ", updated_at_ts = "
+                    + _ISO_TO_EPOCH_MS.format("updated_at")
+                )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_updated_ts ON notes(updated_at_ts DESC, id);
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_source_updated ON notes(source, updated_at_ts DESC);
+                """
+            )
+            self._trigram_available = self._init_trigram(cur)
             conn.commit()
 
+    def _init_trigram(self, cur: sqlite3.Cursor) -> bool:
+        """Create the trigram FTS5 index used for substring search (SQLite >= 3.34)."""
+        # remove_diacritics del tokenizador trigram existe desde SQLite 3.45
+        for tokenize in ("trigram remove_diacritics 1", "trigram"):
+            try:
+                cur.execute(
+                    f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS notes_trgm USING fts5(
+                        title, content,
+                        content='notes', content_rowid='id',
+                        tokenize='{tokenize}'
+                    );
+                    """
+                )
+                break
+            except sqlite3.OperationalError:
+                continue
+        else:
+            # SQLite sin FTS5 o sin trigram: search_notes usa LIKE
+            return False
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_trgm(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_trgm(notes_trgm, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            END;
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS notes_trgm_au AFTER UPDATE OF title, content ON notes BEGIN
+                INSERT INTO notes_trgm(notes_trgm, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO notes_trgm(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            """
+        )
+        if cur.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Migración: indexar las notas existentes
+            cur.execute("INSERT INTO notes_trgm(notes_trgm) VALUES ('rebuild')")
+            cur.execute("PRAGMA user_version = 1")
+        return True
+
     def add_category(self, name: str) -> None:
         """Insert a category if it does not exist."""
-        with self._connect() as conn:
-            cur = conn.cursor()
-            try:
-                cur.execute("INSERT INTO categories(name) VALUES (?)", (name,))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                # Category already exists
-                pass
+        with self._txn() as cur:
+            # Si la categoría ya existe no hace nada
+            cur.execute("INSERT OR IGNORE INTO categories(name) VALUES (?)", (name,))
 
     def list_categories(self) -> List[str]:
         with self._connect() as conn:
@@ -136,16 +267,16 @@ class NotesDB:
     def upsert_note(self, note: Note) -> int:
         """Insert or update a note and return its ID."""
         # Usar hora de Chile en lugar de UTC
-        chile_tz = pytz.timezone('America/Santiago')
-        now = datetime.now(chile_tz).isoformat()
+        now = datetime.now(_CHILE_TZ).isoformat()
+        now_ms = int(time.time() * 1000)
         
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._txn() as cur:
             if note.id is None:
                 cur.execute(
                     """
-                    INSERT INTO notes(title, content, category, tags, source, audio_path, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO notes(title, content, category, tags, source, audio_path,
+                                      created_at, updated_at, created_at_ts, updated_at_ts)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         note.title,
@@ -156,6 +287,8 @@ class NotesDB:
                         note.audio_path,
                         now,
                         now,
+                        now_ms,
+                        now_ms,
                     ),
                 )
                 note_id = cur.lastrowid
@@ -163,7 +296,8 @@ class NotesDB:
                 cur.execute(
                     """
                     UPDATE notes
-                    SET title=?, content=?, category=?, tags=?, source=?, audio_path=?, updated_at=?
+                    SET title=?, content=?, category=?, tags=?, source=?, audio_path=?,
+                        updated_at=?, updated_at_ts=?
                     WHERE id=?
                     """,
                     (
@@ -174,12 +308,12 @@ class NotesDB:
                         note.source,
                         note.audio_path,
                         now,
+                        now_ms,
                         note.id,
                     ),
                 )
                 note_id = note.id
-            conn.commit()
-            return int(note_id)
+        return int(note_id)
     def get_note(self, note_id: int) -> Optional[Note]:
         """Retrieve a note by its ID."""
         with self._connect() as conn:
@@ -210,25 +344,62 @@ class NotesDB:
             cur.execute("DELETE FROM notes WHERE id=?", (note_id,))
             conn.commit()
 
+    def _search_filter(
+        self,
+        query: str,
+        category: Optional[str],
+        tag: Optional[str],
+        source: Optional[str],
+        updated_since: Optional[float],
+        limit: Optional[int],
+    ) -> Tuple[str, Tuple]:
+        """WHERE/ORDER BY/LIMIT clause and parameters shared by the search queries."""
+        sql = " WHERE 1=1"
+        params: Tuple = ()
+        if self._trigram_available and len(query) >= 3:
+            # Subcadena literal (mismo resultado que LIKE '%query%') resuelta por índice
+            sql += " AND id IN (SELECT rowid FROM notes_trgm WHERE notes_trgm MATCH ?)"
+            params += ('"' + query.replace('"', '""') + '"',)
+        elif query:
+            sql += " AND (title LIKE ? OR content LIKE ?)"
+            params += (f"%{query}%", f"%{query}%")
+        if category:
+            sql += " AND category=?"
+            params += (category,)
+        if tag:
+            sql += " AND instr(tags, ?) > 0"
+            params += (tag,)
+        if source:
+            sql += " AND source=?"
+            params += (source,)
+        if updated_since is not None:
+            sql += " AND updated_at_ts > ?"
+            params += (int(updated_since * 1000),)
+        sql += " ORDER BY updated_at_ts DESC LIMIT ?"
+        params += (limit if limit is not None else -1,)
+        return sql, params
+
     def search_notes(
         self,
         query: str,
         category: Optional[str] = None,
         tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
     ) -> List[Note]:
-        """Keyword-based search for notes with optional filters."""
+        """Keyword-based search for notes with optional filters.
+
+        ``updated_since`` is an epoch timestamp in seconds; only notes updated
+        after it are returned.
+        """
+        where, params = self._search_filter(query, category, tag, source, updated_since, limit)
         with self._connect() as conn:
             cur = conn.cursor()
-            sql = "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes WHERE (title LIKE ? OR content LIKE ?)"
-            params: Tuple[str, ...] = (f"%{query}%", f"%{query}%")
-            if category:
-                sql += " AND category=?"
-                params += (category,)
-            if tag:
-                sql += " AND instr(tags, ?) > 0"
-                params += (tag,)
-            sql += " ORDER BY updated_at DESC"
-            cur.execute(sql, params)
+            cur.execute(
+                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes" + where,
+                params,
+            )
             rows = cur.fetchall()
             return [
                 Note(
@@ -245,12 +416,38 @@ class NotesDB:
                 for r in rows
             ]
 
+    def search_notes_preview(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        source: Optional[str] = None,
+        updated_since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[NoteListRow]:
+        """Same search as search_notes, reading only the columns the list shows."""
+        where, params = self._search_filter(query, category, tag, source, updated_since, limit)
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT id, title, substr(content, 1, {PREVIEW_CHARS}) || "
+                f"CASE WHEN length(content) > {PREVIEW_CHARS} THEN '...' ELSE '' END, "
+                "updated_at, source, audio_path FROM notes"
+                + where,
+                params,
+            )
+            return [NoteListRow(*r) for r in cur.fetchall()]
+
+    def list_notes_preview(self, limit: int = 100) -> List[NoteListRow]:
+        """List rows for the most recent notes up to a limit."""
+        return self.search_notes_preview("", limit=limit)
+
     def list_notes(self, limit: int = 100) -> List[Note]:
         """List most recent notes up to a limit."""
         with self._connect() as conn:
             cur = conn.cursor()
             cur.execute(
-                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes ORDER BY updated_at DESC LIMIT ?",
+                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes ORDER BY updated_at_ts DESC LIMIT ?",
                 (limit,),
             )
             rows = cur.fetchall()
@@ -267,4 +464,29 @@ class NotesDB:
                     updated_at=r[8],
                 )
                 for r in rows
-            ]
\ No newline at end of file
+            ]
+
+    def list_notes_since(self, iso_ts: str, limit: int = 100) -> List[Note]:
+        """List notes updated at or after an ISO timestamp, most recent first."""
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id, title, content, category, tags, source, audio_path, created_at, updated_at FROM notes "
+                "WHERE julianday(updated_at) >= julianday(?) ORDER BY julianday(updated_at) DESC LIMIT ?",
+                (iso_ts, limit),
+            )
+            rows = cur.fetchall()
+            return [
+                Note(
+                    id=r[0],
+                    title=r[1],
+                    content=r[2],
+                    category=r[3],
+                    tags=r[4].split(",") if r[4] else [],
+                    source=r[5],
+                    audio_path=r[6],
+                    created_at=r[7],
+                    updated_at=r[8],
+                )
+                for r in rows
+            ]
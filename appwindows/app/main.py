@@ -7,24 +7,29 @@ os.environ.setdefault("CHROMADB_DISABLE_TELEMETRY", "1")
 
 import re
 import sys
+import math
+import io
 import json
 import time
 import threading
-from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Optional, List, Dict, Any, Callable, Iterable, Set, Tuple
 from enum import Enum
 import speech_recognition as sr
 import queue
-import pytz
+from zoneinfo import ZoneInfo
 import platform
 import sys
 from concurrent.futures import ThreadPoolExecutor, Future
 from PySide6.QtCore import (
         Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve, 
-        QRect, QThread, Signal, QCoreApplication, QPoint
+        QRect, QThread, Signal, QCoreApplication, QPoint, QLineF,
+        QSaveFile, QIODevice, QSignalBlocker
     )
 from PySide6.QtGui import (
-        QAction, QIcon, QKeySequence, QPalette, QFont, QPixmap, 
+        QAction, QIcon, QKeySequence, QPalette, QFont, QFontMetrics, QPixmap, 
         QPainter, QBrush, QColor, QPen, QTextCursor
     )
 from PySide6.QtWidgets import (
@@ -35,54 +40,110 @@ from PySide6.QtWidgets import (
     QSplitter, QToolBar, QGroupBox, QProgressBar, QInputDialog, QSlider,
     QStatusBar, QGridLayout, QDialog, QScrollArea, QSizePolicy, QSpacerItem
 )
-import pygame
 import tempfile
 
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 from app.settings import Settings
-from app.db import NotesDB, Note
+from app.db import NotesDB, Note, NoteListRow
 from app.ai import AIService
 from app.vectorstore import VectorIndex
 
-import pyperclip
-
 APP_NAME = "SecreIA"
+CHILE_TZ = ZoneInfo('America/Santiago')
+UTC = timezone.utc
+MONTHS_ES = (
+    'ene', 'feb', 'mar', 'abr', 'may', 'jun',
+    'jul', 'ago', 'sep', 'oct', 'nov', 'dic'
+)
 
-def format_date_chile(date_str: str) -> str:
-    """Formatea fecha para Windows con información local"""
+
+@lru_cache(maxsize=4096)
+def _format_date_chile_cached(date_str: str, today_ordinal: int) -> str:
+    """Formato de fecha memoizado por (fecha, día actual)"""
+    if not date_str:
+        return ""
     try:
-        # Parsear la fecha
-        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        # Parsear la fecha ('Z' final solo la acepta fromisoformat desde 3.11)
+        if date_str[-1] == 'Z':
+            dt = datetime.fromisoformat(date_str[:-1] + '+00:00')
+        else:
+            dt = datetime.fromisoformat(date_str)
         
         # Si no tiene zona horaria, asumir que es local
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.replace(tzinfo=UTC)
         
         # Convertir a hora local del sistema
         dt_local = dt.astimezone()
-        now_local = datetime.now().astimezone()
-        diff = now_local - dt_local
+        days = today_ordinal - dt_local.toordinal()
         
-        # Mapeo de meses en español
-        months_es = [
-            'ene', 'feb', 'mar', 'abr', 'may', 'jun',
-            'jul', 'ago', 'sep', 'oct', 'nov', 'dic'
-        ]
-        
-        if diff.days == 0:
+        if days == 0:
             return f"Hoy {dt_local.strftime('%H:%M')}"
-        elif diff.days == 1:
+        elif days == 1:
             return f"Ayer {dt_local.strftime('%H:%M')}"
-        elif diff.days <= 7:
+        elif days <= 7:
             return f"{dt_local.day:02d}/{dt_local.month:02d} {dt_local.strftime('%H:%M')}"
-        elif dt_local.year == now_local.year:
-            month_short = months_es[dt_local.month - 1]
+        elif dt_local.year == date.fromordinal(today_ordinal).year:
+            month_short = MONTHS_ES[dt_local.month - 1]
             return f"{dt_local.day} {month_short} {dt_local.strftime('%H:%M')}"
         else:
             return f"{dt_local.day:02d}/{dt_local.month:02d}/{dt_local.year}"
             
-    except:
-        return date_str[:10] if date_str else ""
+    except (ValueError, TypeError, OverflowError, OSError):
+        # OSError: astimezone() local en Windows con fechas fuera de rango
+        return date_str[:10]
+
+
+def format_date_chile(date_str: str, today_ordinal: Optional[int] = None) -> str:
+    """Formatea fecha para Windows con información local"""
+    # El día actual forma parte de la clave: "Hoy"/"Ayer" se recalculan al cambiar de día
+    if today_ordinal is None:
+        today_ordinal = datetime.now().astimezone().toordinal()
+    return _format_date_chile_cached(date_str, today_ordinal)
+
+
+def note_display_date(note: Note, today_ordinal: Optional[int] = None) -> str:
+    """Fecha de actualización de la nota ya formateada, guardada en la propia nota"""
+    if today_ordinal is None:
+        today_ordinal = datetime.now().astimezone().toordinal()
+    updated_at = note.updated_at or ""
+    cached = getattr(note, "_display_date", None)
+    if cached is not None and cached[0] == updated_at and cached[1] == today_ordinal:
+        return cached[2]
+    text = _format_date_chile_cached(updated_at, today_ordinal) if updated_at else ""
+    try:
+        note._display_date = (updated_at, today_ordinal, text)
+    except AttributeError:
+        pass
+    return text
+
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def first_words(parts: Iterable[str], n: int = 6) -> Tuple[List[str], bool]:
+    """Primeras n palabras de uno o varios textos y si hay más (se detiene en la palabra n+1)"""
+    matches = chain.from_iterable(_WORD_RE.finditer(part) for part in parts)
+    words = [m.group() for m in islice(matches, n + 1)]
+    return words[:n], len(words) > n
+
+
+def title_from_content(content: str, max_words: int = 6) -> str:
+    """Primeras palabras del contenido como título ('...' si hay más); no recorre todo el texto"""
+    words, more = first_words((content,), max_words)
+    title = " ".join(words)
+    if more:
+        title += "..."
+    return title
+
+
 class AppState(Enum):
     FIRST_RUN = "first_run"
     SETUP = "setup" 
@@ -114,6 +175,15 @@ class WindowsColors:
     SEPARATOR = QColor(225, 223, 221)        
     SEPARATOR_LIGHT = QColor(237, 235, 233)
 
+# Hex "#rrggbb" de cada color (X_HEX), para no llamar a .name() en cada hoja de estilo
+for _name, _color in list(vars(WindowsColors).items()):
+    if isinstance(_color, QColor):
+        setattr(WindowsColors, f"{_name}_HEX", _color.name())
+del _name, _color
+WindowsColors.BLUE_LIGHT_HEX = WindowsColors.BLUE.lighter(110).name()  # hover
+WindowsColors.GREEN_DARK_HEX = WindowsColors.GREEN.darker(110).name()  # hover
+WindowsColors.RED_DARK_HEX = WindowsColors.RED.darker(110).name()  # hover
+
 if platform.system() == "Windows":
     AppColors = WindowsColors
 
@@ -141,6 +211,18 @@ class LoadingSpinner(QWidget):
         self.angle = 0
         self.setFixedSize(size, size)
         
+        # Lápices y segmentos fijos: se crean una vez, no en cada frame
+        base = WindowsColors.SECONDARY
+        self._pens = tuple(
+            QPen(QColor(base.red(), base.green(), base.blue(), 255 - i * 30), 2)
+            for i in range(8)
+        )
+        inner, outer = size / 3, size / 2.5
+        self._lines = tuple(
+            QLineF(inner * math.sin(a), -inner * math.cos(a), outer * math.sin(a), -outer * math.cos(a))
+            for a in (math.radians(45 * i) for i in range(8))
+        )
+        
         self.timer = QTimer()
         self.timer.timeout.connect(self.rotate)
         
@@ -163,57 +245,105 @@ class LoadingSpinner(QWidget):
         painter.translate(self.size/2, self.size/2)
         painter.rotate(self.angle)
         
-        for i in range(8):
-            alpha = 255 - (i * 30)
-            painter.setPen(QPen(QColor(WindowsColors.SECONDARY.red(), 
-                                     WindowsColors.SECONDARY.green(), 
-                                     WindowsColors.SECONDARY.blue(), alpha), 2))
-            painter.drawLine(0, -self.size/3, 0, -self.size/2.5)
-            painter.rotate(45)
+        for pen, line in zip(self._pens, self._lines):
+            painter.setPen(pen)
+            painter.drawLine(line)
 
 class StatusBadge(QLabel):
     """Badge de estado estilo Apple"""
+    # Hojas de estilo armadas una sola vez (setStyleSheet re-parsea el CSS)
+    _SHEETS = {
+        status: f"QLabel {{ background-color: {color}; border-radius: 4px; }}"
+        for status, color in (
+            ("saved", "transparent"),
+            ("saving", WindowsColors.ORANGE_HEX),
+            ("unsaved", WindowsColors.RED_HEX),
+            ("syncing", WindowsColors.BLUE_HEX),
+        )
+    }
+    
     def __init__(self):
         super().__init__()
         self.setFixedSize(8, 8)
+        self._status = None
         self.set_status("saved")
     
     def set_status(self, status: str):
-        colors = {
-            "saved": "transparent",
-            "saving": WindowsColors.ORANGE.name(),
-            "unsaved": WindowsColors.RED.name(),
-            "syncing": WindowsColors.BLUE.name()
-        }
-        
-        self.setStyleSheet(f"""
-            QLabel {{
-                background-color: {colors.get(status, 'transparent')};
-                border-radius: 4px;
-            }}
-        """)
+        if status not in self._SHEETS:
+            status = "saved"
+        if status == self._status:
+            return
+        self._status = status
+        self.setStyleSheet(self._SHEETS[status])
 
 
 class SummaryTab(QWidget):
     """Tab de Resumen IA con síntesis de voz - NUEVO"""
     
+    # Estilos del botón de audio, armados una sola vez
+    _PLAY_SHEET = f"""
+            QPushButton {{
+                background-color: {WindowsColors.CARD_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-family: '.AppleSystemUIFont';
+                font-size: 14px;
+                font-weight: 500;
+            }}
+            QPushButton:hover {{
+                background-color: {WindowsColors.ELEVATED_HEX};
+            }}
+        """
+    _STOP_SHEET = f"""
+            QPushButton {{
+                background-color: {WindowsColors.RED_HEX};
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-family: '.AppleSystemUIFont';
+                font-size: 14px;
+                font-weight: 500;
+            }}
+            QPushButton:hover {{
+                background-color: {WindowsColors.RED_DARK_HEX};
+            }}
+        """
+    
+    # Resultado de la llamada a OpenAI, emitido desde el hilo del executor
+    summary_ready = Signal(str)
+    summary_failed = Signal(str)
+    
     def __init__(self, settings: Settings, db: NotesDB, ai: AIService):
         super().__init__()
         self.settings = settings
         self.db = db
         self.ai = ai
-        self.audio_file = None
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self.summary_ready.connect(self._on_summary_ready)
+        self.summary_failed.connect(self._on_summary_failed)
+        # MP3 fijo: se sobrescribe en cada síntesis en vez de crear temporales
+        self.audio_file = os.path.join(tempfile.gettempdir(), f"secreia_summary_{os.getpid()}.mp3")
         self.audio_playing = False
-        self.audio_thread = None
+        # Fin de reproducción: sondeo liviano en el hilo de Qt, sin hilo propio
+        self._audio_monitor = QTimer(self)
+        self._audio_monitor.setInterval(200)
+        self._audio_monitor.timeout.connect(self._monitor_audio)
+        self._pygame = None  # se importa al primer uso: cargar SDL es lento
         self._setup_ui()
-        self._init_audio()
     
     def _init_audio(self):
-        """Inicializa pygame para audio"""
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            print(f"Error inicializando audio: {e}")
+        """Importa e inicializa pygame para audio la primera vez"""
+        if self._pygame is None:
+            import pygame
+            try:
+                pygame.mixer.init()
+            except Exception as e:
+                print(f"Error inicializando audio: {e}")
+            self._pygame = pygame
+        return self._pygame
     
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -224,7 +354,7 @@ class SummaryTab(QWidget):
         header = QLabel("Resumen IA")
         header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 32px;
                 font-weight: 300;
@@ -237,7 +367,7 @@ class SummaryTab(QWidget):
         description = QLabel("Genera un resumen inteligente de tus notas de los últimos 3 días con síntesis de voz")
         description.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
             }}
@@ -268,7 +398,7 @@ class SummaryTab(QWidget):
         self.progress_label = QLabel("Analizando notas...")
         self.progress_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
             }}
@@ -289,7 +419,7 @@ class SummaryTab(QWidget):
         summary_header = QLabel("Resumen generado")
         summary_header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -302,8 +432,8 @@ class SummaryTab(QWidget):
         self.summary_text.setPlaceholderText("El resumen aparecerá aquí...")
         self.summary_text.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {WindowsColors.NOTES_LIST.name()};
-                color: {WindowsColors.PRIMARY.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
                 border: none;
                 border-radius: 12px;
                 padding: 20px;
@@ -351,33 +481,14 @@ class SummaryTab(QWidget):
         """Ejecuta la generación real del resumen"""
         try:
             # Calcular fecha límite (últimos 3 días)
-            chile_tz = pytz.timezone('America/Santiago')
-            now = datetime.now(chile_tz)
-            three_days_ago = now - timedelta(days=3)
+            three_days_ago = datetime.now(CHILE_TZ) - timedelta(days=3)
             
             self._update_progress("Obteniendo notas recientes...")
             
-            # Obtener todas las notas y filtrar por fecha
-            all_notes = self.db.list_notes(limit=10000)
-            recent_notes = []
-            
-            for note in all_notes:
-                try:
-                    # Parsear fecha de actualización
-                    updated_at = note.updated_at.replace('Z', '+00:00')
-                    note_date = datetime.fromisoformat(updated_at)
-                    
-                    # Si no tiene timezone, asumir UTC y convertir a Chile
-                    if note_date.tzinfo is None:
-                        note_date = note_date.replace(tzinfo=pytz.UTC)
-                    
-                    note_date_chile = note_date.astimezone(chile_tz)
-                    
-                    if note_date_chile >= three_days_ago:
-                        recent_notes.append(note)
-                except Exception:
-                    # En caso de error parseando fecha, incluir la nota
-                    recent_notes.append(note)
+            # Filtrar por fecha en SQLite (fechas sin zona se interpretan como UTC)
+            recent_notes = self.db.list_notes_since(
+                three_days_ago.astimezone(UTC).isoformat(), limit=10000
+            )
             
             if not recent_notes:
                 self._hide_progress()
@@ -387,12 +498,20 @@ class SummaryTab(QWidget):
             self._update_progress(f"Analizando {len(recent_notes)} notas...")
             
             # Preparar contenido para el resumen
+            # Piezas en una lista y un solo join; se corta al pasar el límite
             content_parts = []
-            for i, note in enumerate(recent_notes[:20]):  # Limitar a 20 notas más recientes
-                date_str = format_date_chile(note.updated_at)
-                content_parts.append(f"=== {note.title} ({date_str}) ===\n{note.content}\n")
-            
-            combined_content = "\n".join(content_parts)
+            total = 0
+            today_ordinal = datetime.now().astimezone().toordinal()
+            for note in islice(recent_notes, 20):  # Limitar a 20 notas más recientes
+                if total > 15000:
+                    break
+                date_str = note_display_date(note, today_ordinal)
+                if content_parts:
+                    content_parts.append("\n")
+                content_parts.extend(("=== ", note.title, " (", date_str, ") ===\n", note.content, "\n"))
+                total += len(note.title) + len(date_str) + len(note.content) + 14
+            
+            combined_content = "".join(content_parts)
             
             # Truncar si es muy largo (límite de tokens)
             if len(combined_content) > 15000:
@@ -415,32 +534,47 @@ class SummaryTab(QWidget):
             
             user_prompt = f"Analiza y resume las siguientes notas de los últimos 3 días:\n\n{combined_content}"
             
-            # Generar resumen con OpenAI
-            response = self.ai.client.chat.completions.create(
-                model=self.ai.settings.chat_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            
-            # Mostrar resumen
-            self._hide_progress()
-            self.summary_text.setPlainText(summary)
-            self.btn_copy_summary.setEnabled(True)
-            
-            # Generar audio
-            self._generate_audio(summary)
+            # Generar resumen con OpenAI fuera del hilo de Qt
+            future: Future = self._executor.submit(self._call_openai, system_prompt, user_prompt)
+            def _on_done(fut: Future):
+                try:
+                    self.summary_ready.emit(fut.result())
+                except Exception as e:
+                    self.summary_failed.emit(str(e))
+
+            future.add_done_callback(_on_done)
             
         except Exception as e:
-            self._hide_progress()
-            error_msg = f"Error generando resumen: {str(e)}"
-            self.summary_text.setPlainText(error_msg)
-            QMessageBox.critical(self, "Error", error_msg)
+            self._on_summary_failed(str(e))
+    
+    def _call_openai(self, system_prompt: str, user_prompt: str) -> str:
+        """Llamada bloqueante a OpenAI (corre en el executor)"""
+        response = self.ai.client.chat.completions.create(
+            model=self.ai.settings.chat_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=1500
+        )
+        return response.choices[0].message.content.strip()
+    
+    def _on_summary_ready(self, summary: str):
+        """Muestra el resumen y genera el audio (hilo de Qt)"""
+        self._hide_progress()
+        self.summary_text.setPlainText(summary)
+        self.btn_copy_summary.setEnabled(True)
+        
+        # Generar audio
+        self._generate_audio(summary)
+    
+    def _on_summary_failed(self, error: str):
+        """Muestra el error de generación (hilo de Qt)"""
+        self._hide_progress()
+        error_msg = f"Error generando resumen: {error}"
+        self.summary_text.setPlainText(error_msg)
+        QMessageBox.critical(self, "Error", error_msg)
     
     def _generate_audio(self, text: str):
         """Genera audio del resumen usando OpenAI TTS"""
@@ -477,16 +611,16 @@ class SummaryTab(QWidget):
             if not self._audio_generation_active:
                 return
             
-            # Guardar audio temporal
-            if hasattr(self, 'audio_file') and self.audio_file:
+            # Guardar audio: soltar el archivo en pygame antes de sobrescribirlo
+            if self.audio_playing:
+                self._stop_audio()
+            if self._pygame is not None:
                 try:
-                    os.remove(self.audio_file)
-                except:
+                    self._pygame.mixer.music.unload()
+                except Exception:
                     pass
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as f:
+            with open(self.audio_file, 'wb') as f:
                 f.write(response.content)
-                self.audio_file = f.name
             
             if self._audio_generation_active:
                 self._hide_progress()
@@ -521,30 +655,16 @@ class SummaryTab(QWidget):
     def _play_audio(self):
         """Reproduce el audio"""
         try:
+            pygame = self._init_audio()
             pygame.mixer.music.load(self.audio_file)
             pygame.mixer.music.play()
             
             self.audio_playing = True
             self.btn_play_audio.setText("⏹️ Detener Audio")
-            self.btn_play_audio.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {WindowsColors.RED.name()};
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.RED.darker(110).name()};
-                }}
-            """)
+            self.btn_play_audio.setStyleSheet(self._STOP_SHEET)
             
-            # Iniciar hilo para monitorear finalización
-            self.audio_thread = threading.Thread(target=self._monitor_audio, daemon=True)
-            self.audio_thread.start()
+            # Monitorear finalización
+            self._audio_monitor.start()
             
         except Exception as e:
             QMessageBox.warning(self, "Error de audio", f"No se pudo reproducir: {e}")
@@ -552,7 +672,8 @@ class SummaryTab(QWidget):
     def _stop_audio(self):
         """Detiene la reproducción"""
         try:
-            pygame.mixer.music.stop()
+            if self._pygame is not None:
+                self._pygame.mixer.music.stop()
             self._reset_audio_button()
         except Exception as e:
             print(f"Error deteniendo audio: {e}")
@@ -560,46 +681,28 @@ class SummaryTab(QWidget):
     def _monitor_audio(self):
         """Monitorea cuando termina el audio"""
         try:
-            while pygame.mixer.music.get_busy() and self.audio_playing:
-                threading.Event().wait(0.1)
-            
-            if self.audio_playing:  # Si terminó naturalmente
-                QTimer.singleShot(0, self._reset_audio_button)
+            if not self.audio_playing or self._pygame is None:
+                self._audio_monitor.stop()
+            elif not self._pygame.mixer.music.get_busy():  # Si terminó naturalmente
+                self._audio_monitor.stop()
+                self._reset_audio_button()
                 
         except Exception as e:
+            self._audio_monitor.stop()
             print(f"Error monitoreando audio: {e}")
     
     def _reset_audio_button(self):
         """Resetea el botón de audio"""
         self.audio_playing = False
         self.btn_play_audio.setText("🔊 Reproducir Audio")
-        self.btn_play_audio.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {WindowsColors.CARD.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-family: '.AppleSystemUIFont';
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QPushButton:hover {{
-                background-color: {WindowsColors.ELEVATED.name()};
-            }}
-        """)
+        self.btn_play_audio.setStyleSheet(self._PLAY_SHEET)
     
     def _copy_summary(self):
         """Copia el resumen al portapapeles"""
         text = self.summary_text.toPlainText().strip()
         if text:
-            try:
-                pyperclip.copy(text)
-                QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
-            except:
-                clipboard = QApplication.clipboard()
-                clipboard.setText(text)
-                QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
+            QApplication.clipboard().setText(text)
+            QMessageBox.information(self, "Copiado", "Resumen copiado al portapapeles")
     
     def _show_progress(self, message: str):
         """Muestra indicador de progreso"""
@@ -630,11 +733,14 @@ class SummaryTab(QWidget):
             if hasattr(self, 'audio_playing') and self.audio_playing:
                 self._stop_audio()
             
-            if hasattr(self, 'audio_file') and self.audio_file and os.path.exists(self.audio_file):
-                try:
-                    os.remove(self.audio_file)
-                except:
-                    pass
+            try:
+                if self._pygame is not None:
+                    self._pygame.mixer.music.unload()
+                os.remove(self.audio_file)
+            except Exception:
+                pass
+            
+            self._executor.shutdown(wait=False)
         except Exception as e:
             print(f"Error limpiando SummaryTab: {e}")
         finally:
@@ -645,6 +751,8 @@ class AdvancedSearchBar(QWidget):
     """Barra de búsqueda simple"""
     search_triggered = Signal(str)
     
+    SEARCH_DELAY = 0.3  # segundos sin teclear antes de buscar
+
     def __init__(self, db: NotesDB):
         super().__init__()
         self.db = db
@@ -659,17 +767,17 @@ class AdvancedSearchBar(QWidget):
         self.search_edit.setPlaceholderText("🔍 Buscar en notas...")
         self.search_edit.setStyleSheet(f"""
             QLineEdit {{
-                background-color: {WindowsColors.CARD.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                background-color: {WindowsColors.CARD_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 10px;
                 padding: 12px 16px;
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
-                selection-background-color: {WindowsColors.BLUE.name()};
+                selection-background-color: {WindowsColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
+                border: 2px solid {WindowsColors.BLUE_HEX};
                 padding: 11px 15px;
             }}
         """)
@@ -678,14 +786,14 @@ class AdvancedSearchBar(QWidget):
         self.clear_btn.setFixedSize(30, 30)
         self.clear_btn.setStyleSheet(f"""
             QPushButton {{
-                background-color: {WindowsColors.CARD.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                background-color: {WindowsColors.CARD_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 15px;
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 12px;
             }}
             QPushButton:hover {{
-                background-color: {WindowsColors.ELEVATED.name()};
+                background-color: {WindowsColors.ELEVATED_HEX};
             }}
         """)
         self.clear_btn.clicked.connect(self._clear_search)
@@ -696,17 +804,29 @@ class AdvancedSearchBar(QWidget):
         # Conectar eventos
         self.search_edit.textChanged.connect(self._emit_search)
         
-        # Timer para búsqueda en tiempo real
+        # Timer para búsqueda en tiempo real: se arma una vez por ráfaga de
+        # teclas; cada tecla solo mueve el plazo (sin reiniciar el QTimer)
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self._do_search)
+        self._search_deadline = 0.0
+        self._search_pending = False
         
     def _emit_search(self):
         """Inicia búsqueda con delay"""
-        self.search_timer.start(300)
+        self._search_deadline = time.monotonic() + self.SEARCH_DELAY
+        if not self._search_pending:
+            self._search_pending = True
+            self.search_timer.start(int(self.SEARCH_DELAY * 1000))
     
     def _do_search(self):
         """Ejecuta la búsqueda"""
+        remaining = self._search_deadline - time.monotonic()
+        if remaining > 0:
+            # Hubo teclas después de armar el timer: esperar lo que falta
+            self.search_timer.start(max(1, int(remaining * 1000)))
+            return
+        self._search_pending = False
         query = self.search_edit.text().strip()
         self.search_triggered.emit(query)
     
@@ -717,8 +837,22 @@ class AdvancedSearchBar(QWidget):
 class AudioQualityWidget(QWidget):
     """Widget para mostrar calidad de audio en tiempo real"""
     
+    # Una hoja por estado, armadas una vez; solo se aplican cuando el estado cambia
+    _QUALITY_SHEETS = {
+        quality: f"QLabel {{ color: {color}; font-size: 12px; }}"
+        for quality, color in (
+            ("good", WindowsColors.GREEN_HEX),
+            ("low", WindowsColors.ORANGE_HEX),
+            ("silent", WindowsColors.TERTIARY_HEX),
+            ("clipping", WindowsColors.RED_HEX),
+            (None, WindowsColors.SECONDARY_HEX),
+        )
+    }
+    
     def __init__(self):
         super().__init__()
+        self._quality = None
+        self._volume = None
         self._setup_ui()
         
     def _setup_ui(self):
@@ -731,24 +865,19 @@ class AudioQualityWidget(QWidget):
         self.volume_bar.setFixedHeight(20)
         self.volume_bar.setStyleSheet(f"""
             QProgressBar {{
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 10px;
-                background-color: {WindowsColors.CARD.name()};
+                background-color: {WindowsColors.CARD_HEX};
             }}
             QProgressBar::chunk {{
-                background-color: {WindowsColors.GREEN.name()};
+                background-color: {WindowsColors.GREEN_HEX};
                 border-radius: 8px;
             }}
         """)
         
         # Etiqueta de calidad
         self.quality_label = QLabel("Sin audio")
-        self.quality_label.setStyleSheet(f"""
-            QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
-                font-size: 12px;
-            }}
-        """)
+        self.quality_label.setStyleSheet(self._QUALITY_SHEETS[None])
         
         layout.addWidget(QLabel("Volumen:"))
         layout.addWidget(self.volume_bar, 1)
@@ -756,186 +885,267 @@ class AudioQualityWidget(QWidget):
     
     def update_quality(self, volume: float, quality: str):
         """Actualiza indicadores de calidad"""
-        self.volume_bar.setValue(int(volume * 100))
-        
-        color_map = {
-            "good": WindowsColors.GREEN.name(),
-            "low": WindowsColors.ORANGE.name(),
-            "silent": WindowsColors.TERTIARY.name(),
-            "clipping": WindowsColors.RED.name()
-        }
-        
-        color = color_map.get(quality, WindowsColors.SECONDARY.name())
+        # En silencio el valor se repite cuadro tras cuadro: no tocar la barra
+        value = int(volume * 100)
+        if value != self._volume:
+            self._volume = value
+            self.volume_bar.setValue(value)
+        
+        # Por cuadro de audio solo cambia el volumen: no re-parsear CSS si el estado sigue igual
+        if quality == self._quality:
+            return
+        self._quality = quality
         self.quality_label.setText(quality.capitalize())
-        self.quality_label.setStyleSheet(f"QLabel {{ color: {color}; font-size: 12px; }}")
+        self.quality_label.setStyleSheet(self._QUALITY_SHEETS.get(quality, self._QUALITY_SHEETS[None]))
 
 class NotesExportManager:
     """Maneja exportación de notas"""
     
+    WRITE_BUFFER = 1 << 20  # 1 MiB: pocas llamadas al sistema en exportaciones grandes
+    
     def __init__(self, db: NotesDB):
         self.db = db
     
+    MARKDOWN_HEADER = (
+        "# {title}\n\n"
+        "**Categoría:** {category}\n"
+        "**Fecha:** {date}\n"
+        "**Fuente:** {source}\n"
+        "{tags}"
+        "\n---\n\n"
+    )
+    
+    def _markdown_header(self, note: Note) -> str:
+        tags = f"**Tags:** {', '.join(note.tags)}\n" if note.tags else ""
+        return self.MARKDOWN_HEADER.format(title=note.title, category=note.category,
+                                           date=note.updated_at[:19], source=note.source, tags=tags)
+    
+    def export_note_markdown_to(self, fp, note: Note):
+        """Escribe la nota en Markdown directamente en un archivo de texto"""
+        fp.write(self._markdown_header(note))
+        fp.write(note.content)
+    
     def export_note_markdown(self, note: Note) -> str:
         """Exporta nota a Markdown"""
-        content = f"# {note.title}\n\n"
-        content += f"**Categoría:** {note.category}\n"
-        content += f"**Fecha:** {note.updated_at[:19]}\n"
-        content += f"**Fuente:** {note.source}\n"
-        
-        if note.tags:
-            content += f"**Tags:** {', '.join(note.tags)}\n"
-        
-        content += "\n---\n\n"
-        content += note.content
-        
-        return content
+        return self._markdown_header(note) + note.content
+    
+    @staticmethod
+    def _note_dict(note: Note) -> Dict[str, Any]:
+        return {
+            "id": note.id,
+            "title": note.title,
+            "content": note.content,
+            "category": note.category,
+            "tags": note.tags,
+            "source": note.source,
+            "audio_path": note.audio_path,
+            "created_at": note.created_at,
+            "updated_at": note.updated_at
+        }
+    
+    def _dump_note_item(self, note: Note) -> bytes:
+        """Un elemento del arreglo JSON con la misma sangría que el volcado completo"""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(note, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self._note_dict(note), indent=2, ensure_ascii=False).encode("utf-8")
+        # Los saltos de línea dentro de los textos van escapados: solo hay que correr la sangría
+        return b"  " + data.replace(b"\n", b"\n  ")
+    
+    def export_notes_json_stream(self, fp, notes: Iterable[Note]):
+        """Escribe el arreglo JSON nota por nota: memoria constante aunque sean miles"""
+        first = True
+        for note in notes:
+            fp.write(b"[\n" if first else b",\n")
+            fp.write(self._dump_note_item(note))
+            first = False
+        fp.write(b"[]" if first else b"\n]")
+    
+    def export_notes_json_to(self, path: str, notes: Iterable[Note]):
+        """Escribe las notas en JSON con QSaveFile (temporal + rename: nunca queda un archivo a medias)"""
+        out = QSaveFile(path)
+        if not out.open(QIODevice.WriteOnly):
+            raise RuntimeError(f"No se pudo abrir {path}: {out.errorString()}")
+        self.export_notes_json_stream(out, notes)
+        if not out.commit():
+            raise RuntimeError(f"No se pudo guardar {path}: {out.errorString()}")
     
     def export_notes_json(self, notes: List[Note]) -> str:
         """Exporta notas a JSON"""
-        notes_data = []
-        for note in notes:
-            notes_data.append({
-                "id": note.id,
-                "title": note.title,
-                "content": note.content,
-                "category": note.category,
-                "tags": note.tags,
-                "source": note.source,
-                "audio_path": note.audio_path,
-                "created_at": note.created_at,
-                "updated_at": note.updated_at
-            })
-        
-        return json.dumps(notes_data, indent=2, ensure_ascii=False)
+        buf = io.BytesIO()
+        self.export_notes_json_stream(buf, notes)
+        return buf.getvalue().decode("utf-8")
+
+# Hoja de estilo global: se parsea una sola vez en main() en lugar de un
+# setStyleSheet por cada botón/campo (cada llamada re-parsea y re-pule el widget)
+APP_QSS = f"""
+    QToolTip {{
+        background-color: {WindowsColors.ELEVATED_HEX};
+        color: {WindowsColors.PRIMARY_HEX};
+        border: 1px solid {WindowsColors.SEPARATOR_HEX};
+        padding: 8px 12px;
+        border-radius: 8px;
+        font-family: 'Segoe UI';
+        font-size: 12px;
+    }}
+    QPushButton[variant="primary"] {{
+        background-color: {WindowsColors.BLUE_HEX};
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="primary"]:hover {{
+        background-color: {WindowsColors.BLUE_LIGHT_HEX};
+    }}
+    QPushButton[variant="primary"]:disabled {{
+        background-color: {WindowsColors.TERTIARY_HEX};
+    }}
+    QPushButton[variant="secondary"] {{
+        background-color: {WindowsColors.CARD_HEX};
+        color: {WindowsColors.PRIMARY_HEX};
+        border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="secondary"]:hover {{
+        background-color: {WindowsColors.ELEVATED_HEX};
+    }}
+    QPushButton[variant="ghost"] {{
+        background-color: transparent;
+        color: {WindowsColors.BLUE_HEX};
+        border: none;
+        padding: 8px 16px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="ghost"]:hover {{
+        background-color: {WindowsColors.CARD_HEX};
+        border-radius: 6px;
+    }}
+    QPushButton[variant="success"] {{
+        background-color: #65AB65;
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="success"]:hover {{
+        background-color: {WindowsColors.GREEN_DARK_HEX};
+    }}
+    QPushButton[variant="success"]:disabled {{
+        background-color: {WindowsColors.TERTIARY_HEX};
+    }}
+    QPushButton[variant="danger"] {{
+        background-color: transparent;
+        color: {WindowsColors.RED_HEX};
+        border: 1px solid {WindowsColors.RED_HEX};
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton[variant="danger"]:hover {{
+        background-color: {WindowsColors.RED_HEX};
+        color: white;
+    }}
+    QLineEdit[variant="apple"] {{
+        background-color: {WindowsColors.CARD_HEX};
+        color: {WindowsColors.PRIMARY_HEX};
+        border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
+        border-radius: 8px;
+        padding: 12px 16px;
+        font-family: '.AppleSystemUIFont';
+        font-size: 14px;
+        selection-background-color: {WindowsColors.BLUE_HEX};
+    }}
+    QLineEdit[variant="apple"]:focus {{
+        border: 2px solid {WindowsColors.BLUE_HEX};
+        padding: 11px 15px;
+    }}
+"""
+
+# Hojas que siguen siendo por widget (estados, menús): una sola copia por clave
+_QSS_CACHE: Dict[Tuple[str, str], str] = {}
+
+
+def cached_qss(kind: str, state: str, build: Callable[[], str]) -> str:
+    """Devuelve la hoja de estilo (kind, state), formateándola solo la primera vez"""
+    sheet = _QSS_CACHE.get((kind, state))
+    if sheet is None:
+        sheet = _QSS_CACHE[(kind, state)] = build()
+    return sheet
+
 
 class AppleButton(QPushButton):
-    """Botón estilo Apple"""
+    """Botón estilo Apple (estilo en APP_QSS según la propiedad 'variant')"""
+    VARIANTS = ("primary", "secondary", "ghost", "success", "danger")
+    
     def __init__(self, text: str, style_type: str = "primary"):
         super().__init__(text)
-        self.style_type = style_type
-        self._setup_style()
+        self.style_type = style_type if style_type in self.VARIANTS else "primary"
+        self.setProperty("variant", self.style_type)
     
-    def _setup_style(self):
-        styles = {
-            "primary": f"""
-                QPushButton {{
-                    background-color: {WindowsColors.BLUE.name()};
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.BLUE.lighter(110).name()};
-                }}
-                QPushButton:disabled {{
-                    background-color: {WindowsColors.TERTIARY.name()};
-                }}
-            """,
-            "secondary": f"""
-                QPushButton {{
-                    background-color: {WindowsColors.CARD.name()};
-                    color: {WindowsColors.PRIMARY.name()};
-                    border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.ELEVATED.name()};
-                }}
-            """,
-            "ghost": f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {WindowsColors.BLUE.name()};
-                    border: none;
-                    padding: 8px 16px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.CARD.name()};
-                    border-radius: 6px;
-                }}
-            """,
-            "success": f"""
-                QPushButton {{
-                    background-color: #65AB65;
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.GREEN.darker(110).name()};
-                }}
-                QPushButton:disabled {{
-                    background-color: {WindowsColors.TERTIARY.name()};
-                }}
-            """,
-            "danger": f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {WindowsColors.RED.name()};
-                    border: 1px solid {WindowsColors.RED.name()};
-                    border-radius: 8px;
-                    padding: 10px 20px;
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: {WindowsColors.RED.name()};
-                    color: white;
-                }}
-            """
-        }
-        
-        self.setStyleSheet(styles.get(self.style_type, styles["primary"]))
+    def set_variant(self, style_type: str):
+        """Cambia la variante y re-aplica solo el estilo de este botón"""
+        if style_type not in self.VARIANTS:
+            style_type = "primary"
+        if style_type == self.style_type:
+            return
+        self.style_type = style_type
+        self.setProperty("variant", style_type)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
 class AppleLineEdit(QLineEdit):
     """Campo de texto estilo Apple"""
     def __init__(self, placeholder: str = ""):
         super().__init__()
         self.setPlaceholderText(placeholder)
-        self.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {WindowsColors.CARD.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
-                border-radius: 8px;
-                padding: 12px 16px;
-                font-family: '.AppleSystemUIFont';
-                font-size: 14px;
-                selection-background-color: {WindowsColors.BLUE.name()};
-            }}
-            QLineEdit:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
-                padding: 11px 15px;
-            }}
-        """)
+        self.setProperty("variant", "apple")
 
 class AppleCard(QFrame):
     """Card estilo Apple"""
+    # Hojas armadas una sola vez; el QFrame se aplica también a los hijos de la card
+    _FRAME_SHEET = f"""
+        QFrame {{
+            background-color: {WindowsColors.CARD_HEX};
+            border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
+            border-radius: 12px;
+        }}
+    """
+    _TITLE_SHEET = f"""
+        QLabel {{
+            color: {WindowsColors.PRIMARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 16px;
+            font-weight: 600;
+            border: none;
+        }}
+    """
+    _DESC_SHEET = f"""
+        QLabel {{
+            color: {WindowsColors.SECONDARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 13px;
+            border: none;
+        }}
+    """
+    
     def __init__(self, title: str = "", description: str = ""):
         super().__init__()
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {WindowsColors.CARD.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
-                border-radius: 12px;
-            }}
-        """)
+        self.setStyleSheet(self._FRAME_SHEET)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 16, 20, 16)
@@ -943,27 +1153,12 @@ class AppleCard(QFrame):
         
         if title:
             title_label = QLabel(title)
-            title_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.PRIMARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 16px;
-                    font-weight: 600;
-                    border: none;
-                }}
-            """)
+            title_label.setStyleSheet(self._TITLE_SHEET)
             layout.addWidget(title_label)
             
         if description:
             desc_label = QLabel(description)
-            desc_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.SECONDARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 13px;
-                    border: none;
-                }}
-            """)
+            desc_label.setStyleSheet(self._DESC_SHEET)
             desc_label.setWordWrap(True)
             layout.addWidget(desc_label)
 
@@ -971,6 +1166,28 @@ class AppleCard(QFrame):
 
 class WelcomeScreen(QWidget):
     """Pantalla de bienvenida estilo Apple"""
+    # Hojas de las filas de características, armadas una vez para todas las filas
+    _FEATURE_ICON_SHEET = f"""
+        QLabel {{
+            color: {WindowsColors.BLUE_HEX};
+            font-size: 24px;
+        }}
+    """
+    _FEATURE_TITLE_SHEET = f"""
+        QLabel {{
+            color: {WindowsColors.PRIMARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 15px;
+            font-weight: 600;
+        }}
+    """
+    _FEATURE_DESC_SHEET = f"""
+        QLabel {{
+            color: {WindowsColors.SECONDARY_HEX};
+            font-family: '.AppleSystemUIFont';
+            font-size: 13px;
+        }}
+    """
     
     def __init__(self, on_continue):
         super().__init__()
@@ -987,7 +1204,7 @@ class WelcomeScreen(QWidget):
         title = QLabel("SecreIA")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 48px;
                 font-weight: 300;
@@ -1002,7 +1219,7 @@ class WelcomeScreen(QWidget):
         subtitle.setWordWrap(True)
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 margin-bottom: 32px;
@@ -1029,12 +1246,7 @@ class WelcomeScreen(QWidget):
             feature_layout.setSpacing(16)
             
             icon_label = QLabel(icon)
-            icon_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.BLUE.name()};
-                    font-size: 24px;
-                }}
-            """)
+            icon_label.setStyleSheet(self._FEATURE_ICON_SHEET)
             icon_label.setFixedSize(40, 40)
             icon_label.setAlignment(Qt.AlignCenter)
             
@@ -1044,24 +1256,11 @@ class WelcomeScreen(QWidget):
             text_layout.setSpacing(4)
             
             title_label = QLabel(ft_title)
-            title_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.PRIMARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 15px;
-                    font-weight: 600;
-                }}
-            """)
+            title_label.setStyleSheet(self._FEATURE_TITLE_SHEET)
             
             desc_label = QLabel(desc)
             desc_label.setWordWrap(True)
-            desc_label.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.SECONDARY.name()};
-                    font-family: '.AppleSystemUIFont';
-                    font-size: 13px;
-                }}
-            """)
+            desc_label.setStyleSheet(self._FEATURE_DESC_SHEET)
             
             text_layout.addWidget(title_label)
             text_layout.addWidget(desc_label)
@@ -1079,6 +1278,137 @@ class WelcomeScreen(QWidget):
         continue_btn.setMinimumWidth(200)
         layout.addWidget(continue_btn, alignment=Qt.AlignHCenter)
 
+class ConnectionTestWorker(QThread):
+    """Prueba la API key de OpenAI sin bloquear la UI"""
+    
+    test_finished = Signal(int, str, bool, str)  # generation, api_key, ok, error
+    
+    def __init__(self, api_key: str, generation: int = 0):
+        super().__init__()
+        self.api_key = api_key
+        self.generation = generation
+    
+    def run(self):
+        try:
+            from openai import OpenAI
+            client = OpenAI(api_key=self.api_key)
+            client.embeddings.create(input=["test"], model="text-embedding-3-small")
+            self.test_finished.emit(self.generation, self.api_key, True, "")
+        except Exception as e:
+            self.test_finished.emit(self.generation, self.api_key, False, str(e))
+
+
+# Referencias a los workers en curso: un QThread recolectado mientras corre aborta la app
+_RUNNING_WORKERS = set()
+
+
+def _keep_worker_alive(worker: QThread):
+    """Retiene el worker hasta que termine y luego lo libera"""
+    _RUNNING_WORKERS.add(worker)
+    worker.finished.connect(lambda: _RUNNING_WORKERS.discard(worker))
+    worker.finished.connect(worker.deleteLater)
+
+
+def start_connection_test(api_key: str, on_finished, generation: int = 0) -> ConnectionTestWorker:
+    """Lanza la prueba en un QThread; on_finished(generation, api_key, ok, error) corre en el hilo de la UI"""
+    worker = ConnectionTestWorker(api_key, generation)
+    _keep_worker_alive(worker)
+    worker.test_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
+def delete_note_everywhere(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note):
+    """Elimina la nota de la base de datos, del vector store y su archivo de audio"""
+    db.delete_note(note.id)
+    
+    if vector:
+        try:
+            vector.delete_note_chunks(note.id)
+        except Exception:
+            pass
+    
+    if note.audio_path and os.path.exists(note.audio_path):
+        try:
+            os.remove(note.audio_path)
+        except OSError:
+            pass
+
+
+class NoteDeleteWorker(QThread):
+    """Elimina una nota (índice, base de datos y audio) sin bloquear la UI"""
+    
+    delete_finished = Signal(int, bool, str)  # note_id, ok, error
+    
+    def __init__(self, db: 'NotesDB', vector: Optional['VectorIndex'], note: Note):
+        super().__init__()
+        self.db = db
+        self.vector = vector
+        self.note = note
+    
+    def run(self):
+        try:
+            delete_note_everywhere(self.db, self.vector, self.note)
+            self.delete_finished.emit(self.note.id, True, "")
+        except Exception as e:
+            self.delete_finished.emit(self.note.id, False, str(e))
+
+
+def start_note_delete(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                      on_finished) -> NoteDeleteWorker:
+    """Lanza el borrado en un QThread; on_finished(note_id, ok, error) corre en el hilo de la UI"""
+    worker = NoteDeleteWorker(db, vector, note)
+    _keep_worker_alive(worker)
+    worker.delete_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
+class NoteSaveWorker(QThread):
+    """Guarda una nota (SQLite e índice vectorial) sin bloquear la UI"""
+    
+    save_finished = Signal(int, bool, str)  # note_id (0 si no llegó a guardarse), ok, error
+    
+    def __init__(self, db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                 old_note: Optional[Note] = None):
+        super().__init__()
+        self.db = db
+        self.vector = vector
+        self.note = note
+        self.old_note = old_note  # copia previa para rollback si falla el índice
+    
+    def run(self):
+        note = self.note
+        note_id = 0
+        try:
+            # Categoría y nota en una sola transacción: un commit, sin categorías huérfanas
+            with self.db.transaction():
+                self.db.add_category(note.category)
+                note_id = self.db.upsert_note(note)
+            
+            # Indexar si hay vector store
+            if self.vector:
+                try:
+                    self.vector.index_note(note_id, note.title, note.content,
+                                           note.category, note.tags, note.source)
+                except Exception as e:
+                    print(f"Error indexando: {e}")
+            
+            self.save_finished.emit(note_id, True, "")
+        except Exception as e:
+            self.save_finished.emit(note_id, False, str(e))
+
+
+def start_note_save(db: 'NotesDB', vector: Optional['VectorIndex'], note: Note,
+                    on_finished, old_note: Optional[Note] = None) -> NoteSaveWorker:
+    """Lanza el guardado en un QThread; on_finished(note_id, ok, error) corre en el hilo de la UI"""
+    worker = NoteSaveWorker(db, vector, note, old_note)
+    _keep_worker_alive(worker)
+    worker.save_finished.connect(on_finished)
+    worker.start()
+    return worker
+
+
 class SetupScreen(QWidget):
     """Pantalla de configuración estilo Apple"""
     
@@ -1086,6 +1416,7 @@ class SetupScreen(QWidget):
         super().__init__()
         self.settings = settings
         self.on_complete = on_complete
+        self._test_gen = 0  # solo se aplica el resultado de la última prueba
         self.test_timer = QTimer()
         self.test_timer.setSingleShot(True)
         self.test_timer.timeout.connect(self._test_connection)
@@ -1100,7 +1431,7 @@ class SetupScreen(QWidget):
         title = QLabel("Configuración inicial")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 32px;
                 font-weight: 300;
@@ -1112,7 +1443,7 @@ class SetupScreen(QWidget):
         subtitle = QLabel("Configura tu clave de API de OpenAI para habilitar todas las funciones")
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 margin-bottom: 24px;
@@ -1139,7 +1470,7 @@ class SetupScreen(QWidget):
         self.status_label = QLabel("No configurada")
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 13px;
             }}
@@ -1201,6 +1532,7 @@ class SetupScreen(QWidget):
     def _on_api_key_changed(self):
         api_key = self.api_key_edit.text().strip()
         has_key = bool(api_key and api_key.startswith('sk-'))
+        self._test_gen += 1  # descarta cualquier prueba en curso
         
         self.test_btn.setEnabled(has_key)
         self.continue_btn.setEnabled(has_key)
@@ -1208,12 +1540,15 @@ class SetupScreen(QWidget):
         if has_key:
             self.status_badge.set_status("unsaved")
             self.status_label.setText("No probada")
-            self.test_timer.start(2000)
+            self.test_timer.start(400)
         else:
+            self.test_timer.stop()
             self.status_badge.set_status("saved")
             self.status_label.setText("No configurada")
     
     def _start_test(self):
+        self.test_timer.stop()
+        self._test_gen += 1
         self.test_btn.setText("Probando...")
         self.test_btn.setEnabled(False)
         self.status_badge.set_status("syncing")
@@ -1222,22 +1557,23 @@ class SetupScreen(QWidget):
     
     def _test_connection(self):
         api_key = self.api_key_edit.text().strip()
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            client.embeddings.create(input=["test"], model="text-embedding-3-small")
-            
+        start_connection_test(api_key, self._on_test_finished, self._test_gen)
+    
+    def _on_test_finished(self, generation: int, api_key: str, ok: bool, error: str):
+        # Hubo cambios o una prueba más nueva: el resultado ya no aplica
+        if generation != self._test_gen:
+            return
+        if ok:
             self.status_badge.set_status("saved")
             self.status_label.setText("Conexión exitosa")
             self.test_btn.setText("✓ Conexión exitosa")
-            
-        except Exception as e:
+        else:
             self.status_badge.set_status("unsaved")
             self.status_label.setText("Error de conexión")
             self.test_btn.setText("Probar conexión")
             self.test_btn.setEnabled(True)
             
-            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{str(e)}")
+            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{error}")
     
     def _skip_setup(self):
         QMessageBox.information(self, "Configuración omitida", 
@@ -1255,21 +1591,65 @@ class SetupScreen(QWidget):
 class NotesListDelegate(QStyledItemDelegate):
     """Delegate para la lista de notas estilo Apple Notes"""
     
+    ICON_SIZE = 20
+    ELIDE_CACHE = 1024
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Fuentes creadas una vez, no por fila en cada repintado
+        self._icon_font = QFont(".AppleSystemUIFont", 12)
+        self._title_font = QFont(".AppleSystemUIFont", 16, QFont.Bold)  # Aumentado de 15 a 16 y Bold
+        self._meta_font = QFont(".AppleSystemUIFont", 13)  # fecha y preview
+        self._meta_metrics = QFontMetrics(self._meta_font)
+        # Plumas por estado (normal / seleccionada): (título, metadatos)
+        self._pens = {
+            False: (QPen(WindowsColors.PRIMARY), QPen(WindowsColors.SECONDARY)),
+            True: (QPen(QColor(255, 255, 255)), QPen(QColor(255, 255, 255, 180))),
+        }
+        self._icons: Dict[Tuple[str, float], QPixmap] = {}
+        self._elided: Dict[Tuple[str, int], str] = {}
+    
+    def _icon(self, emoji: str, color: QColor, dpr: float) -> QPixmap:
+        """Emoji pre-renderizado (uno por icono y densidad de pantalla)"""
+        px = self._icons.get((emoji, dpr))
+        if px is None:
+            size = round(self.ICON_SIZE * dpr)
+            px = QPixmap(size, size)
+            px.setDevicePixelRatio(dpr)
+            px.fill(Qt.transparent)
+            p = QPainter(px)
+            p.setRenderHint(QPainter.Antialiasing)
+            p.setPen(QPen(color))
+            p.setFont(self._icon_font)
+            p.drawText(0, 15, emoji)  # misma línea base que el drawText original
+            p.end()
+            self._icons[(emoji, dpr)] = px
+        return px
+    
+    def _elided_preview(self, preview: str, width: int) -> str:
+        """Preview en una línea recortada con '…' (memo por texto y ancho)"""
+        key = (preview, width)
+        text = self._elided.get(key)
+        if text is None:
+            if len(self._elided) >= self.ELIDE_CACHE:
+                self._elided.clear()
+            text = self._meta_metrics.elidedText(
+                " ".join(preview.split()), Qt.ElideRight, width
+            )
+            self._elided[key] = text
+        return text
+    
     def paint(self, painter, option, index):
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing)
+        # Sin Antialiasing: solo rectángulos alineados, texto (ya suavizado por Qt) y pixmaps
         
         rect = option.rect
-        is_selected = option.state & QStyle.State_Selected
+        is_selected = bool(option.state & QStyle.State_Selected)
         
         # Fondo
         if is_selected:
             painter.fillRect(rect, WindowsColors.BLUE)
-            text_color = QColor(255, 255, 255)
-            meta_color = QColor(255, 255, 255, 180)
-        else:
-            text_color = WindowsColors.PRIMARY
-            meta_color = WindowsColors.SECONDARY
+        text_pen, meta_pen = self._pens[is_selected]
             
         # Datos de la nota
         data = index.data(Qt.UserRole)
@@ -1277,7 +1657,7 @@ class NotesListDelegate(QStyledItemDelegate):
             painter.restore()
             return
             
-        title = data.get('title', 'Sin título')
+        title = data.get('title_display') or data.get('title', 'Sin título').upper()
         preview = data.get('preview', '')
         date = data.get('date', '')
         has_audio = data.get('has_audio', False)
@@ -1292,20 +1672,16 @@ class NotesListDelegate(QStyledItemDelegate):
             icon_x = content_rect.x() + content_rect.width() - 30
             icon_y = content_rect.y() + 2
             
+            dpr = painter.device().devicePixelRatioF()
             if has_audio:
-                painter.setPen(QPen(WindowsColors.BLUE))
-                painter.setFont(QFont(".AppleSystemUIFont", 12))
-                painter.drawText(icon_x, icon_y + 15, "🎵")
+                painter.drawPixmap(icon_x, icon_y, self._icon("🎵", WindowsColors.BLUE, dpr))
                 
             if is_transcript:
-                painter.setPen(QPen(WindowsColors.GREEN))
-                painter.setFont(QFont(".AppleSystemUIFont", 12))
-                painter.drawText(icon_x - 20, icon_y + 15, "🎤")
+                painter.drawPixmap(icon_x - 20, icon_y, self._icon("🎤", WindowsColors.GREEN, dpr))
         
         # Título - CAMBIO AQUÍ: Mayor, negrita y mayúsculas
-        title_font = QFont(".AppleSystemUIFont", 16, QFont.Bold)  # Aumentado de 15 a 16 y Bold
-        painter.setFont(title_font)
-        painter.setPen(text_color)
+        painter.setFont(self._title_font)
+        painter.setPen(text_pen)
         
         # Reducir ancho del título si hay iconos
         title_width = content_rect.width()
@@ -1313,25 +1689,23 @@ class NotesListDelegate(QStyledItemDelegate):
             title_width -= 50
         
         title_rect = QRect(content_rect.x(), content_rect.y(), title_width, 22)  # Aumentado altura
-        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, title.upper())  # .upper() para mayúsculas
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, title)  # ya en mayúsculas
         
         # Fecha
-        date_font = QFont(".AppleSystemUIFont", 13)
-        painter.setFont(date_font)
-        painter.setPen(meta_color)
+        painter.setFont(self._meta_font)
+        painter.setPen(meta_pen)
         
         date_rect = QRect(content_rect.x(), content_rect.y() + 26, content_rect.width(), 16)  # Ajustado posición
         painter.drawText(date_rect, Qt.AlignLeft | Qt.AlignVCenter, date)
         
         # Preview del contenido
         if preview:
-            preview_font = QFont(".AppleSystemUIFont", 13)
-            painter.setFont(preview_font)
-            painter.setPen(meta_color)
-            
+            # Misma fuente y pluma que la fecha
             preview_rect = QRect(content_rect.x(), content_rect.y() + 46, 
                             content_rect.width(), content_rect.height() - 50)  # Ajustado posición
-            painter.drawText(preview_rect, Qt.TextWordWrap, preview)
+            # La fila solo tiene alto para una línea: sin ajuste de palabras
+            painter.drawText(preview_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             self._elided_preview(preview, preview_rect.width()))
         
         painter.restore()
     def sizeHint(self, option, index):
@@ -1350,6 +1724,15 @@ class EnhancedNoteEditor(QWidget):
         self.current_note_id = None
         self.is_dirty = False
         self.last_save_content = ""
+        self._save_marked = False  # el botón guardar ya muestra el '*'
+        # Cambia al limpiar el editor o cargar otra nota (descarta resultados de guardados viejos)
+        self._editor_gen = 0
+        self._pending_save = (0, "", "")
+        self._known_categories: Set[str] = set()  # categorías ya presentes en el combo
+        # Estadísticas, título y botón guardar se recalculan al pausar la escritura
+        self.derived_timer = QTimer()
+        self.derived_timer.setSingleShot(True)
+        self.derived_timer.timeout.connect(self._recompute_derived)
         self._setup_ui()
         
     def _setup_ui(self):
@@ -1380,13 +1763,7 @@ class EnhancedNoteEditor(QWidget):
         
         # Status de guardado
         self.save_status = QLabel("")
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(WindowsColors.SECONDARY_HEX)
         
         toolbar_layout.addWidget(self.btn_new)
         toolbar_layout.addWidget(self.btn_save)
@@ -1403,18 +1780,18 @@ class EnhancedNoteEditor(QWidget):
         self.title_edit.setPlaceholderText("Título de la nota...")
         self.title_edit.setStyleSheet(f"""
             QLineEdit {{
-                background-color: {WindowsColors.CARD.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                background-color: {WindowsColors.CARD_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 8px;
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 500;
                 padding: 12px 16px;
-                selection-background-color: {WindowsColors.BLUE.name()};
+                selection-background-color: {WindowsColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
+                border: 2px solid {WindowsColors.BLUE_HEX};
                 padding: 11px 15px;
             }}
         """)
@@ -1436,10 +1813,10 @@ class EnhancedNoteEditor(QWidget):
         self.category_combo.setStyleSheet(f"""
             QComboBox {{
                 background: transparent;
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 min-width: 150px;
@@ -1456,15 +1833,15 @@ class EnhancedNoteEditor(QWidget):
         self.content_edit.setPlaceholderText("Comenzar a escribir...")
         self.content_edit.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {WindowsColors.NOTES_LIST.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 12px;
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 line-height: 1.6;
                 padding: 20px;
-                selection-background-color: {WindowsColors.BLUE.name()};
+                selection-background-color: {WindowsColors.BLUE_HEX};
             }}
         """)
         self.content_edit.textChanged.connect(self._on_content_changed)
@@ -1474,7 +1851,7 @@ class EnhancedNoteEditor(QWidget):
         self.stats_label = QLabel("Palabras: 0 | Caracteres: 0")
         self.stats_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 12px;
                 padding: 8px 0px;
             }}
@@ -1483,7 +1860,7 @@ class EnhancedNoteEditor(QWidget):
         
         self.refresh_categories()
     def _delete_current_note(self):
-        """Elimina la nota actualmente cargada"""
+        """Elimina la nota actualmente cargada (el borrado corre en segundo plano)"""
         if not self.current_note_id:
             return
         
@@ -1500,33 +1877,28 @@ class EnhancedNoteEditor(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                # Eliminar de base de datos
-                self.db.delete_note(self.current_note_id)
-                
-                # Eliminar del vector store si existe
-                if self.vector:
-                    try:
-                        self.vector.delete_note_chunks(self.current_note_id)
-                    except Exception:
-                        pass
-                
-                # Eliminar archivo de audio si existe
-                if note.audio_path and os.path.exists(note.audio_path):
-                    try:
-                        os.remove(note.audio_path)
-                    except Exception:
-                        pass
-                
-                # Limpiar editor
-                self.clear_editor()
-                
-                # Emitir señal para actualizar la lista
-                self.note_saved.emit()
-                
-                QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
-                
+                self.btn_delete.setEnabled(False)
+                self.loading_spinner.show()
+                self.loading_spinner.start()
+                start_note_delete(self.db, self.vector, note, self._on_note_deleted)
+                    
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al eliminar: {e}")
+    
+    def _on_note_deleted(self, note_id: int, ok: bool, error: str):
+        """Resultado del borrado en segundo plano"""
+        self.loading_spinner.stop()
+        self.loading_spinner.hide()
+        self.btn_delete.setEnabled(True)
+        if not ok:
+            QMessageBox.critical(self, "Error", f"Error al eliminar: {error}")
+            return
+        
+        # Limpiar editor (si sigue mostrando la nota) y notificar
+        if self.current_note_id == note_id:
+            self.clear_editor()
+        self.note_saved.emit()
+        QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
 
     def _update_delete_button_visibility(self):
         """Actualiza visibilidad del botón eliminar según el estado"""
@@ -1558,46 +1930,62 @@ class EnhancedNoteEditor(QWidget):
         self.save_status.setText("Nueva nota - Escribe contenido para guardar")
         QTimer.singleShot(4000, lambda: self.save_status.clear())
         
+    DERIVED_DELAY_MS = 150  # agrupa las teclas seguidas en un solo recálculo
+    
     def _on_content_changed(self):
-        """Maneja cambios en el contenido"""
+        """Maneja cambios en el contenido: por tecla solo se marca como modificado"""
         self._mark_dirty()
-        self._update_stats()
-        self._auto_generate_title()
-        
-        # Mostrar/ocultar botón guardar según contenido
-        has_content = bool(self.content_edit.toPlainText().strip())
-        if has_content:
-            self.btn_save.show()
-        else:
-            self.btn_save.hide()
-        
-    def _auto_generate_title(self):
+        self.derived_timer.start(self.DERIVED_DELAY_MS)
+    
+    def _recompute_derived(self, text: Optional[str] = None):
+        """Recalcula lo que depende del texto completo (un solo toPlainText())"""
+        self.derived_timer.stop()
+        if text is None:
+            text = self.content_edit.toPlainText()
+        self._update_stats(text)
+        self._auto_generate_title(text)
+        
+        # Mostrar/ocultar botón guardar según contenido (solo si cambia)
+        has_content = bool(text) and not text.isspace()  # sin copiar el texto con strip()
+        if self.btn_save.isHidden() == has_content:
+            self.btn_save.setVisible(has_content)
+        
+    def _auto_generate_title(self, text: Optional[str] = None):
         """Auto-genera título basado en el contenido"""
-        content = self.content_edit.toPlainText().strip()
-        if content:
-            # Tomar primeras palabras como título
-            words = content.split()[:6]  # Primeras 6 palabras
-            title = " ".join(words)
-            if len(content.split()) > 6:
-                title += "..."
-            self.title_edit.setText(title)
+        content = self.content_edit.toPlainText() if text is None else text
+        if content and not content.isspace():
+            # Tomar primeras 6 palabras como título
+            self.title_edit.setText(title_from_content(content))
         else:
             self.title_edit.setText("")
     
-    def _update_stats(self):
+    def _update_stats(self, text: Optional[str] = None):
         """Actualiza estadísticas del texto"""
-        text = self.content_edit.toPlainText()
-        words = len(text.split()) if text.strip() else 0
+        if text is None:
+            text = self.content_edit.toPlainText()
+        words = len(text.split())  # str.split en C: más rápido que contar con regex
         chars = len(text)
         self.stats_label.setText(f"Palabras: {words} | Caracteres: {chars}")
     
     def _mark_dirty(self):
         """Marca como modificado"""
         self.is_dirty = True
-        # Cambiar texto del botón para indicar cambios
-        if not self.btn_save.text().endswith("*"):
+        # Cambiar texto del botón para indicar cambios (una vez, no en cada tecla)
+        if not self._save_marked:
+            self._save_marked = True
             self.btn_save.setText(self.btn_save.text() + "*")
-        
+    
+    def _set_save_text(self, text: str):
+        """Texto del botón guardar; el próximo cambio vuelve a agregar el '*'"""
+        self._save_marked = False
+        self.btn_save.setText(text)
+        
+    def _add_known_category(self, name: str):
+        """Agrega una categoría nueva al combo sin releer la lista desde la base de datos"""
+        if name and name not in self._known_categories:
+            self._known_categories.add(name)
+            self.category_combo.addItem(name)
+    
     def refresh_categories(self):
         """Actualiza categorías disponibles"""
         current = self.category_combo.currentText()
@@ -1607,6 +1995,7 @@ class EnhancedNoteEditor(QWidget):
             cats = ["General"] + cats
         for c in cats:
             self.category_combo.addItem(c)
+        self._known_categories = set(cats)
         
         # Restaurar selección
         if current:
@@ -1616,6 +2005,9 @@ class EnhancedNoteEditor(QWidget):
                 
     def _save_note(self):
         """Guarda la nota con loading"""
+        # Aplicar un recálculo pendiente: el título auto-generado debe incluir lo último escrito
+        if self.derived_timer.isActive():
+            self._recompute_derived()
         title = self.title_edit.text().strip() or "Sin título"
         content = self.content_edit.toPlainText().strip()
         category = self.category_combo.currentText().strip() or "General"
@@ -1629,28 +2021,23 @@ class EnhancedNoteEditor(QWidget):
         # Mostrar loading
         self._show_saving_state()
         
-        # Usar QTimer para no bloquear la UI
-        QTimer.singleShot(100, lambda: self._do_save(title, content, category))
+        # SQLite y el índice vectorial se escriben en un QThread: la UI no se bloquea
+        self._do_save(title, content, category)
         return True
     
     def _show_saving_state(self):
         """Muestra estado de guardado"""
         self.btn_save.setEnabled(False)
-        self.btn_save.setText("Guardando...")
+        self._set_save_text("Guardando...")
         self.loading_spinner.show()
         self.loading_spinner.start()
         self.save_status.setText("Guardando...")
     
     def _do_save(self, title: str, content: str, category: str):
-        """Ejecuta el guardado real"""
+        """Arma la nota y la guarda en segundo plano (SQLite + índice vectorial)"""
         try:
-            
-            chile_tz = pytz.timezone('America/Santiago')
-            
             # Usar el método para obtener título final
-            final_title = self._get_final_title()
-            
-            self.db.add_category(category)
+            final_title = self._get_final_title(content)
             
             note = Note(
                 id=self.current_note_id,
@@ -1660,48 +2047,56 @@ class EnhancedNoteEditor(QWidget):
                 tags=[],
                 source="manual",
                 audio_path=None,
-                created_at=datetime.now(chile_tz).isoformat() if not self.current_note_id else None,
-                updated_at=datetime.now(chile_tz).isoformat(),
+                created_at=datetime.now(CHILE_TZ).isoformat() if not self.current_note_id else None,
+                updated_at=datetime.now(CHILE_TZ).isoformat(),
             )
             
-            note_id = self.db.upsert_note(note)
-            self.current_note_id = note_id
-
-            # Indexar si hay vector store
-            if self.vector:
-                try:
-                    self.vector.index_note(note_id, final_title, content, category, [], "manual")  # CAMBIO AQUÍ
-                except Exception as e:
-                    print(f"Error indexando: {e}")
-
-            self.refresh_categories()
-            self.is_dirty = False
-            
-            # Actualizar título en UI con el final
-            self.title_edit.setText(final_title)
-            
-            # Mostrar éxito
-            self._show_success_state()
-            
-            # Emitir señal para actualizar la lista
-            self.note_saved.emit()
+            self._pending_save = (self._editor_gen, final_title, category)
+            start_note_save(self.db, self.vector, note, self._on_note_saved)
             
         except Exception as e:
             self._show_error_state(str(e))
+    
+    def _on_note_saved(self, note_id: int, ok: bool, error: str):
+        """Resultado del guardado en segundo plano"""
+        editor_gen, final_title, category = self._pending_save
+        # Si mientras tanto se limpió el editor o se abrió otra nota, no tocar sus campos
+        same_note = editor_gen == self._editor_gen
+        if same_note and note_id:
+            self.current_note_id = note_id
+        if not ok:
+            self._show_error_state(error)
+            return
+        
+        # Actualizar UI solo si todo fue exitoso
+        self._add_known_category(category)
+        if same_note:
+            self.is_dirty = False
+            self.title_edit.setText(final_title)
+        self._show_success_state()
+        self.note_saved.emit()
+    
+    def _set_save_status_style(self, color: str):
+        """Color del estado de guardado (hoja compartida, sin re-aplicar si no cambia)"""
+        sheet = cached_qss("save_status", color, lambda: f"""
+            QLabel {{
+                color: {color};
+                font-size: 12px;
+                padding: 4px 8px;
+            }}
+        """)
+        if sheet is not getattr(self, "_save_status_sheet", None):
+            self._save_status_sheet = sheet
+            self.save_status.setStyleSheet(sheet)
+
     def _show_success_state(self):
             """Muestra estado de éxito"""
             self.loading_spinner.stop()
             self.loading_spinner.hide()
             self.btn_save.setEnabled(True)
-            self.btn_save.setText("💾 Guardar")
+            self._set_save_text("💾 Guardar")
             self.save_status.setText("✅ Guardado")
-            self.save_status.setStyleSheet(f"""
-                QLabel {{
-                    color: {WindowsColors.GREEN.name()};
-                    font-size: 12px;
-                    padding: 4px 8px;
-                }}
-            """)
+            self._set_save_status_style(WindowsColors.GREEN_HEX)
             
             # Limpiar status después de 3 segundos
             QTimer.singleShot(3000, self._clear_status)
@@ -1711,15 +2106,9 @@ class EnhancedNoteEditor(QWidget):
         self.loading_spinner.stop()
         self.loading_spinner.hide()
         self.btn_save.setEnabled(True)
-        self.btn_save.setText("💾 Guardar")
+        self._set_save_text("💾 Guardar")
         self.save_status.setText("❌ Error")
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {WindowsColors.RED.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(WindowsColors.RED_HEX)
         
         QMessageBox.critical(self, "Error", f"Error al guardar: {error}")
         QTimer.singleShot(3000, self._clear_status)
@@ -1727,23 +2116,18 @@ class EnhancedNoteEditor(QWidget):
     def _clear_status(self):
         """Limpia el status"""
         self.save_status.clear()
-        self.save_status.setStyleSheet(f"""
-            QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
-                font-size: 12px;
-                padding: 4px 8px;
-            }}
-        """)
+        self._set_save_status_style(WindowsColors.SECONDARY_HEX)
     
     def clear_editor(self):
         """Limpia el editor"""
+        self._editor_gen += 1
         self.current_note_id = None
         self.title_edit.clear()
         self.content_edit.clear()
         self.category_combo.setCurrentText("General")
         self.is_dirty = False
         self.title_manually_edited = False
-        self.btn_save.setText("💾 Guardar")
+        self._set_save_text("💾 Guardar")
         self.btn_save.hide()  # Ocultar botón al limpiar
         self._update_stats()
         self._clear_status()
@@ -1758,19 +2142,23 @@ class EnhancedNoteEditor(QWidget):
             if not note:
                 return False
                 
+            self._editor_gen += 1
             self.current_note_id = note_id
-            self.title_edit.setText(note.title)
-            self.title_manually_edited = True
-            self.content_edit.setPlainText(note.content)
+            # Sin señales: cargar el texto no dispara _on_content_changed ni _mark_dirty;
+            # lo derivado se calcula una vez con el contenido que ya tenemos
+            with QSignalBlocker(self.title_edit), QSignalBlocker(self.content_edit):
+                self.title_edit.setText(note.title)
+                self.content_edit.setPlainText(note.content)
+                # El título guardado manda: sin auto-título al cargar
+                self.title_manually_edited = True
+                self._recompute_derived(note.content)
             
             # Actualizar categoría
-            if self.category_combo.findText(note.category) == -1:
-                self.category_combo.addItem(note.category)
+            self._add_known_category(note.category)
             self.category_combo.setCurrentText(note.category)
             
             self.is_dirty = False
-            self.btn_save.setText("💾 Guardar")
-            self._update_stats()
+            self._set_save_text("💾 Guardar")
             self._clear_status()
             
             # NUEVO: Actualizar visibilidad del botón eliminar
@@ -1800,18 +2188,15 @@ class EnhancedNoteEditor(QWidget):
             # Marcar como editado manualmente
             self.title_manually_edited = True
 
-    def _auto_generate_title(self):
+    def _auto_generate_title(self, text: Optional[str] = None):
         """Auto-genera título basado en el contenido solo si no fue editado manualmente"""
         if self.title_manually_edited:
             return  # No sobrescribir si fue editado manualmente
             
-        content = self.content_edit.toPlainText().strip()
-        if content:
-            # Tomar primeras palabras como título
-            words = content.split()[:6]  # Primeras 6 palabras
-            title = " ".join(words)
-            if len(content.split()) > 6:
-                title += "..."
+        content = self.content_edit.toPlainText() if text is None else text
+        if content and not content.isspace():
+            # Tomar primeras 6 palabras como título
+            title = title_from_content(content)
             
             # Solo actualizar si no está enfocado (evitar interferir mientras escribe)
             if not self.title_edit.hasFocus():
@@ -1821,18 +2206,16 @@ class EnhancedNoteEditor(QWidget):
             if not self.title_edit.hasFocus():
                 self.title_edit.setText("")
 
-    def _get_final_title(self):
-        """Obtiene el título final para guardar"""
+    def _get_final_title(self, content: Optional[str] = None):
+        """Obtiene el título final para guardar (content: texto ya leído del editor, si lo hay)"""
         title = self.title_edit.text().strip()
         
         if not title:
             # Si no hay título, generar uno automáticamente
-            content = self.content_edit.toPlainText().strip()
-            if content:
-                words = content.split()[:6]
-                title = " ".join(words)
-                if len(content.split()) > 6:
-                    title += "..."
+            if content is None:
+                content = self.content_edit.toPlainText()
+            if content and not content.isspace():
+                title = title_from_content(content)
             else:
                 title = "Sin título"
         
@@ -1882,7 +2265,7 @@ class EnhancedNotesView(QWidget):
         self.notes_list.customContextMenuRequested.connect(self._show_context_menu)
         self.notes_list.setStyleSheet(f"""
             QListWidget {{
-                background-color: {WindowsColors.NOTES_LIST.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
                 border: none;
                 outline: none;
             }}
@@ -1893,7 +2276,7 @@ class EnhancedNotesView(QWidget):
         self.status_label = QLabel("0 notas")
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 12px;
                 padding: 8px;
             }}
@@ -1915,12 +2298,11 @@ class EnhancedNotesView(QWidget):
         self.notes_list.clear()
         
         if query:
-            notes = self.db.search_notes(query)
+            notes = self.db.search_notes_preview(query)
         else:
-            notes = self.db.list_notes(limit=200)
+            notes = self.db.list_notes_preview(limit=200)
         
-        for note in notes:
-            self._add_note_to_list(note)
+        self._fill_notes_list(notes)
         
         self.status_label.setText(f"{len(notes)} notas")
     def _apply_search(self, query: str, filters: Dict[str, str]):
@@ -1932,49 +2314,44 @@ class EnhancedNotesView(QWidget):
         """Filtra notas según criterios"""
         self.notes_list.clear()
         
-        # Obtener notas base
-        if filters.get('category'):
-            notes = self.db.search_notes("", category=filters['category'])
-        else:
-            notes = self.db.list_notes(limit=1000)
-        
-        # Aplicar filtro de texto
-        if query:
-            notes = [n for n in notes if query.lower() in n.title.lower() or query.lower() in n.content.lower()]
-        
-        # Aplicar filtro de fecha
         date_filter = filters.get('date_filter', 'Todas')
-        if date_filter != 'Todas':
-            now = datetime.utcnow()
-            if date_filter == 'Hoy':
-                cutoff = now - timedelta(days=1)
-            elif date_filter == 'Esta semana':
-                cutoff = now - timedelta(days=7)
-            elif date_filter == 'Este mes':
-                cutoff = now - timedelta(days=30)
-            else:
-                cutoff = None
-            
-            if cutoff:
-                notes = [n for n in notes if datetime.fromisoformat(n.updated_at.replace('Z', '+00:00')) > cutoff]
+        days = {'Hoy': 1, 'Esta semana': 7, 'Este mes': 30}.get(date_filter)
+        cutoff = (datetime.now(UTC) - timedelta(days=days)).timestamp() if days else None
         
-        # Aplicar filtro de tipo
         type_filter = filters.get('type_filter', 'Todos')
-        if type_filter == 'Manual':
-            notes = [n for n in notes if n.source == 'manual']
-        elif type_filter == 'Transcripciones':
-            notes = [n for n in notes if n.source == 'transcript']
+        source = {'Manual': 'manual', 'Transcripciones': 'transcript'}.get(type_filter)
+        
+        # Texto, categoría, fecha y tipo se resuelven en SQLite (índice trigram)
+        category = filters.get('category') or None
+        notes = self.db.search_notes_preview(
+            query,
+            category=category,
+            source=source,
+            updated_since=cutoff,
+            limit=None if category else 1000,
+        )
         
         # Mostrar resultados
-        for note in notes:
-            self._add_note_to_list(note)
+        self._fill_notes_list(notes)
         
         self.status_label.setText(f"{len(notes)} notas")
     
-    def _add_note_to_list(self, note: Note):
+    def _fill_notes_list(self, notes: Iterable[NoteListRow]) -> int:
+        """Agrega las notas en bloque: un solo repintado al final"""
+        today_ordinal = datetime.now().astimezone().toordinal()
+        count = 0
+        self.notes_list.setUpdatesEnabled(False)
+        try:
+            for note in notes:
+                self._add_note_to_list(note, today_ordinal)
+                count += 1
+        finally:
+            self.notes_list.setUpdatesEnabled(True)
+        return count
+    
+    def _add_note_to_list(self, note: NoteListRow, today_ordinal: Optional[int] = None):
         """Agrega una nota a la lista"""
-        preview = note.content[:100] + "..." if len(note.content) > 100 else note.content
-        date_str = self._format_date(note.updated_at)
+        date_str = format_date_chile(note.updated_at or "", today_ordinal)
         
         # Detectar características especiales
         has_audio = bool(note.audio_path and os.path.exists(note.audio_path))
@@ -1984,7 +2361,8 @@ class EnhancedNotesView(QWidget):
         item.setData(Qt.UserRole, {
             'id': note.id,
             'title': note.title or "Sin título",
-            'preview': preview,
+            'title_display': (note.title or "Sin título").upper(),  # el delegate no convierte al pintar
+            'preview': note.preview,  # recortado en SQLite (con "..." si sigue)
             'date': date_str,
             'has_audio': has_audio,
             'is_transcript': is_transcript
@@ -2002,23 +2380,23 @@ class EnhancedNotesView(QWidget):
             return
             
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {WindowsColors.ELEVATED.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
-                border-radius: 8px;
-                padding: 4px 0;
-                font-size: 14px;
-                color: {WindowsColors.PRIMARY.name()};
-            }}
-            QMenu::item {{
-                padding: 8px 16px;
-            }}
-            QMenu::item:selected {{
-                background-color: {WindowsColors.BLUE.name()};
-                color: white;
-            }}
-        """)
+        menu.setStyleSheet(cached_qss("context_menu", "default", lambda: f"""
+                QMenu {{
+                    background-color: {WindowsColors.ELEVATED_HEX};
+                    border: 1px solid {WindowsColors.SEPARATOR_HEX};
+                    border-radius: 8px;
+                    padding: 4px 0;
+                    font-size: 14px;
+                    color: {WindowsColors.PRIMARY_HEX};
+                }}
+                QMenu::item {{
+                    padding: 8px 16px;
+                }}
+                QMenu::item:selected {{
+                    background-color: {WindowsColors.BLUE_HEX};
+                    color: white;
+                }}
+            """))
         
         edit_action = menu.addAction("✏️ Editar")
         duplicate_action = menu.addAction("📋 Duplicar")
@@ -2100,15 +2478,16 @@ class EnhancedNotesView(QWidget):
         
         if file_path:
             try:
-                if format_ext == "md":
-                    content = export_manager.export_note_markdown(note)
-                elif format_ext == "json":
-                    content = export_manager.export_notes_json([note])
+                if format_ext == "json":
+                    export_manager.export_notes_json_to(file_path, [note])
                 else:
-                    content = f"# {note.title}\n\n{note.content}"
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    with open(file_path, 'w', encoding='utf-8',
+                              buffering=NotesExportManager.WRITE_BUFFER) as f:
+                        if format_ext == "md":
+                            export_manager.export_note_markdown_to(f, note)
+                        else:
+                            f.write(f"# {note.title}\n\n")
+                            f.write(note.content)
                 
                 QMessageBox.information(self, "Exportación", f"Nota exportada a {file_path}")
                 
@@ -2116,7 +2495,7 @@ class EnhancedNotesView(QWidget):
                 QMessageBox.critical(self, "Error", f"Error al exportar: {e}")
     
     def _delete_note_from_menu(self, note_id: int, item: QListWidgetItem):
-        """Elimina nota desde menú contextual"""
+        """Elimina nota desde menú contextual (el borrado corre en segundo plano)"""
         note = self.db.get_note(note_id)
         if not note:
             return
@@ -2129,34 +2508,29 @@ class EnhancedNotesView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            try:
-                self.db.delete_note(note_id)
-                
-                if self.vector:
-                    try:
-                        self.vector.delete_note_chunks(note_id)
-                    except Exception:
-                        pass
-                
-                # Eliminar archivo de audio si existe
-                if note.audio_path and os.path.exists(note.audio_path):
-                    try:
-                        os.remove(note.audio_path)
-                    except Exception:
-                        pass
-                
-                # Remover de la lista
-                self.notes_list.takeItem(self.notes_list.row(item))
-                
-                # Limpiar editor si era la nota activa
-                if self.note_editor.current_note_id == note_id:
-                    self.note_editor.clear_editor()
-                
-                self.status_label.setText(f"{self.notes_list.count()} notas")
-                QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al eliminar: {e}")
+            self.status_label.setText("Eliminando...")
+            start_note_delete(self.db, self.vector, note, self._on_note_deleted_from_menu)
+    
+    def _on_note_deleted_from_menu(self, note_id: int, ok: bool, error: str):
+        """Quita la nota de la lista cuando termina el borrado"""
+        if not ok:
+            self.status_label.setText(f"{self.notes_list.count()} notas")
+            QMessageBox.critical(self, "Error", f"Error al eliminar: {error}")
+            return
+        
+        # La lista pudo recargarse mientras tanto: buscar la fila por id
+        for row in range(self.notes_list.count()):
+            data = self.notes_list.item(row).data(Qt.UserRole)
+            if data and data.get('id') == note_id:
+                self.notes_list.takeItem(row)
+                break
+        
+        # Limpiar editor si era la nota activa
+        if self.note_editor.current_note_id == note_id:
+            self.note_editor.clear_editor()
+        
+        self.status_label.setText(f"{self.notes_list.count()} notas")
+        QMessageBox.information(self, "Eliminado", "Nota eliminada correctamente")
     
     def _on_note_selected(self, item):
         """Maneja selección de nota"""
@@ -2171,9 +2545,8 @@ class EnhancedNotesView(QWidget):
             self._filter_notes("", self.current_filters)
         else:
             # Carga inicial
-            notes = self.db.list_notes(limit=200)
-            for note in notes:
-                self._add_note_to_list(note)
+            notes = self.db.list_notes_preview(limit=200)
+            self._fill_notes_list(notes)
             self.status_label.setText(f"{len(notes)} notas")
     
     def _format_date(self, date_str):
@@ -2432,7 +2805,7 @@ class EnhancedTranscribeTab(QWidget):
                     font-size: 12px;
                     border: none;
                     padding: 4px 8px;
-                    background-color: {WindowsColors.GREEN.name()};
+                    background-color: {WindowsColors.GREEN_HEX};
                     border-radius: 4px;
                 }}
             """)
@@ -2882,7 +3255,7 @@ class EnhancedTranscribeTab(QWidget):
         header = QLabel("Transcripción en tiempo real")
         header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 28px;
                 font-weight: 300;
@@ -2897,11 +3270,11 @@ class EnhancedTranscribeTab(QWidget):
         
         if self.recognition_working:
             status_text = "Reconocimiento de voz: Listo"
-            status_color = WindowsColors.GREEN.name()
+            status_color = WindowsColors.GREEN_HEX
             status_icon = "✅"
         else:
             status_text = "Reconocimiento de voz: No disponible - Verifica micrófono y permisos"
-            status_color = WindowsColors.RED.name()
+            status_color = WindowsColors.RED_HEX
             status_icon = "❌"
         
         self.status_info = QLabel(f"{status_icon} {status_text}")
@@ -2953,7 +3326,7 @@ class EnhancedTranscribeTab(QWidget):
         status_title = QLabel("Estado:")
         status_title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 11px;
                 border: none;
             }}
@@ -2962,11 +3335,11 @@ class EnhancedTranscribeTab(QWidget):
         self.status_indicator = QLabel("Listo")
         self.status_indicator.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 12px;
                 border: none;
                 padding: 4px 8px;
-                background-color: {WindowsColors.CARD.name()};
+                background-color: {WindowsColors.CARD_HEX};
                 border-radius: 4px;
             }}
         """)
@@ -2983,12 +3356,12 @@ class EnhancedTranscribeTab(QWidget):
         self.status_label = QLabel("Listo para transcribir" if self.recognition_working else "Configura micrófono para continuar")
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 13px;
                 padding: 8px 12px;
                 border: none;
-                background-color: {WindowsColors.ELEVATED.name()};
+                background-color: {WindowsColors.ELEVATED_HEX};
                 border-radius: 6px;
             }}
         """)
@@ -3000,7 +3373,7 @@ class EnhancedTranscribeTab(QWidget):
         separator.setFrameShape(QFrame.HLine)
         separator.setStyleSheet(f"""
             QFrame {{
-                color: {WindowsColors.SEPARATOR_LIGHT.name()};
+                color: {WindowsColors.SEPARATOR_LIGHT_HEX};
                 margin: 8px 0;
             }}
         """)
@@ -3017,7 +3390,7 @@ class EnhancedTranscribeTab(QWidget):
         title_label = QLabel("Título:")
         title_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-size: 13px;
                 font-weight: 500;
                 background: transparent;
@@ -3029,18 +3402,18 @@ class EnhancedTranscribeTab(QWidget):
         self.title_edit = QLineEdit("Título automático...")
         self.title_edit.setStyleSheet(f"""
             QLineEdit {{
-                background-color: {WindowsColors.SIDEBAR.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
+                background-color: {WindowsColors.SIDEBAR_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
                 font-family: '.AppleSystemUIFont';
                 font-size: 13px;
             }}
             QLineEdit:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
+                border: 2px solid {WindowsColors.BLUE_HEX};
                 padding: 7px 11px;
-                background-color: {WindowsColors.NOTES_LIST.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
             }}
         """)
         
@@ -3054,7 +3427,7 @@ class EnhancedTranscribeTab(QWidget):
         category_label = QLabel("Categoría:")
         category_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-size: 13px;
                 font-weight: 500;
                 background: transparent;
@@ -3066,9 +3439,9 @@ class EnhancedTranscribeTab(QWidget):
         self.category_combo = QComboBox()
         self.category_combo.setStyleSheet(f"""
             QComboBox {{
-                background-color: {WindowsColors.SIDEBAR.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
+                background-color: {WindowsColors.SIDEBAR_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
                 font-family: '.AppleSystemUIFont';
@@ -3079,9 +3452,9 @@ class EnhancedTranscribeTab(QWidget):
                 border: none;
             }}
             QComboBox QAbstractItemView {{
-                background-color: {WindowsColors.ELEVATED.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
-                selection-background-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.ELEVATED_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_HEX};
+                selection-background-color: {WindowsColors.BLUE_HEX};
                 selection-color: white;
             }}
         """)
@@ -3108,7 +3481,7 @@ class EnhancedTranscribeTab(QWidget):
         preview_header = QLabel("Transcripción en vivo")
         preview_header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 font-weight: 600;
@@ -3122,8 +3495,8 @@ class EnhancedTranscribeTab(QWidget):
         self.transcript_preview.setPlaceholderText("El texto aparecerá aquí mientras hablas...")
         self.transcript_preview.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {WindowsColors.NOTES_LIST.name()};
-                color: {WindowsColors.PRIMARY.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
                 border: none;
                 border-radius: 12px;
                 padding: 20px;
@@ -3189,11 +3562,11 @@ class EnhancedTranscribeTab(QWidget):
     def _auto_generate_title(self):
         """Genera título automáticamente"""
         if self.title_edit.text().strip() in ["", "Título automático..."]:
-            combined_text = " ".join(self.realtime_text)
-            if len(combined_text.split()) >= 3:
-                words = combined_text.split()[:6]
+            # Solo se leen las primeras palabras, sin unir toda la transcripción
+            words, more = first_words(self.realtime_text, 6)
+            if len(words) >= 3:
                 suggested_title = " ".join(words)
-                if len(combined_text.split()) > 6:
+                if more:
                     suggested_title += "..."
                 self.title_edit.setText(suggested_title)
 
@@ -3226,11 +3599,11 @@ class EnhancedTranscribeTab(QWidget):
         self.status_indicator.setText("Listo")
         self.status_indicator.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 12px;
                 border: none;
                 padding: 4px 8px;
-                background-color: {WindowsColors.CARD.name()};
+                background-color: {WindowsColors.CARD_HEX};
                 border-radius: 4px;
             }}
         """)
@@ -3347,17 +3720,8 @@ class EnhancedTranscribeTab(QWidget):
         text = self.transcript_preview.toPlainText().strip()
         if text and not text.startswith("🎤"):
             clean_text = self._clean_content(text)
-            try:
-                if pyperclip is not None:
-                    pyperclip.copy(clean_text)
-                else:
-                    clipboard = QApplication.clipboard()
-                    clipboard.setText(clean_text)
-                QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
-            except Exception:
-                clipboard = QApplication.clipboard()
-                clipboard.setText(clean_text)
-                QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
+            QApplication.clipboard().setText(clean_text)
+            QMessageBox.information(self, "Copiado", "Texto copiado al portapapeles")
 
     def _clear_transcription(self):
         """Limpia la transcripción"""
@@ -3411,7 +3775,7 @@ class SearchTab(QWidget):
         header = QLabel("Búsqueda avanzada")
         header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 32px;
                 font-weight: 300;
@@ -3461,7 +3825,7 @@ class SearchTab(QWidget):
         self.results_title = QLabel("Resultados")
         self.results_title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -3471,7 +3835,7 @@ class SearchTab(QWidget):
         self.results_count = QLabel("0 resultados")
         self.results_count.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 14px;
             }}
         """)
@@ -3491,18 +3855,18 @@ class SearchTab(QWidget):
                 font-size: 14px;
             }}
             QListWidget::item {{
-                background-color: {WindowsColors.ELEVATED.name()};
-                color: {WindowsColors.PRIMARY.name()};
+                background-color: {WindowsColors.ELEVATED_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
                 border-radius: 8px;
                 padding: 16px;
                 margin-bottom: 8px;
             }}
             QListWidget::item:hover {{
-                background-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.BLUE_HEX};
                 color: white;
             }}
             QListWidget::item:selected {{
-                background-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.BLUE_HEX};
                 color: white;
             }}
         """)
@@ -3626,7 +3990,7 @@ class AnalyzeTab(QWidget):
         header = QLabel("Análisis inteligente")
         header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 32px;
                 font-weight: 300;
@@ -3639,7 +4003,7 @@ class AnalyzeTab(QWidget):
         description = QLabel("Haz preguntas sobre el contenido de tus notas. La IA analizará tu información para darte respuestas precisas.")
         description.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
             }}
@@ -3676,9 +4040,9 @@ class AnalyzeTab(QWidget):
         self.k_spin.setValue(self.settings.top_k)
         self.k_spin.setStyleSheet(f"""
             QSpinBox {{
-                background-color: {WindowsColors.CARD.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                background-color: {WindowsColors.CARD_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
                 border-radius: 6px;
                 padding: 8px 12px;
                 font-family: '.AppleSystemUIFont';
@@ -3704,7 +4068,7 @@ class AnalyzeTab(QWidget):
         answer_title = QLabel("Análisis")
         answer_title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 18px;
                 font-weight: 600;
@@ -3725,8 +4089,8 @@ class AnalyzeTab(QWidget):
         self.answer.setPlaceholderText("Las respuestas del análisis aparecerán aquí...")
         self.answer.setStyleSheet(f"""
             QTextEdit {{
-                background-color: {WindowsColors.NOTES_LIST.name()};
-                color: {WindowsColors.PRIMARY.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
                 border: none;
                 border-radius: 8px;
                 padding: 20px;
@@ -3749,13 +4113,10 @@ class AnalyzeTab(QWidget):
     
     def _copy_answer(self):
         """Copia respuesta al portapapeles"""
-        try:
-            text = self.answer.toPlainText()
-            if text:
-                pyperclip.copy(text)
-                QMessageBox.information(self, "Copiado", "Respuesta copiada al portapapeles")
-        except ImportError:
-            QMessageBox.warning(self, "Error", "pyperclip no está disponible")
+        text = self.answer.toPlainText()
+        if text:
+            QApplication.clipboard().setText(text)
+            QMessageBox.information(self, "Copiado", "Respuesta copiada al portapapeles")
 
     def ask(self):
         if not self.vector:
@@ -3825,7 +4186,7 @@ class SettingsTab(QWidget):
         header = QLabel("Configuraciones")
         header.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 28px;
                 font-weight: 300;
@@ -3845,7 +4206,7 @@ class SettingsTab(QWidget):
         # Estilo común para labels (sin bordes)
         label_style = f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 font-weight: 500;
@@ -3858,19 +4219,19 @@ class SettingsTab(QWidget):
         # Estilo común para inputs (fondo más oscuro)
         input_style = f"""
             QLineEdit {{
-                background-color: {WindowsColors.SIDEBAR.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
+                background-color: {WindowsColors.SIDEBAR_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_HEX};
                 border-radius: 8px;
                 padding: 12px 16px;
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
-                selection-background-color: {WindowsColors.BLUE.name()};
+                selection-background-color: {WindowsColors.BLUE_HEX};
             }}
             QLineEdit:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
+                border: 2px solid {WindowsColors.BLUE_HEX};
                 padding: 11px 15px;
-                background-color: {WindowsColors.NOTES_LIST.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
             }}
         """
         
@@ -3943,9 +4304,9 @@ class SettingsTab(QWidget):
         self.top_k.setValue(self.settings.top_k)
         self.top_k.setStyleSheet(f"""
             QSpinBox {{
-                background-color: {WindowsColors.SIDEBAR.name()};
-                color: {WindowsColors.PRIMARY.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
+                background-color: {WindowsColors.SIDEBAR_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
+                border: 1px solid {WindowsColors.SEPARATOR_HEX};
                 border-radius: 8px;
                 padding: 12px 16px;
                 font-family: '.AppleSystemUIFont';
@@ -3953,9 +4314,9 @@ class SettingsTab(QWidget):
                 min-width: 100px;
             }}
             QSpinBox:focus {{
-                border: 2px solid {WindowsColors.BLUE.name()};
+                border: 2px solid {WindowsColors.BLUE_HEX};
                 padding: 11px 15px;
-                background-color: {WindowsColors.NOTES_LIST.name()};
+                background-color: {WindowsColors.NOTES_LIST_HEX};
             }}
             QSpinBox::up-button, QSpinBox::down-button {{
                 background-color: transparent;
@@ -4045,19 +4406,15 @@ class SettingsTab(QWidget):
             
         self.test_btn.setText("Probando...")
         self.test_btn.setEnabled(False)
-        QTimer.singleShot(100, lambda: self._do_connection_test(api_key))
+        start_connection_test(api_key, self._on_connection_tested)
     
-    def _do_connection_test(self, api_key: str):
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            client.embeddings.create(input=["test"], model="text-embedding-3-small")
+    def _on_connection_tested(self, generation: int, api_key: str, ok: bool, error: str):
+        self.test_btn.setText("Probar conexión")
+        self.test_btn.setEnabled(True)
+        if ok:
             QMessageBox.information(self, "Conexión exitosa", "La conexión con OpenAI fue exitosa.")
-        except Exception as e:
-            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{str(e)}")
-        finally:
-            self.test_btn.setText("Probar conexión")
-            self.test_btn.setEnabled(True)
+        else:
+            QMessageBox.warning(self, "Error de conexión", f"No se pudo conectar con OpenAI:\n{error}")
 
     def browse_dir(self):
         d = QFileDialog.getExistingDirectory(self, "Selecciona carpeta de datos", self.data_dir.text())
@@ -4124,7 +4481,7 @@ class CategoriesTab(QWidget):
         title = QLabel("Administrar categorías")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 28px;
                 font-weight: 300;
@@ -4134,7 +4491,7 @@ class CategoriesTab(QWidget):
         subtitle = QLabel("Organiza y gestiona las categorías de tus notas")
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 16px;
                 margin-top: 4px;
@@ -4172,7 +4529,7 @@ class CategoriesTab(QWidget):
         categories_title = QLabel("Categorías existentes")
         categories_title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 20px;
                 font-weight: 500;
@@ -4182,7 +4539,7 @@ class CategoriesTab(QWidget):
         self.categories_count = QLabel("0 categorías")
         self.categories_count.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-size: 14px;
             }}
         """)
@@ -4205,21 +4562,21 @@ class CategoriesTab(QWidget):
                 font-size: 14px;
             }}
             QListWidget::item {{
-                background-color: {WindowsColors.CARD.name()};
-                color: {WindowsColors.PRIMARY.name()};
+                background-color: {WindowsColors.CARD_HEX};
+                color: {WindowsColors.PRIMARY_HEX};
                 padding: 20px;
                 margin-bottom: 8px;
                 border-radius: 12px;
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
             }}
             QListWidget::item:hover {{
-                background-color: {WindowsColors.ELEVATED.name()};
-                border-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.ELEVATED_HEX};
+                border-color: {WindowsColors.BLUE_HEX};
             }}
             QListWidget::item:selected {{
-                background-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.BLUE_HEX};
                 color: white;
-                border-color: {WindowsColors.BLUE.name()};
+                border-color: {WindowsColors.BLUE_HEX};
             }}
         """)
         layout.addWidget(self.categories_list, 1)
@@ -4383,23 +4740,23 @@ class CategoriesTab(QWidget):
         stats = data['stats']
         
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {WindowsColors.ELEVATED.name()};
-                border: 1px solid {WindowsColors.SEPARATOR.name()};
-                border-radius: 8px;
-                padding: 4px 0;
-                font-size: 14px;
-                color: {WindowsColors.PRIMARY.name()};
-            }}
-            QMenu::item {{
-                padding: 8px 16px;
-            }}
-            QMenu::item:selected {{
-                background-color: {WindowsColors.BLUE.name()};
-                color: white;
-            }}
-        """)
+        menu.setStyleSheet(cached_qss("context_menu", "default", lambda: f"""
+                QMenu {{
+                    background-color: {WindowsColors.ELEVATED_HEX};
+                    border: 1px solid {WindowsColors.SEPARATOR_HEX};
+                    border-radius: 8px;
+                    padding: 4px 0;
+                    font-size: 14px;
+                    color: {WindowsColors.PRIMARY_HEX};
+                }}
+                QMenu::item {{
+                    padding: 8px 16px;
+                }}
+                QMenu::item:selected {{
+                    background-color: {WindowsColors.BLUE_HEX};
+                    color: white;
+                }}
+            """))
         
         # Acciones disponibles
         view_action = menu.addAction(f"Ver notas ({stats['total']})")
@@ -4747,7 +5104,7 @@ class DashboardTab(QWidget):
         title = QLabel("Dashboard")
         title.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 28px;
                 font-weight: 300;
@@ -4757,7 +5114,7 @@ class DashboardTab(QWidget):
         subtitle = QLabel(f"Bienvenido • {datetime.now().strftime('%d de %B')}")
         subtitle.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 margin-top: 4px;
@@ -4772,14 +5129,14 @@ class DashboardTab(QWidget):
         self.stats_label = QLabel("Notas: 0 | Categorías: 0 | Esta semana: 0 | Transcripciones: 0")
         self.stats_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.SECONDARY.name()};
+                color: {WindowsColors.SECONDARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 14px;
                 font-weight: 500;
-                background-color: {WindowsColors.CARD.name()};
+                background-color: {WindowsColors.CARD_HEX};
                 padding: 12px 20px;
                 border-radius: 8px;
-                border: 1px solid {WindowsColors.SEPARATOR_LIGHT.name()};
+                border: 1px solid {WindowsColors.SEPARATOR_LIGHT_HEX};
             }}
         """)
         self.stats_label.setAlignment(Qt.AlignCenter)
@@ -4790,7 +5147,7 @@ class DashboardTab(QWidget):
         recent_label = QLabel("Notas recientes")
         recent_label.setStyleSheet(f"""
             QLabel {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 font-family: '.AppleSystemUIFont';
                 font-size: 20px;
                 font-weight: 500;
@@ -4904,12 +5261,12 @@ class DashboardTab(QWidget):
             self.recent_notes_list.clear()
 
             # En el loop donde se crean los items de la lista (línea donde se construye el texto)
+            today_ordinal = datetime.now().astimezone().toordinal()
             for note in sorted_notes[:50]:
                 icon = "🎤" if (getattr(note, "source", "") or "").lower() == "transcript" else "📄"
                 title = getattr(note, "title", "") or "(Sin título)"
                 category = getattr(note, "category", "") or "Sin categoría"
-                updated_raw = getattr(note, "updated_at", "") or ""
-                updated_show = format_date_chile(updated_raw) if updated_raw else ""
+                updated_show = note_display_date(note, today_ordinal)
                 content = getattr(note, "content", "") or ""
                 preview = (content[:150] + "...") if len(content) > 150 else content
 
@@ -4917,7 +5274,8 @@ class DashboardTab(QWidget):
                 item = QListWidgetItem()
                 item.setData(Qt.UserRole, {
                     'id': getattr(note, "id", None),
-                    'title': title,  # El delegate aplicará .upper() automáticamente
+                    'title': title,
+                    'title_display': title.upper(),
                     'preview': preview,
                     'date': updated_show,
                     'has_audio': False,
@@ -4953,16 +5311,16 @@ class SideNav(QWidget):
                 font-size: 14px;
             }}
             QListWidget::item {{
-                color: {WindowsColors.PRIMARY.name()};
+                color: {WindowsColors.PRIMARY_HEX};
                 padding: 10px 16px;
                 border-radius: 8px;
                 margin: 2px 0px;
             }}
             QListWidget::item:hover {{
-                background-color: {WindowsColors.CARD.name()};
+                background-color: {WindowsColors.CARD_HEX};
             }}
             QListWidget::item:selected {{
-                background-color: {WindowsColors.BLUE.name()};
+                background-color: {WindowsColors.BLUE_HEX};
                 color: white;
             }}
         """)
@@ -5027,7 +5385,7 @@ class MainWindow(QMainWindow):
     def _setup_style(self):
         self.setStyleSheet(f"""
             QMainWindow {{
-                background-color: {WindowsColors.CONTENT.name()};
+                background-color: {WindowsColors.CONTENT_HEX};
             }}
         """)
     
@@ -5071,8 +5429,8 @@ class MainWindow(QMainWindow):
         self.nav = SideNav(self._on_nav_changed)
         self.nav.setStyleSheet(f"""
             QWidget {{
-                background-color: {WindowsColors.SIDEBAR.name()};
-                border-right: 1px solid {WindowsColors.SEPARATOR.name()};
+                background-color: {WindowsColors.SIDEBAR_HEX};
+                border-right: 1px solid {WindowsColors.SEPARATOR_HEX};
             }}
         """)
         main_layout.addWidget(self.nav)
@@ -5167,18 +5525,8 @@ def main():
     
     app.setPalette(palette)
     
-    # Tooltips estilo Windows
-    app.setStyleSheet(f"""
-        QToolTip {{
-            background-color: {WindowsColors.ELEVATED.name()};
-            color: {WindowsColors.PRIMARY.name()};
-            border: 1px solid {WindowsColors.SEPARATOR.name()};
-            padding: 8px 12px;
-            border-radius: 8px;
-            font-family: 'Segoe UI';
-            font-size: 12px;
-        }}
-    """)
+    # Estilos globales: tooltips, botones y campos de texto
+    app.setStyleSheet(APP_QSS)
     
     try:
         window = MainWindow()
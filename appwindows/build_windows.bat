@@ -115,13 +115,14 @@ pyinstaller ^
   --hidden-import=soundfile ^
   --hidden-import=speech_recognition ^
   --hidden-import=pyaudio ^
-  --hidden-import=pyperclip ^
   --hidden-import=pygame ^
-  --hidden-import=pytz ^
+  --hidden-import=zoneinfo ^
+  --hidden-import=orjson ^
   --collect-all chromadb ^
   --collect-all sounddevice ^
   --collect-all speech_recognition ^
   --collect-all numpy ^
+  --collect-data tzdata ^
   run_app.py
 
 if errorlevel 1 (